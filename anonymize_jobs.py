@@ -7,6 +7,127 @@ import re
 from pathlib import Path
 
 
+# Declarative rule table: (pattern, replacement, flags), applied in order.
+# Bump JOB_ANONYMIZER_VERSION whenever a rule changes.
+JOB_ANONYMIZER_VERSION = "1"
+
+# Rules are grouped into passes; each pass is compiled into one alternation and
+# applied with a single scan. A new pass starts wherever a rule depends on text
+# rewritten by an earlier one, or where a match of a later rule can overlap one
+# of an earlier rule: the leftmost match would then pre-empt the earlier rule. `lead` lists every character a match
+# in the pass can start with, so the scanner can skip everything else quickly.
+# tests/test_anonymize_jobs.py checks the passes against rule-by-rule re.sub.
+JOB_TEXT_PASSES = [
+    # Agency names
+    ("TtS", [
+        (r'TxDOT', 'State Transportation Agency', re.IGNORECASE),
+        (r'Texas Department of Transportation', 'State Transportation Agency', re.IGNORECASE),
+        (r'State of Texas', 'State Government', 0),
+    ]),
+
+    # "Austintxdot" must become "AustinState ..." before the city rules run
+    (r"AaTt\dBFS", [
+        # Location-specific references
+        (r'Austin,?\s*TX', 'State Capital', re.IGNORECASE),
+        (r'Austin\s*78\d{3}', 'State Capital', re.IGNORECASE),
+        (r'Tyler,?\s*TX', 'Regional Office', re.IGNORECASE),
+        (r'Tyler\s*75\d{3}', 'Regional Office', re.IGNORECASE),
+
+        # Specific addresses
+        (r'\d{3,5}\s+[A-Z][a-z]+\s+(?:Street|St|Avenue|Ave|Road|Rd|Lane|Ln|Boulevard|Blvd|Drive|Dr)[^\n]*', '[Address Anonymized]', 0),
+
+        # Specific divisions/districts
+        (r'Bridge Division', 'Infrastructure Division', 0),
+        (r'Financial Management Division', 'Finance Division', 0),
+        (r'Tyler District', 'Regional District', 0),
+        (r'Stassney [Cc]ampus', 'State Campus', 0),
+    ]),
+
+    # Addresses must claim their street numbers first
+    (r"(\d", [
+        # Job requisition numbers
+        (r'\(?\d{7,8}\)?', '[REQ-XXXXX]', 0),
+    ]),
+
+    # A date's year can run into a requisition number ("January 5, 202612345678"),
+    # which the requisition rule claims first
+    ("JFMASOND", [
+        # Specific dates
+        (r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+20\d{2}', '[Date]', 0),
+        (r'(?:December|January)\s+\d{1,2},?\s+20\d{2}', '[Date]', 0),
+    ]),
+
+    # "[REQ-XXXXX]TX234" only gains a word boundary after replacement
+    ("A-Z", [
+        # State job codes
+        (r'\b[A-Z]{1,2}\d{3,4}\b', '[JOB-CODE]', 0),
+        (r'State Job Code/s?:\s*\d{4}(?:/\d{4})*', 'State Job Code: [CLASSIFIED]', 0),
+    ]),
+
+    # A job title line may contain the job code label
+    ("S", [
+        (r'State Job Title/s?:[^\n]+', 'State Job Title: [As Posted]', 0),
+    ]),
+
+    # Links end at the first space, including spaces added by earlier passes
+    ("h", [
+        # Texas-specific links
+        (r'https?://[^\s]*texas\.gov[^\s]*', '[State HR Portal]', 0),
+    ]),
+
+    # "www.https://..." keeps its "www." prefix
+    ("w", [
+        (r'www\.[^\s]*texas\.gov[^\s]*', '[State HR Portal]', 0),
+    ]),
+
+    # Single-literal passes keep re's fast prefix search; merging them is slower
+    ("E", [
+        # ERS/benefits specific to Texas
+        (r'ERS \(texas\.gov\)', 'State Employee Benefits Portal', 0),
+    ]),
+
+    # The benefits line is matched after its ERS link is rewritten
+    ("BT", [
+        (r'Benefits at a Glance \| ERS[^\)]*', 'State Benefits Portal', 0),
+
+        # Remaining Texas references
+        (r'\bTexas\b', 'State', 0),
+        (r'\bTX\b', '', 0),
+    ]),
+]
+
+JOB_TEXT_RULES = [rule for _, rules in JOB_TEXT_PASSES for rule in rules]
+
+
+def _anonymize_job_text_sequential(text, rules=JOB_TEXT_RULES):
+    """Reference semantics: apply each rule to the output of the previous one."""
+    for pattern, replacement, flags in rules:
+        text = re.sub(pattern, replacement, text, flags=flags)
+    return text
+
+
+def _compile_pass(lead, rules):
+    """
+    Merge rules into one alternation with a capturing group per rule, so
+    match.lastindex identifies the rule. At any position the leftmost match
+    wins, ties going to the earlier rule. Rule patterns must not capture.
+    """
+    branches = []
+    for pattern, _, flags in rules:
+        if flags & re.IGNORECASE:
+            pattern = f"(?i:{pattern})"
+        branches.append(f"({pattern})")
+    pattern = "|".join(branches)
+    if len(rules) > 1:
+        pattern = f"(?=[{lead}])(?:{pattern})"
+    replacements = [None] + [replacement for _, replacement, _ in rules]
+    return re.compile(pattern), replacements
+
+
+# Compiled once at import
+_JOB_TEXT_PASSES = [_compile_pass(lead, rules) for lead, rules in JOB_TEXT_PASSES]
+
+
 def anonymize_job_text(text):
     """
     Remove or replace agency-specific information from job descriptions.
@@ -19,51 +140,8 @@ def anonymize_job_text(text):
     - Specific dates → [Date]
     - Job posting numbers → [REQ-XXXXX]
     """
-
-    # Replace agency names
-    text = re.sub(r'TxDOT', 'State Transportation Agency', text, flags=re.IGNORECASE)
-    text = re.sub(r'Texas Department of Transportation', 'State Transportation Agency', text, flags=re.IGNORECASE)
-    text = re.sub(r'State of Texas', 'State Government', text)
-
-    # Replace location-specific references
-    text = re.sub(r'Austin,?\s*TX', 'State Capital', text, flags=re.IGNORECASE)
-    text = re.sub(r'Austin\s*78\d{3}', 'State Capital', text, flags=re.IGNORECASE)
-    text = re.sub(r'Tyler,?\s*TX', 'Regional Office', text, flags=re.IGNORECASE)
-    text = re.sub(r'Tyler\s*75\d{3}', 'Regional Office', text, flags=re.IGNORECASE)
-
-    # Replace specific addresses
-    text = re.sub(r'\d{3,5}\s+[A-Z][a-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Lane|Ln|Boulevard|Blvd|Drive|Dr)[^\n]*', '[Address Anonymized]', text)
-
-    # Replace specific divisions/districts
-    text = re.sub(r'Bridge Division', 'Infrastructure Division', text)
-    text = re.sub(r'Financial Management Division', 'Finance Division', text)
-    text = re.sub(r'Tyler District', 'Regional District', text)
-    text = re.sub(r'Stassney [Cc]ampus', 'State Campus', text)
-
-    # Replace job requisition numbers
-    text = re.sub(r'\(?\d{7,8}\)?', '[REQ-XXXXX]', text)
-
-    # Replace specific dates
-    text = re.sub(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+20\d{2}', '[Date]', text)
-    text = re.sub(r'(December|January)\s+\d{1,2},?\s+20\d{2}', '[Date]', text)
-
-    # Replace state job codes
-    text = re.sub(r'\b[A-Z]{1,2}\d{3,4}\b', '[JOB-CODE]', text)
-    text = re.sub(r'State Job Code/s?:\s*\d{4}(/\d{4})*', 'State Job Code: [CLASSIFIED]', text)
-    text = re.sub(r'State Job Title/s?:[^\n]+', 'State Job Title: [As Posted]', text)
-
-    # Replace Texas-specific links
-    text = re.sub(r'https?://[^\s]*texas\.gov[^\s]*', '[State HR Portal]', text)
-    text = re.sub(r'www\.[^\s]*texas\.gov[^\s]*', '[State HR Portal]', text)
-
-    # Replace ERS/benefits specific to Texas
-    text = re.sub(r'ERS \(texas\.gov\)', 'State Employee Benefits Portal', text)
-    text = re.sub(r'Benefits at a Glance \| ERS[^\)]*', 'State Benefits Portal', text)
-
-    # Clean up any remaining Texas references
-    text = re.sub(r'\bTexas\b', 'State', text)
-    text = re.sub(r'\bTX\b', '', text)
-
+    for regex, replacements in _JOB_TEXT_PASSES:
+        text = regex.sub(lambda m: replacements[m.lastindex], text)
     return text
 
 
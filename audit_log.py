@@ -0,0 +1,236 @@
+"""
+audit_log.py — Bounded, session-partitioned audit log
+======================================================
+Audit records (reviewer overrides and notes) are kept per session, so
+reviewers sharing one server process never see or purge each other's
+records. Each partition is a ring buffer of at most `capacity` records;
+when it fills, its oldest half is appended to a JSON-lines spill file and
+read back only when the log is iterated.
+
+Appends take a short per-partition lock, so concurrent sessions (one script
+thread each) do not contend. A record identical to the previous one logged
+for the same candidate, ignoring its timestamp, is not logged again.
+
+Responsible AI note: records hold anonymized IDs and reviewer text only.
+By default the log stays in memory and the oldest records are discarded, with
+a warning, once a partition is full; stats() counts them. A session that
+still holds records is never released to make room for another unless they
+can be spilled. Spilling is opt-in (CANDIDATECOMPASS_AUDIT_SPILL_DIR):
+reviewer notes are then written to a private directory under it, removed
+when a session's log is cleared and when the store is garbage collected,
+but not if the process is killed.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_SESSION = "default"
+
+
+class _Partition:
+    """One session's records: in-memory ring buffer plus optional spill file."""
+
+    def __init__(self, capacity: int, spill_path: Optional[Path]):
+        self.lock = threading.Lock()
+        self.buffer: deque = deque()
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spilled = 0
+        self.last: Dict[Any, str] = {}  # anon_id -> fingerprint of its latest record
+
+    def spill(self, n: int) -> bool:
+        """Move the n oldest buffered records to the spill file. Returns False if they stay buffered."""
+        if self.spill_path is None:
+            return False
+        batch = list(itertools.islice(self.buffer, n))
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(rec, default=str) + "\n" for rec in batch)
+        except OSError as e:
+            logger.warning(f"Audit log spill failed: {e}")
+            return False
+        for _ in batch:
+            self.buffer.popleft()
+        self.spilled += len(batch)
+        return True
+
+
+class AuditLogStore:
+    """
+    Thread-safe audit log with one bounded partition per session.
+
+    Args:
+        capacity: Records held in memory per session before spilling
+        spill_dir: Parent directory for spill files, or None (default) to never spill
+        max_sessions: Sessions kept in memory; beyond this the least recently
+            used session whose records can be spilled (or that has none) is
+            released. Sessions whose records would be lost are kept.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, spill_dir: Any = None,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self._parent_dir = spill_dir
+        self._spill_dir: Optional[Path] = None
+        self._finalizer = None
+        self._lock = threading.Lock()  # guards the partition table and the dropped count
+        self._partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._dropped = 0
+
+    @classmethod
+    def from_env(cls) -> "AuditLogStore":
+        """
+        Build a store from CANDIDATECOMPASS_AUDIT_CAPACITY and
+        CANDIDATECOMPASS_AUDIT_SPILL_DIR (unset or "off": no spilling).
+        """
+        spill_dir = os.environ.get("CANDIDATECOMPASS_AUDIT_SPILL_DIR", "off")
+        if spill_dir.lower() in ("off", "none", "0", ""):
+            spill_dir = None
+        capacity = int(os.environ.get("CANDIDATECOMPASS_AUDIT_CAPACITY", DEFAULT_CAPACITY))
+        return cls(capacity=capacity, spill_dir=spill_dir)
+
+    def _spill_path(self, session_id: str) -> Optional[Path]:
+        if self._parent_dir is None:
+            return None
+        if self._spill_dir is None:
+            try:
+                self._spill_dir = Path(tempfile.mkdtemp(prefix="candidatecompass-audit-", dir=self._parent_dir))
+            except OSError as e:
+                logger.warning(f"Audit log spilling disabled: {e}")
+                self._parent_dir = None
+                return None
+            self._finalizer = weakref.finalize(self, shutil.rmtree, str(self._spill_dir), True)
+        return self._spill_dir / f"{hashlib.sha256(session_id.encode()).hexdigest()[:32]}.jsonl"
+
+    def _partition(self, session_id: str) -> _Partition:
+        """Get or create a session's partition, releasing the least recently used beyond max_sessions."""
+        with self._lock:
+            partition = self._partitions.get(session_id)
+            if partition is not None:
+                self._partitions.move_to_end(session_id)
+                return partition
+            while len(self._partitions) >= self.max_sessions and self._release_oldest():
+                pass
+            partition = self._partitions[session_id] = _Partition(self.capacity, self._spill_path(session_id))
+            if partition.spill_path is not None and partition.spill_path.exists():
+                # Records spilled before this session's partition was released
+                with open(partition.spill_path, encoding="utf-8") as f:
+                    partition.spilled = sum(1 for _ in f)
+            return partition
+
+    def _release_oldest(self) -> bool:
+        """Release the least recently used partition that loses no records by it (caller holds _lock)."""
+        for session_id, old in self._partitions.items():
+            with old.lock:
+                if old.buffer and not old.spill(len(old.buffer)):
+                    continue
+            del self._partitions[session_id]
+            return True
+        return False
+
+    def append(self, record: Dict[str, Any], session_id: str = DEFAULT_SESSION) -> bool:
+        """
+        Log a record for a session. Returns False (nothing logged) if it
+        repeats the previous record for the same anon_id apart from "timestamp".
+        """
+        fingerprint = json.dumps({k: v for k, v in record.items() if k != "timestamp"},
+                                 sort_keys=True, default=str)
+        partition = self._partition(session_id)
+        key = record.get("anon_id")
+        dropped = 0
+        with partition.lock:
+            if partition.last.get(key) == fingerprint:
+                return False
+            partition.last[key] = fingerprint
+            if len(partition.buffer) >= partition.capacity and not partition.spill(partition.capacity // 2):
+                dropped = partition.capacity // 2
+                for _ in range(dropped):
+                    partition.buffer.popleft()
+            partition.buffer.append(record)
+        if dropped:
+            logger.warning(f"Audit log for a session is full; discarded its {dropped} oldest records "
+                           "(set CANDIDATECOMPASS_AUDIT_SPILL_DIR to keep them)")
+            with self._lock:
+                self._dropped += dropped
+        return True
+
+    def iter_records(self, session_id: str = DEFAULT_SESSION) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a session's records, oldest first. The set of records is fixed
+        when iteration starts; spilled records are read from disk lazily.
+        """
+        with self._lock:
+            partition = self._partitions.get(session_id)
+            if partition is not None:
+                spill_path = partition.spill_path
+            else:  # released or unknown session: only spilled records may remain
+                spill_path = self._spill_path(session_id) if self._spill_dir is not None else None
+        if partition is not None:
+            with partition.lock:
+                spilled, buffered = partition.spilled, list(partition.buffer)
+        else:
+            spilled, buffered = None, []
+        if spill_path is not None and spilled != 0:
+            try:
+                with open(spill_path, encoding="utf-8") as f:
+                    for n, line in enumerate(f):
+                        if spilled is not None and n >= spilled:
+                            break
+                        yield json.loads(line)
+            except FileNotFoundError:
+                pass
+        yield from buffered
+
+    def count(self, session_id: str = DEFAULT_SESSION) -> int:
+        """Number of records held for a session (in memory and spilled)."""
+        with self._lock:
+            partition = self._partitions.get(session_id)
+        if partition is None:
+            return sum(1 for _ in self.iter_records(session_id))
+        with partition.lock:
+            return partition.spilled + len(partition.buffer)
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """Remove one session's records, or every session's if session_id is None."""
+        with self._lock:
+            if session_id is None:
+                self._partitions.clear()
+                if self._finalizer is not None:
+                    self._finalizer()  # deletes every spill file
+                    self._finalizer, self._spill_dir = None, None
+                return
+            self._partitions.pop(session_id, None)
+            spill_path = self._spill_path(session_id) if self._spill_dir is not None else None
+        if spill_path is not None:
+            try:
+                spill_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Sessions held in memory, records buffered and spilled, and records discarded so far."""
+        with self._lock:
+            partitions, dropped = list(self._partitions.values()), self._dropped
+        buffered = spilled = 0
+        for partition in partitions:
+            with partition.lock:
+                buffered += len(partition.buffer)
+                spilled += partition.spilled
+        return {"sessions": len(partitions), "buffered": buffered, "spilled": spilled, "dropped": dropped}
@@ -0,0 +1,93 @@
+"""
+bench_anonymize.py — Micro-benchmark for utils.anonymize_text
+==============================================================
+Compares the single-pass anonymizer against the previous findall + str.replace
+implementation (legacy_anonymize_text in tests/legacy.py) on 1,000 real-size
+resumes.
+
+The sample resume PDFs are short, so each benchmark document stitches several
+of them into a multi-page resume and adds a contact header and a references
+block, exercising SSN, email, phone, address and name redaction.
+
+Run with: python benchmarks/bench_anonymize.py [--docs 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tests.legacy import legacy_anonymize_text  # noqa: E402
+from utils import anonymize_text, extract_texts  # noqa: E402
+
+
+def _pii_block(rng: random.Random) -> str:
+    """A few lines of realistic contact details."""
+    first = rng.choice(["Jordan", "Maria", "Wei", "Aisha", "Daniel", "Priya"])
+    last = rng.choice(["Lee", "Garcia", "Okafor", "Smith", "Nguyen", "Patel"])
+    return "\n".join([
+        f"Name: {first} {last}",
+        f"Email: {first.lower()}.{last.lower()}{rng.randint(1, 99)}@example.org",
+        f"Phone: ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        f"Alt: +1 {rng.randint(200, 999)} {rng.randint(200, 999)} {rng.randint(1000, 9999)}",
+        f"SSN: {rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}",
+        f"{rng.randint(1, 9999)} {rng.choice(['Oak', 'Main', 'Lamar', 'Congress'])} "
+        f"{rng.choice(['Street', 'Ave', 'Blvd', 'Drive', 'Ln'])}",
+    ])
+
+
+def build_corpus(n_docs: int, seed: int = 7, min_chars: int = 4000) -> List[str]:
+    """
+    n_docs multi-page resumes (at least min_chars each) built from the sample
+    PDFs, with a contact header and a references block of PII.
+    """
+    pdfs = sorted((ROOT / "sample_data" / "generated").glob("**/anon_*.pdf"))
+    pdfs += sorted((ROOT / "sample_data" / "generated" / "DemoResumes").glob("*.pdf"))
+    base = [r["text"] for r in extract_texts(pdfs) if r["text"]]
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n_docs):
+        sections = [_pii_block(rng)]
+        while sum(len(s) for s in sections) < min_chars:
+            sections.append(rng.choice(base))
+        sections.append("REFERENCES\n" + _pii_block(rng))
+        corpus.append("\n".join(sections))
+    return corpus
+
+
+def _time(fn, corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for doc in corpus:
+            fn(doc)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.docs)
+    avg_chars = sum(len(d) for d in corpus) / len(corpus)
+    same = sum(anonymize_text(d) == legacy_anonymize_text(d) for d in corpus)
+
+    legacy = _time(legacy_anonymize_text, corpus, args.repeat)
+    single = _time(anonymize_text, corpus, args.repeat)
+
+    print(f"Corpus: {len(corpus)} resumes, {avg_chars:,.0f} chars avg")
+    print(f"Identical output: {same}/{len(corpus)}")
+    print(f"legacy (findall + replace): {legacy * 1000:8.1f} ms")
+    print(f"single-pass:                {single * 1000:8.1f} ms  ({legacy / single:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+bench_decision_pdfs.py — Micro-benchmark for utils.write_decision_pdfs_zip
+===========================================================================
+Renders decision summaries for a synthetic ranked pool into an in-memory
+ZIP, serially and with a process pool (target: 1,000 PDFs in seconds), then
+the same pool as a single panel report (utils.generate_panel_report).
+
+Run with: python benchmarks/bench_decision_pdfs.py [--candidates 1000] [--workers 4]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils import SKILL_KEYWORDS, generate_panel_report, write_decision_pdfs_zip  # noqa: E402
+
+
+def random_ranked(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [{
+        "anon_id": f"id{i:06d}",
+        "rank": i + 1,
+        "score": round(rng.uniform(10, 60), 2),
+        "breakdown": {"skills": 12.0, "experience": 8.0, "education": 2.0, "certifications": 0.5},
+        "features": {"skills": rng.sample(SKILL_KEYWORDS, 6), "education": "B.S.", "years_experience": 5},
+    } for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    candidates = random_ranked(args.candidates)
+    names = {c["anon_id"]: f"Candidate {i}" for i, c in enumerate(candidates)}
+    for workers in sorted({1, args.workers}):
+        out = io.BytesIO()
+        t0 = time.perf_counter()
+        count = write_decision_pdfs_zip(candidates, out, display_names=names, workers=workers)
+        elapsed = time.perf_counter() - t0
+        assert len(zipfile.ZipFile(out).namelist()) == count
+        print(f"workers={workers:<3d} {count} PDFs in {elapsed:6.2f} s   zip {len(out.getvalue()) / 2**20:6.1f} MB")
+
+    t0 = time.perf_counter()
+    pdf = generate_panel_report(iter(candidates), display_names=names)
+    elapsed = time.perf_counter() - t0
+    print(f"panel report    {len(candidates)} candidates in {elapsed:6.2f} s   pdf {len(pdf) / 2**20:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+bench_export.py — Micro-benchmark for CandidateStore.export
+============================================================
+Streams the ranked export of a large synthetic pool to CSV and Parquet
+files and reports time and the peak Python allocation during the export
+(tracemalloc). Peak memory should stay roughly flat as --candidates grows,
+apart from the store's own score arrays.
+
+Run with: python benchmarks/bench_export.py [--candidates 100000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from feature_store import CandidateStore  # noqa: E402
+from utils import CERTIFICATION_KEYWORDS, SKILL_KEYWORDS  # noqa: E402
+
+WEIGHTS = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5}
+
+
+def random_candidates(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [{
+        "anon_id": f"id{i:06d}",
+        "filename": f"resume_{i}.pdf",
+        "features": {
+            "skills": rng.sample(SKILL_KEYWORDS, rng.randint(0, 14)),
+            "certifications": rng.sample(CERTIFICATION_KEYWORDS, rng.randint(0, 4)),
+            "years_experience": rng.randint(0, 25),
+            "education_level": rng.randint(0, 3),
+            "evidence_lines": {},
+        },
+    } for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--candidates", type=int, default=100000)
+    args = parser.parse_args()
+
+    store = CandidateStore.from_candidates(random_candidates(args.candidates))
+    names = {f"id{i:06d}": f"Candidate {i}" for i in range(args.candidates)}
+    print(f"{args.candidates} candidates")
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in (".csv", ".parquet"):
+            path = Path(tmp) / f"scores{suffix}"
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            store.export(path, WEIGHTS, names)
+            elapsed = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{suffix[1:]:8s} {elapsed * 1000:8.1f} ms   peak {peak / 2**20:6.1f} MB   "
+                  f"file {path.stat().st_size / 2**20:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+bench_gating.py — Micro-benchmark for qualification gating
+===========================================================
+Times per-candidate gate_candidate against the vectorized
+CandidateStore.apply_gates on a large synthetic applicant pool, for the
+demo job in job_library (target: milliseconds at 100k).
+
+Run with: python benchmarks/bench_gating.py [--candidates 100000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_scoring import random_candidates  # noqa: E402
+from feature_store import CandidateStore  # noqa: E402
+from job_library import JOB_LIBRARY  # noqa: E402
+from utils import gate_candidate  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--candidates", type=int, default=100000)
+    args = parser.parse_args()
+
+    job = next(iter(JOB_LIBRARY.values()))
+    candidates = random_candidates(args.candidates)
+    store = CandidateStore.from_candidates(candidates)
+
+    t0 = time.perf_counter()
+    scalar = [gate_candidate(c["features"], job) for c in candidates]
+    t1 = time.perf_counter()
+    vector_ms = []
+    for _ in range(5):
+        t = time.perf_counter()
+        store.apply_gates(job)
+        vector_ms.append((time.perf_counter() - t) * 1000)
+    same = store.columns["is_qualified"].tolist() == [q for q, _ in scalar]
+
+    print(f"{args.candidates} candidates, identical flags: {same}")
+    print(f"gate_candidate per candidate: {(t1 - t0) * 1000:8.1f} ms")
+    print(f"apply_gates (vectorized):     {min(vector_ms):8.1f} ms (best of {len(vector_ms)})")
+
+
+if __name__ == "__main__":
+    main()
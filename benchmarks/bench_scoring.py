@@ -0,0 +1,65 @@
+"""
+bench_scoring.py — Micro-benchmark for utils.score_candidates
+==============================================================
+Compares the columnar NumPy scorer against the previous per-dict
+implementation (legacy_score_candidates in tests/legacy.py) on a large
+synthetic applicant pool, and times a weights-only re-rank on a prebuilt
+feature matrix as happens when the sidebar sliders move (target: under 50 ms
+at 10k).
+
+Run with: python benchmarks/bench_scoring.py [--candidates 50000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tests.legacy import legacy_score_candidates, random_candidates  # noqa: E402
+from utils import (  # noqa: E402
+    build_feature_matrix,
+    rank_from_matrix,
+    rank_scores,
+    score_candidates,
+    score_matrix,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--candidates", type=int, default=50000)
+    args = parser.parse_args()
+
+    candidates = random_candidates(args.candidates)
+    weights = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5}
+
+    t0 = time.perf_counter()
+    legacy = legacy_score_candidates(candidates, weights)
+    t1 = time.perf_counter()
+    columnar = score_candidates(candidates, weights)
+    t2 = time.perf_counter()
+    assert columnar == legacy, "columnar scorer diverged from the legacy implementation"
+
+    matrix = build_feature_matrix([c["features"] for c in candidates])
+    t3 = time.perf_counter()
+    totals, _ = score_matrix(matrix, weights)
+    order = rank_scores(totals, top_k=50)
+    t4 = time.perf_counter()
+    slider_ms = []
+    for step in range(5):
+        t = time.perf_counter()
+        rank_from_matrix(candidates, matrix, {**weights, "skills": 0.5 * step})
+        slider_ms.append((time.perf_counter() - t) * 1000)
+
+    print(f"{args.candidates} candidates, identical output: {columnar == legacy}")
+    print(f"legacy score_candidates:     {(t1 - t0) * 1000:8.1f} ms")
+    print(f"columnar score_candidates:   {(t2 - t1) * 1000:8.1f} ms")
+    print(f"re-rank prebuilt matrix:     {(t4 - t3) * 1000:8.1f} ms (top {len(order)})")
+    print(f"slider move (full records):  {min(slider_ms):8.1f} ms (best of {len(slider_ms)})")
+
+
+if __name__ == "__main__":
+    main()
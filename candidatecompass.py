@@ -0,0 +1,302 @@
+"""
+candidatecompass.py — Headless batch ranking
+=============================================
+Runs the same pipeline as the Streamlit app (extract → anonymize →
+extract_features → gate_candidate → score) over a directory or glob of
+resumes, without a UI, and writes the ranked results as CSV, JSONL or
+Parquet (needs pyarrow).
+
+Resumes stream through the utils generator pipeline (iter_ingest → iter_gate
+→ iter_score → top_k_candidates) in fixed-size batches. Each resume is reduced
+to its output row as soon as it is scored, so text, features and evidence are
+not kept; with --top, only the best N rows are kept, so memory stays flat for
+any pool size.
+A relevance weight (BM25 against the job spec and its anonymized description,
+the same query as the app; see relevance.py) is relative
+to the whole pool, so then every resume's features are held until the pool
+is indexed; only the token postings are kept, not the text.
+
+Usage:
+    python candidatecompass.py rank --job "Data Analyst I-V (Infrastructure)" \\
+        --resumes resumes/ --out ranked.csv --workers 8
+
+Responsible AI note: resumes are anonymized before features are extracted;
+output rows carry the anonymized ID, the source path and the scores only.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from anonymize_jobs import anonymize_job_text
+from bias_audit import AuditAccumulator
+from dedup import DuplicateIndex
+from job_library import load_job_spec
+from relevance import RelevanceIndex, job_query
+from text_cache import TextCache
+from utils import (
+    SCORE_COLUMNS,
+    extract_texts,
+    gate_export_fields,
+    iter_dedup,
+    iter_gate,
+    iter_ingest,
+    iter_score,
+    pipeline_version,
+    top_k_candidates,
+    write_csv,
+    write_parquet,
+)
+
+logger = logging.getLogger(__name__)
+
+RESUME_SUFFIXES = (".pdf", ".txt")
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Same defaults as the rubric sliders in the app
+DEFAULT_WEIGHTS = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5, "relevance": 0.0}
+
+OUTPUT_FIELDS = ["rank", "anon_id", "file", "score"] + [f"{k}_score" for k in SCORE_COLUMNS] + [
+    "is_qualified", "level_name", "education_passed", "skills_passed",
+    "skill_count", "certification_count", "evidence_count"]
+
+
+def iter_resume_paths(source: str) -> Iterator[str]:
+    """Yield resume paths from a directory (recursively) or a glob pattern."""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_SUFFIXES):
+                    yield os.path.join(root, name)
+    else:
+        for path in glob.iglob(source, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith(RESUME_SUFFIXES):
+                yield path
+
+
+def parse_weights(spec: Optional[str]) -> Dict[str, float]:
+    """Parse "skills=3,experience=2" into a weights dict over DEFAULT_WEIGHTS."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (spec or "").split(",")):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in weights:
+            raise ValueError(f"Unknown weight '{key}'. Expected one of {list(weights)}.")
+        weights[key] = float(value)
+    return weights
+
+
+def job_description_text(job_info: Dict[str, Any]) -> str:
+    """
+    Anonymized text of a job spec's description file (relative to the repo
+    root), as the app loads it for the relevance query; "" if there is none.
+    """
+    path = job_info.get("file")
+    if not path:
+        return ""
+    result = extract_texts([os.path.join(REPO_ROOT, path)], workers=1)[0]
+    if result["error"]:
+        logger.warning(f"Job description {path} not read, matching the job spec only: {result['error']}")
+    return anonymize_job_text(result["text"])
+
+
+def with_relevance(docs: Iterable[Dict[str, Any]], query: str) -> Iterator[Dict[str, Any]]:
+    """
+    Add features["relevance"] (BM25 against query, 0-10 over the pool, as in
+    the app). Relevance depends on the whole pool, so documents are held,
+    without their text, until every one has been indexed.
+    """
+    index = RelevanceIndex()
+    held = []
+    for doc in docs:
+        if doc.get("text"):
+            index.add(doc["anon_id"], doc["text"])
+        held.append({**doc, "text": ""})
+    values = index.relevance(query, [doc["anon_id"] for doc in held])
+    for doc, value in zip(held, values.tolist()):
+        yield {**doc, "features": {**(doc["features"] or {}), "relevance": value}}
+
+
+def iter_audit(docs: Iterable[Dict[str, Any]], audit: AuditAccumulator,
+               batch_size: int = 256) -> Iterator[Dict[str, Any]]:
+    """Pass scored documents through, adding them to audit batch_size at a time."""
+    pending = []
+    for doc in docs:
+        pending.append((doc["score"], doc["is_qualified"], doc["gate_results"].get("level_name", ""),
+                        (doc.get("features") or {}).get("skills", [])))
+        if len(pending) == batch_size:
+            audit.add(*zip(*pending))
+            pending = []
+        yield doc
+    if pending:
+        audit.add(*zip(*pending))
+
+
+def result_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Output row of a scored document; rank is filled in once the pool is ranked."""
+    return {
+        "rank": None,
+        "anon_id": doc["anon_id"],
+        "file": doc["name"],
+        "score": doc["score"],
+        **{f"{k}_score": v for k, v in doc["breakdown"].items()},
+        **gate_export_fields(doc),
+    }
+
+
+def rank_resumes(
+    paths: Iterable[str],
+    job_info: Optional[Dict[str, Any]],
+    weights: Dict[str, float],
+    workers: Optional[int] = None,
+    batch_size: int = 256,
+    top: Optional[int] = None,
+    qualified_only: bool = False,
+    cache: Any = None,
+    collapse_duplicates: bool = False,
+    screen: bool = False,
+    audit: Optional[AuditAccumulator] = None,
+) -> Dict[str, Any]:
+    """
+    Score resumes batch by batch and rank them.
+
+    Args:
+        paths: Resume paths (consumed lazily)
+        job_info: Job spec for gating (see job_library); None skips gating
+        weights: Scoring weights
+        workers: Extraction worker processes per batch (see extract_texts)
+        batch_size: Resumes held in memory at once
+        top: Keep only the N highest-scoring rows
+        qualified_only: Drop candidates that fail the gates
+            (and leave them out of the relevance pool)
+        cache: Optional text_cache.TextCache
+        collapse_duplicates: Keep only the first of each group of near-duplicate
+            resumes (see dedup.DuplicateIndex)
+        screen: Reject resumes missing a required skill with a keyword scan
+            before feature extraction (see utils.screen_pages); they are
+            ranked as disqualified with a zero score
+        audit: Optional bias_audit.AuditAccumulator, fed every scored resume
+            (the ranked pool, before --top) one batch at a time
+
+    Returns:
+        {"rows": ranked result rows, "processed": int, "failed": int,
+        "duplicates": int, "screened_out": int}. Ties keep input order, as in the app.
+    """
+    counts = {"processed": 0, "failed": 0, "duplicates": 0, "screened_out": 0}
+
+    def usable(docs):
+        for doc in docs:
+            counts["processed"] += 1
+            if doc.get("screened_out"):
+                counts["screened_out"] += 1
+            elif doc["error"] or not doc["features"]:
+                counts["failed"] += 1
+                logger.warning(f"Skipping {doc['name']}: {doc['error'] or 'no text extracted'}")
+                continue
+            yield doc
+            if counts["processed"] % batch_size == 0:
+                logger.info(f"Processed {counts['processed']} resumes ({counts['failed']} failed)")
+
+    def first_copies(docs):
+        for doc in iter_dedup(docs, DuplicateIndex()):
+            if doc["duplicate_of"]:
+                counts["duplicates"] += 1
+                logger.info(f"Skipping {doc['name']}: duplicate of {doc['duplicate_of']}")
+                continue
+            yield doc
+
+    screen_job = job_info if screen and job_info else None
+    docs = usable(iter_ingest(paths, workers, cache, batch_size, screen_job))
+    if collapse_duplicates:
+        docs = first_copies(docs)
+    docs = iter_gate(docs, job_info)
+    if qualified_only:
+        docs = (doc for doc in docs if doc["is_qualified"])
+    if weights.get("relevance") and job_info:
+        docs = with_relevance(docs, job_query(job_description_text(job_info), job_info))
+    docs = iter_score(docs, weights, batch_size)
+    if audit is not None:
+        docs = iter_audit(docs, audit, batch_size)
+    rows = top_k_candidates((result_row(doc) for doc in docs), k=top)
+    return {"rows": rows, **counts}
+
+
+def write_results(rows: Iterable[Dict[str, Any]], out: str) -> None:
+    """
+    Write rows as JSONL if out ends in .jsonl, Parquet if it ends in
+    .parquet, otherwise CSV. "-" is stdout (CSV).
+    """
+    if out.endswith(".parquet"):
+        write_parquet(rows, out, OUTPUT_FIELDS)
+        return
+    if not out.endswith(".jsonl"):
+        write_csv(rows, sys.stdout if out == "-" else out, OUTPUT_FIELDS)
+        return
+    with open(out, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps({k: row[k] for k in OUTPUT_FIELDS}) + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="candidatecompass", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rank = commands.add_parser("rank", help="Rank a directory or glob of resumes against a job")
+    rank.add_argument("--resumes", required=True, help="Directory (searched recursively) or glob of PDF/TXT resumes")
+    rank.add_argument("--job", help="JOB_LIBRARY name or path to a JSON job spec; omit to skip gating")
+    rank.add_argument("--out", default="-", help="Output .csv, .jsonl or .parquet file (default: CSV on stdout)")
+    rank.add_argument("--weights", help="Comma-separated overrides, e.g. skills=3,experience=2")
+    rank.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    rank.add_argument("--batch-size", type=int, default=256, help="Resumes held in memory at once")
+    rank.add_argument("--top", type=int, default=None, help="Only keep the N highest-scoring candidates")
+    rank.add_argument("--qualified-only", action="store_true", help="Drop candidates that fail the gates")
+    rank.add_argument("--no-cache", action="store_true", help="Do not use the on-disk text cache")
+    rank.add_argument("--screen", action="store_true",
+                      help="Skip full analysis of resumes missing a required skill (needs --job)")
+    rank.add_argument("--collapse-duplicates", action="store_true",
+                      help="Rank only the first of each group of near-duplicate resumes")
+    rank.add_argument("--audit", metavar="PATH", help="Also write a JSON score audit of the ranked pool")
+
+    args = parser.parse_args(argv)
+
+    try:
+        job_info = load_job_spec(args.job) if args.job else None
+        weights = parse_weights(args.weights)
+    except (KeyError, ValueError) as e:
+        parser.error(str(e.args[0]) if e.args else str(e))
+    if weights["relevance"] and not job_info:
+        parser.error("A relevance weight needs --job to match resumes against.")
+
+    cache = None if args.no_cache else TextCache.from_env(version=pipeline_version())
+    audit = AuditAccumulator() if args.audit else None
+    result = rank_resumes(
+        iter_resume_paths(args.resumes),
+        job_info,
+        weights,
+        workers=args.workers,
+        batch_size=max(1, args.batch_size),
+        top=args.top,
+        qualified_only=args.qualified_only,
+        cache=cache,
+        collapse_duplicates=args.collapse_duplicates,
+        screen=args.screen,
+        audit=audit,
+    )
+    write_results(result["rows"], args.out)
+    if audit is not None:
+        with open(args.audit, "w", encoding="utf-8") as f:
+            json.dump(audit.report(), f, indent=2)
+    logger.info(
+        f"Ranked {len(result['rows'])} of {result['processed']} resumes "
+        f"({result['failed']} failed, {result['duplicates']} duplicates skipped) -> {args.out}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
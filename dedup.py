@@ -0,0 +1,141 @@
+"""
+dedup.py — Near-duplicate resume detection (MinHash LSH)
+=========================================================
+anon_id is a hash of the anonymized text, so a resume submitted twice with a
+small edit gets two IDs. DuplicateIndex clusters such copies as resumes are
+ingested:
+
+    shingles   word 5-grams of the anonymized text, hashed with CRC-32
+    MinHash    NUM_PERM multiply-shift hashes; the share of equal signature
+               slots estimates the Jaccard similarity of two shingle sets
+    LSH        the signature is cut into BANDS bands; resumes sharing any band
+               bucket are compared, so an insert only looks at likely matches
+
+Resumes whose estimated similarity reaches the threshold join the same
+cluster. The first resume added to a cluster is its representative.
+Pure Python + NumPy, deterministic across runs (fixed seed, CRC-32 hashes).
+"""
+
+import re
+import zlib
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 16  # 8 rows per band: pairs above ~0.7 similarity almost always share a bucket
+DUPLICATE_THRESHOLD = 0.8
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Unique CRC-32 hashes of the word shingles of text (lowercased)."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    grams = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class DuplicateIndex:
+    """
+    Incremental MinHash LSH index over resume texts.
+
+    Args:
+        threshold: Estimated Jaccard similarity at which two resumes are duplicates
+        num_perm, bands: Signature length and number of LSH bands (num_perm % bands == 0)
+        seed: Seed for the hash parameters
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD, num_perm: int = NUM_PERM,
+                 bands: int = BANDS, shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd 64-bit multipliers, high 32 bits of a*x + b
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(bands)]
+        self._order: Dict[Hashable, int] = {}
+        self._parent: Dict[Hashable, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._order
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of text, or None if it has no words."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        # (num_perm, n_shingles) hash table; uint64 arithmetic wraps mod 2**64
+        table = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> np.uint64(32)
+        return table.min(axis=1).astype(np.uint32)
+
+    def add(self, doc_id: Hashable, text: str) -> Hashable:
+        """
+        Index one resume and return the representative of its cluster (doc_id
+        itself unless it duplicates an earlier resume). Re-adding a known
+        doc_id only returns its representative. Empty texts are never matched.
+        """
+        if doc_id in self._order:
+            return self.cluster_of(doc_id)
+        self._order[doc_id] = len(self._order)
+        self._parent[doc_id] = doc_id
+        sig = self.signature(text)
+        if sig is None:
+            return doc_id
+
+        keys = [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        seen = set()
+        for band, key in zip(self._buckets, keys):
+            for other in band.get(key, ()):
+                if other not in seen:
+                    seen.add(other)
+                    if np.mean(self._signatures[other] == sig) >= self.threshold:
+                        self._union(other, doc_id)
+        for band, key in zip(self._buckets, keys):
+            band.setdefault(key, []).append(doc_id)
+        self._signatures[doc_id] = sig
+        return self.cluster_of(doc_id)
+
+    def similarity(self, a: Hashable, b: Hashable) -> float:
+        """Estimated Jaccard similarity of two indexed resumes (0 if either is empty)."""
+        sig_a, sig_b = self._signatures.get(a), self._signatures.get(b)
+        if sig_a is None or sig_b is None:
+            return 0.0
+        return float(np.mean(sig_a == sig_b))
+
+    def cluster_of(self, doc_id: Hashable) -> Hashable:
+        """
+        Representative (earliest added member) of doc_id's cluster. Unions
+        always keep the earlier root, so this is a plain root lookup.
+        """
+        root = doc_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[doc_id] != root:  # path compression
+            self._parent[doc_id], doc_id = root, self._parent[doc_id]
+        return root
+
+    def clusters(self) -> Dict[Hashable, List[Hashable]]:
+        """{representative: members in insertion order} for clusters of two or more."""
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for doc_id in self._order:
+            groups.setdefault(self.cluster_of(doc_id), []).append(doc_id)
+        return {rep: members for rep, members in groups.items() if len(members) > 1}
+
+    def _union(self, a: Hashable, b: Hashable) -> None:
+        root_a, root_b = self.cluster_of(a), self.cluster_of(b)
+        if root_a != root_b:
+            first, second = sorted((root_a, root_b), key=self._order.__getitem__)
+            self._parent[second] = first
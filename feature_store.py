@@ -0,0 +1,543 @@
+"""
+feature_store.py — Columnar candidate feature store
+====================================================
+Holds the per-candidate values that scoring, gating and export need as flat
+NumPy columns instead of nested dicts:
+
+    anon_id, filename          object arrays
+    skill_bits, cert_bits      uint64 bitsets over interned keyword IDs
+    years, education_level     small ints
+    relevance                  float (BM25 job match, 0-10; see relevance.py)
+    evidence_count             evidence snippets kept by extract_features
+    is_qualified, education_passed, skills_passed, level_idx   gate columns
+
+Skill and certification names are interned once per store (the keyword lists
+in utils come first, so IDs are stable across stores built from extracted
+features). A candidate's skills cost one bit each rather than a string.
+
+Columns round-trip through NPZ (NumPy only) or Parquet (needs pyarrow).
+Ranked exports (export(), to_csv()) stream rows in chunks.
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bias_audit import AuditAccumulator
+from utils import (
+    CERTIFICATION_KEYWORDS,
+    EDUCATION_RULES,
+    EXPORT_CHUNK_SIZE,
+    EXPORT_COLUMNS,
+    SCORE_COLUMNS,
+    SCORES_CSV_HEADERS,
+    SKILL_KEYWORDS,
+    compile_gate_plan,
+    gate_results_from_checks,
+    rank_scores,
+    round_scores,
+    score_matrix,
+    write_csv_batches,
+    write_parquet_batches,
+)
+
+# Bits set per byte value, for population counts on numpy < 2.0
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Scalar columns: name -> dtype. Bitset columns are handled separately.
+STORE_COLUMNS = {
+    "anon_id": object,
+    "filename": object,
+    "years": np.int32,
+    "education_level": np.int8,
+    "education": object,
+    "relevance": np.float64,
+    "evidence_count": np.int16,
+    "has_features": np.bool_,
+    "is_qualified": np.bool_,
+    "education_passed": np.bool_,
+    "skills_passed": np.bool_,
+    "level_idx": np.int8,
+}
+
+
+def _intern(names: Iterable[str], vocab: List[str], index: Dict[str, int]) -> List[int]:
+    """IDs for names, adding unseen names to the vocabulary."""
+    ids = []
+    for name in names:
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(vocab)
+            vocab.append(name)
+        ids.append(i)
+    return ids
+
+
+def _pack(id_lists: List[List[int]], width: int) -> np.ndarray:
+    """(n, words) uint64 bitsets from per-row ID lists."""
+    bits = np.zeros((len(id_lists), max(1, -(-width // 64))), dtype=np.uint64)
+    rows = [r for r, ids in enumerate(id_lists) for _ in ids]
+    ids = np.fromiter((i for row in id_lists for i in row), dtype=np.int64, count=len(rows))
+    if len(rows):
+        np.bitwise_or.at(bits, (np.array(rows), ids // 64), np.left_shift(np.uint64(1), (ids % 64).astype(np.uint64)))
+    return bits
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits per row of a (n, words) uint64 bitset."""
+    if not len(bits):
+        return np.zeros(0, dtype=np.int64)
+    return _POPCOUNT8[np.ascontiguousarray(bits).view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def names_mask(vocab: List[str], words: int, wanted: Iterable[str]) -> np.ndarray:
+    """(words,) uint64 mask with the bits of the given vocabulary names set."""
+    index = {name: i for i, name in enumerate(vocab)}
+    return _pack([[index[n] for n in wanted if n in index]], max(len(vocab), words * 64))[0]
+
+
+class CandidateStore:
+    """
+    Columnar view of a candidate pool; row i is candidates[i].
+
+    Build with CandidateStore.from_candidates(); columns are plain NumPy
+    arrays in self.columns, bitsets in self.skill_bits / self.cert_bits.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], skill_bits: np.ndarray, cert_bits: np.ndarray,
+                 skill_vocab: List[str], cert_vocab: List[str], levels: Optional[List[str]] = None):
+        self.columns = columns
+        self.skill_bits = skill_bits
+        self.cert_bits = cert_bits
+        self.skill_vocab = skill_vocab
+        self.cert_vocab = cert_vocab
+        self.levels = list(levels or [])
+        self._matrix = None
+        self._gate_plan = None
+        self._required_hits = None
+        self._any_hit = None
+
+    @classmethod
+    def from_candidates(cls, candidates: List[Dict[str, Any]]) -> "CandidateStore":
+        """Build a store from candidate dicts ({"anon_id", "features", "gate_results", ...})."""
+        skill_vocab, cert_vocab = list(SKILL_KEYWORDS), list(CERTIFICATION_KEYWORDS)
+        skill_index = {name: i for i, name in enumerate(skill_vocab)}
+        cert_index = {name: i for i, name in enumerate(cert_vocab)}
+
+        rows, skill_ids, cert_ids = [], [], []
+        for c in candidates:
+            f = c.get("features") or {}
+            gates = c.get("gate_results") or {}
+            skill_ids.append(_intern(f.get("skills", []), skill_vocab, skill_index))
+            cert_ids.append(_intern(f.get("certifications", []), cert_vocab, cert_index))
+            rows.append((
+                c.get("anon_id"),
+                c.get("filename", ""),
+                f.get("years_experience", 0),
+                f.get("education_level", 0),
+                f.get("education", "Other"),
+                f.get("relevance", 0.0),
+                len(f.get("evidence_lines", {})),
+                bool(f),
+                c.get("is_qualified", True),
+                gates.get("education_check", {}).get("passed", True),
+                gates.get("skills_check", {}).get("passed", True),
+                gates.get("level_qualified", -1) if gates.get("level_name") else -1,
+            ))
+
+        columns = {}
+        for (name, dtype), values in zip(STORE_COLUMNS.items(), zip(*rows) if rows else [()] * len(STORE_COLUMNS)):
+            columns[name] = np.array(values, dtype=dtype) if dtype is not object else _object_array(values)
+        return cls(
+            columns,
+            _pack(skill_ids, len(skill_vocab)),
+            _pack(cert_ids, len(cert_vocab)),
+            skill_vocab,
+            cert_vocab,
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns["anon_id"])
+
+    # -------------------------------------------------------------------------
+    # Feature access
+    # -------------------------------------------------------------------------
+
+    def skill_counts(self) -> np.ndarray:
+        return popcount(self.skill_bits)
+
+    def cert_counts(self) -> np.ndarray:
+        return popcount(self.cert_bits)
+
+    def skills(self, i: int) -> List[str]:
+        """Decode row i's skills, in vocabulary order (as extract_features lists them)."""
+        return _decode(self.skill_bits[i], self.skill_vocab)
+
+    def certifications(self, i: int) -> List[str]:
+        return _decode(self.cert_bits[i], self.cert_vocab)
+
+    def skill_mask(self, names: Iterable[str]) -> np.ndarray:
+        """Bitset mask selecting the given skill names (unknown names are ignored)."""
+        return names_mask(self.skill_vocab, self.skill_bits.shape[1], names)
+
+    def feature_matrix(self) -> np.ndarray:
+        """
+        Same matrix as utils.build_feature_matrix over the stored features.
+        Built once and reused, since it only changes with the pool.
+        """
+        if self._matrix is None:
+            self._matrix = np.column_stack([
+                np.minimum(self.skill_counts(), 10),
+                np.minimum(self.columns["years"], 15),
+                self.columns["education_level"],
+                np.minimum(self.cert_counts(), 5),
+                np.minimum(self.columns["relevance"], 10),
+            ]).astype(np.float64).reshape(len(self), len(SCORE_COLUMNS))
+        return self._matrix
+
+    def set_relevance(self, values: Iterable[float]) -> None:
+        """Replace the relevance column (row order), e.g. after the job text changes."""
+        self.columns["relevance"] = np.asarray(list(values), dtype=np.float64).reshape(len(self))
+        self._matrix = None
+
+    # -------------------------------------------------------------------------
+    # Gating, scoring and export
+    # -------------------------------------------------------------------------
+
+    def set_gates(self, results: List[Tuple[bool, Dict[str, Any]]], levels: Optional[List[str]] = None) -> None:
+        """Record utils.gate_candidate results, one (is_qualified, gate_results) per row."""
+        self.columns["is_qualified"] = np.array([q for q, _ in results], dtype=np.bool_)
+        self.columns["education_passed"] = np.array(
+            [g.get("education_check", {}).get("passed", True) for _, g in results], dtype=np.bool_)
+        self.columns["skills_passed"] = np.array(
+            [g.get("skills_check", {}).get("passed", True) for _, g in results], dtype=np.bool_)
+        self.columns["level_idx"] = np.array(
+            [g.get("level_qualified", -1) if g.get("level_name") else -1 for _, g in results], dtype=np.int8)
+        self.levels = list(levels or [])
+
+    def _evaluate_gates(self, plans: List[Dict[str, Any]]) -> List[Dict[str, np.ndarray]]:
+        """
+        Evaluate gate plans over every row. The skill masks of all plans are
+        stacked and tested against skill_bits in a single AND, then combined
+        per plan; education and levels are threshold lookups.
+        """
+        words = self.skill_bits.shape[1]
+        n = len(self)
+        has_features = self.columns["has_features"]
+        years = self.columns["years"]
+        edu_level = self.columns["education_level"]
+
+        # One mask per required skill and per "any of" list, across all plans
+        id_lists = []
+        for plan in plans:
+            id_lists.extend(sorted(ids) for _, ids in plan["required"] or [])
+            if plan["any_of"] is not None:
+                id_lists.append(sorted(plan["any_of"][1]))
+        masks = _pack(id_lists, words * 64)
+        hits = (self.skill_bits[:, None, :] & masks[None, :, :]).any(axis=2)
+
+        results, col = [], 0
+        for plan in plans:
+            n_required = len(plan["required"] or [])
+            required_hits = hits[:, col:col + n_required]
+            col += n_required
+            skills_passed = required_hits.all(axis=1)
+            any_hit = np.ones(n, dtype=np.bool_)
+            if plan["any_of"] is not None:
+                any_hit = hits[:, col]
+                col += 1
+                skills_passed = skills_passed & any_hit
+
+            rule = EDUCATION_RULES.get(plan["education"]) if plan["education"] is not None else None
+            if rule is None:
+                education_passed = np.ones(n, dtype=np.bool_)
+            else:
+                _, min_level, substitute_years = rule
+                education_passed = (edu_level >= min_level) | (years >= substitute_years)
+
+            if plan["level_maxima"] is not None:
+                level_idx = np.maximum(np.searchsorted(plan["level_maxima"], years, side="right") - 1, 0)
+            else:
+                level_idx = np.full(n, -1)
+
+            education_passed = education_passed | ~has_features
+            skills_passed = skills_passed | ~has_features
+            results.append({
+                "education_passed": education_passed,
+                "skills_passed": skills_passed,
+                "is_qualified": education_passed & skills_passed,
+                "level_idx": np.where(has_features, level_idx, -1).astype(np.int8),
+                "required_hits": required_hits,
+                "any_hit": any_hit,
+            })
+        return results
+
+    def apply_gates(self, job_info: Dict[str, Any]) -> None:
+        """
+        Gate every row against job_info in one vectorized pass.
+
+        The job is compiled into a gate plan over this store's vocabulary;
+        required skills become bitmasks tested against skill_bits, education
+        rules a threshold lookup, and levels a searchsorted over the running
+        maximum of the thresholds. Rows without features pass, as in the app.
+        Per-row messages come from gate_results(i).
+        """
+        plan = compile_gate_plan(job_info, self.skill_vocab)
+        result = self._evaluate_gates([plan])[0]
+        for name in ("education_passed", "skills_passed", "is_qualified", "level_idx"):
+            self.columns[name] = result[name]
+        self.levels = list(plan["levels"])
+        self._gate_plan = plan
+        self._required_hits = result["required_hits"]
+        self._any_hit = result["any_hit"]
+
+    def match_jobs(self, jobs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Gate every row against several jobs at once, leaving the store's own
+        gate columns untouched.
+
+        Returns:
+            {"jobs": job names, "qualified": (n, jobs) bool,
+             "level_names": (n, jobs) object ("" when the job has no levels)}
+        """
+        names = list(jobs)
+        plans = [compile_gate_plan(jobs[name], self.skill_vocab) for name in names]
+        results = self._evaluate_gates(plans)
+        qualified = np.zeros((len(self), len(names)), dtype=np.bool_)
+        level_names = np.empty((len(self), len(names)), dtype=object)
+        for j, (plan, result) in enumerate(zip(plans, results)):
+            qualified[:, j] = result["is_qualified"]
+            labels = np.array([""] + list(plan["levels"]) + ["Unknown"], dtype=object)
+            level_names[:, j] = labels[np.minimum(result["level_idx"].astype(np.int64) + 1, len(plan["levels"]) + 1)]
+        return {"jobs": names, "qualified": qualified, "level_names": level_names}
+
+    def gate_results(self, i: int) -> Tuple[bool, Dict[str, Any]]:
+        """
+        (is_qualified, gate_results) for row i after apply_gates, identical to
+        utils.gate_candidate on the row's features.
+        """
+        if not self.columns["has_features"][i]:
+            return True, {}
+        plan = self._gate_plan
+        features = {
+            "education": self.columns["education"][i],
+            "education_level": int(self.columns["education_level"][i]),
+            "years_experience": int(self.columns["years"][i]),
+        }
+        missing = [req for (req, _), hit in zip(plan["required"] or [], self._required_hits[i]) if not hit]
+        return gate_results_from_checks(plan, features, missing, bool(self._any_hit[i]),
+                                        int(self.columns["level_idx"][i]))
+
+    def level_names(self) -> np.ndarray:
+        """Level name per row ("" when not gated, "Unknown" past the last level)."""
+        names = np.array([""] + self.levels + ["Unknown"], dtype=object)
+        idx = self.columns["level_idx"].astype(np.int64) + 1
+        return names[np.minimum(idx, len(self.levels) + 1)]
+
+    def score(self, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(order, totals, parts): rank order and rounded scores, as in rank_from_matrix."""
+        totals, parts = score_matrix(self.feature_matrix(), weights)
+        totals = round_scores(totals)
+        return rank_scores(totals), totals, round_scores(parts)
+
+    def to_frame(self, weights: Optional[Dict[str, float]] = None, display_names: Optional[Dict[str, str]] = None):
+        """
+        pandas DataFrame with one row per candidate. With weights, rows are in
+        rank order with rank, score and per-category score columns (the
+        get_logs_csv layout plus gate columns).
+        """
+        import pandas as pd
+
+        data = {name: self.columns[name] for name in ("anon_id", "filename", "years", "education_level",
+                                                      "is_qualified", "education_passed", "skills_passed")}
+        data["level_name"] = self.level_names()
+        data["skills"] = self.skill_counts()
+        data["certifications"] = self.cert_counts()
+        frame = pd.DataFrame(data)
+        if weights is None:
+            return frame
+
+        order, totals, parts = self.score(weights)
+        frame = frame.iloc[order].reset_index(drop=True)
+        names = display_names or {}
+        frame.insert(0, "rank", np.arange(1, len(frame) + 1))
+        frame.insert(1, "display_name", [names.get(a, "Unknown") for a in frame["anon_id"]])
+        frame.insert(3, "score", totals[order])
+        for j, name in enumerate(SCORE_COLUMNS):
+            frame.insert(4 + j, f"{name}_score", parts[order, j])
+        return frame
+
+    def iter_export_batches(self, weights: Dict[str, float], display_names: Optional[Dict[str, str]] = None,
+                            chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the ranked export (utils.EXPORT_COLUMNS) as {column: values}
+        batches of up to chunk_size rows, sliced from the columns in rank
+        order, so only one batch of Python values exists at a time.
+        """
+        order, totals, parts = self.score(weights)
+        names = display_names or {}
+        level_names = self.level_names()
+        skill_counts, cert_counts = self.skill_counts(), self.cert_counts()
+        for start in range(0, len(order), chunk_size):
+            rows = order[start:start + chunk_size]
+            anon_ids = [a or "" for a in self.columns["anon_id"][rows].tolist()]
+            batch = {
+                "rank": np.arange(start + 1, start + len(rows) + 1),
+                "display_name": [names.get(a, "Unknown") for a in anon_ids],
+                "anon_id": anon_ids,
+                "score": totals[rows],
+            }
+            for j, name in enumerate(SCORE_COLUMNS):
+                batch[f"{name}_score"] = parts[rows, j]
+            batch.update({
+                "is_qualified": self.columns["is_qualified"][rows],
+                "level_name": level_names[rows].tolist(),
+                "education_passed": self.columns["education_passed"][rows],
+                "skills_passed": self.columns["skills_passed"][rows],
+                "skill_count": skill_counts[rows].astype(np.int64),
+                "certification_count": cert_counts[rows].astype(np.int64),
+                "evidence_count": self.columns["evidence_count"][rows].astype(np.int64),
+            })
+            yield batch
+
+    def iter_export_rows(self, weights: Dict[str, float], display_names: Optional[Dict[str, str]] = None,
+                         chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """The ranked export as row dicts, in the utils.iter_export_rows layout."""
+        for batch in map(_as_lists, self.iter_export_batches(weights, display_names, chunk_size)):
+            for row in zip(*(batch[name] for name in EXPORT_COLUMNS)):
+                yield dict(zip(EXPORT_COLUMNS, row))
+
+    def export(self, out: Any, weights: Dict[str, float], display_names: Optional[Dict[str, str]] = None,
+               fmt: Optional[str] = None) -> int:
+        """
+        Stream the ranked export (scores, gate results, level, evidence
+        counts) to a path or stream. fmt is "csv" or "parquet" (needs
+        pyarrow); by default it follows the path suffix, else CSV.
+
+        Returns:
+            Number of rows written
+        """
+        if fmt is None:
+            fmt = "parquet" if isinstance(out, (str, Path)) and str(out).endswith(".parquet") else "csv"
+        if fmt not in ("csv", "parquet"):
+            raise ValueError(f"Unknown export format {fmt!r}; expected 'csv' or 'parquet'")
+        batches = self.iter_export_batches(weights, display_names)
+        if fmt == "parquet":
+            return write_parquet_batches(batches, out)
+        return write_csv_batches(map(_as_lists, batches), out)
+
+    def bias_audit(self, weights: Dict[str, float], mask: Optional[np.ndarray] = None,
+                   audit: Optional[AuditAccumulator] = None, start: int = 0) -> AuditAccumulator:
+        """
+        Audit of the rows from start on selected by a boolean mask over all
+        rows (all rows by default): scores, gate columns and skill bitsets go
+        to the accumulator as columns, without per-candidate dicts. Pass an
+        earlier accumulator and the number of rows it has seen to add only
+        the rows appended since. Call .report() on the result.
+        """
+        _, totals, _ = self.score(weights)
+        rows = np.arange(start, len(self))
+        if mask is not None:
+            rows = rows[np.asarray(mask, dtype=np.bool_)[start:]]
+        if audit is None:
+            audit = AuditAccumulator(self.skill_vocab)
+        else:
+            audit.extend_vocab(self.skill_vocab)
+        audit.add(totals[rows], qualified=self.columns["is_qualified"][rows],
+                  levels=self.level_names()[rows].tolist(), skill_bits=self.skill_bits[rows])
+        return audit
+
+    def to_csv(self, weights: Dict[str, float], display_names: Optional[Dict[str, str]] = None) -> str:
+        """Ranked CSV string in the same columns and format as utils.get_logs_csv."""
+        out = io.StringIO()
+        write_csv_batches(map(_as_lists, self.iter_export_batches(weights, display_names)), out, SCORES_CSV_HEADERS)
+        return out.getvalue()[:-1]  # no trailing newline, as before
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def _meta(self) -> Dict[str, Any]:
+        return {"skill_vocab": self.skill_vocab, "cert_vocab": self.cert_vocab, "levels": self.levels}
+
+    def save(self, path: Any) -> None:
+        """Save to .npz, or .parquet (requires pyarrow)."""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            self._save_parquet(path)
+            return
+        arrays = {name: self.columns[name].astype(str) if STORE_COLUMNS[name] is object else self.columns[name]
+                  for name in STORE_COLUMNS}
+        np.savez_compressed(path, skill_bits=self.skill_bits, cert_bits=self.cert_bits,
+                            meta=np.array(json.dumps(self._meta())), **arrays)
+
+    @classmethod
+    def load(cls, path: Any) -> "CandidateStore":
+        """Load a store written by save()."""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            return cls._load_parquet(path)
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            columns = {name: _object_array(data[name].tolist()) if dtype is object else data[name]
+                       for name, dtype in STORE_COLUMNS.items()}
+            return cls(columns, data["skill_bits"], data["cert_bits"],
+                       meta["skill_vocab"], meta["cert_vocab"], meta["levels"])
+
+    def _save_parquet(self, path: Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet support requires pyarrow (pip install pyarrow); use .npz instead.")
+        data = {name: self.columns[name] for name in STORE_COLUMNS}
+        for prefix, bits in (("skill_bits", self.skill_bits), ("cert_bits", self.cert_bits)):
+            for w in range(bits.shape[1]):
+                data[f"{prefix}_{w}"] = bits[:, w]
+        table = pa.table({name: pa.array(values) for name, values in data.items()})
+        table = table.replace_schema_metadata({"candidatecompass": json.dumps(self._meta())})
+        pq.write_table(table, path)
+
+    @classmethod
+    def _load_parquet(cls, path: Path) -> "CandidateStore":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet support requires pyarrow (pip install pyarrow); use .npz instead.")
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[b"candidatecompass"])
+        columns = {}
+        for name, dtype in STORE_COLUMNS.items():
+            values = table.column(name).to_pylist()
+            columns[name] = _object_array(values) if dtype is object else np.array(values, dtype=dtype)
+
+        def bits(prefix):
+            words = sorted((n for n in table.column_names if n.startswith(prefix + "_")),
+                           key=lambda n: int(n.rsplit("_", 1)[1]))
+            return np.column_stack([table.column(n).to_numpy().astype(np.uint64) for n in words]).reshape(
+                table.num_rows, len(words))
+
+        return cls(columns, bits("skill_bits"), bits("cert_bits"),
+                   meta["skill_vocab"], meta["cert_vocab"], meta["levels"])
+
+
+def _object_array(values: Iterable[Any]) -> np.ndarray:
+    """1-D object array holding the values as-is (strings, None)."""
+    values = list(values)
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _as_lists(batch: Dict[str, Any]) -> Dict[str, list]:
+    """Export batch with NumPy columns as Python lists (formatted like the dict-based export)."""
+    return {name: v.tolist() if isinstance(v, np.ndarray) else v for name, v in batch.items()}
+
+
+def _decode(row_bits: np.ndarray, vocab: List[str]) -> List[str]:
+    """Vocabulary names whose bits are set in one bitset row."""
+    flags = np.unpackbits(np.ascontiguousarray(row_bits).view(np.uint8), bitorder="little")
+    return [vocab[i] for i in np.flatnonzero(flags[:len(vocab)]).tolist()]
@@ -0,0 +1,65 @@
+"""
+job_library.py — Built-in job specifications
+=============================================
+Job specs used for qualification gating (utils.gate_candidate). Shared by the
+Streamlit app and the batch CLI (candidatecompass.py).
+
+Each spec holds:
+    file: Job description PDF (relative to the repo root)
+    levels / experience_required: Level names and minimum years per level
+    required_skills: Skills a candidate must have ALL of
+    required_any_of: Tools a candidate must have AT LEAST ONE of
+    required_education: Education requirement text
+    description: One-line summary shown in the UI
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+# Real government jobs (see sample_data/generated/ActualJobs). The first entry
+# is the app's default selection.
+JOB_LIBRARY = {
+    "Data Analyst I-V (Infrastructure)": {
+        "file": "sample_data/generated/ActualJobs/TxDOT Data Analyst 1-5.pdf",
+        "levels": ["I", "II", "III", "IV", "V"],
+        "experience_required": [0, 1, 2, 3, 4],
+        "required_skills": ["SQL"],  # Core required skills
+        "required_any_of": ["Tableau", "Power BI", "Qlik"],  # Need at least ONE visualization tool
+        "required_education": "Bachelor's or equivalent experience",
+        "description": "Infrastructure Division - Data analysis and research position with 5 career levels"
+    },
+    "Business Analyst II-III (Finance)": {
+        "file": "sample_data/generated/ActualJobs/Business Analyst II-III.pdf",
+        "levels": ["II", "III"],
+        "experience_required": [2, 4],
+        "required_skills": ["Business Analysis"],
+        "required_any_of": ["Requirements Gathering", "Process Improvement", "Technical Documentation"],
+        "required_education": "Bachelor's or equivalent experience",
+        "description": "Finance Division - Business analyst for state financial systems with 2 career levels"
+    },
+    "Contract Specialist II-V (Regional)": {
+        "file": "sample_data/generated/ActualJobs/Contract Specialist II, III, IV or V.pdf",
+        "levels": ["II", "III", "IV", "V"],
+        "experience_required": [1, 2, 4, 6],
+        "required_skills": ["Procurement"],
+        "required_any_of": ["Contract Administration", "Contracting", "Procurement Regulations"],
+        "required_education": "Bachelor's or equivalent experience",
+        "description": "Regional District - Government contract specialist for procurement and compliance with 4 career levels"
+    },
+}
+
+def load_job_spec(spec: str) -> Dict[str, Any]:
+    """
+    Resolve a job spec given as a JOB_LIBRARY name or a path to a JSON file
+    with the same keys.
+
+    Raises KeyError if it is neither.
+    """
+    if spec in JOB_LIBRARY:
+        return JOB_LIBRARY[spec]
+    path = Path(spec)
+    if path.is_file():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    raise KeyError(f"Unknown job '{spec}'. Use one of {list(JOB_LIBRARY)} or a JSON spec file.")
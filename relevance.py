@@ -0,0 +1,194 @@
+"""
+relevance.py — Offline BM25 relevance between a job description and resumes
+=============================================================================
+A sparse inverted index over anonymized resume tokens, scored with Okapi
+BM25 against the job text. Pure Python + NumPy: no models, no downloads.
+
+Documents are added incrementally (e.g. as resumes are ingested); postings
+are kept as Python lists while the index grows and frozen into NumPy arrays
+on the first query after a change, so a query is a handful of vectorized
+scatter-adds over the postings of the job's terms. BM25's corpus statistics
+are computed over the pool being ranked, not everything indexed so far.
+
+The relevance score fed into scoring is BM25 rescaled to 0-10 against the
+best match in the pool (see RelevanceIndex.relevance).
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Common English and job-posting filler; these carry no signal for matching
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing for from had has have having he her here hers him his how i if in into is it its itself just
+may me more most must my no nor not of off on once only or other our ours out over own per same
+she should so some such than that the their theirs them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with would
+you your yours
+able including include includes position positions job work working required requirements
+preferred responsibilities duties candidate candidates experience years year skills skill
+""".split())
+
+# Okapi BM25 parameters (the usual defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens, without stopwords and single characters."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def job_query(job_text: str, job_info: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Query text for a job: the description plus, for a job_library spec, its
+    required skills, tools and summary (library PDFs may be scanned images
+    with little or no extractable text).
+    """
+    if not job_info:
+        return job_text
+    terms = list(job_info.get("required_skills", [])) + list(job_info.get("required_any_of", []))
+    return "\n".join([job_text, " ".join(terms), job_info.get("description", "")])
+
+
+class RelevanceIndex:
+    """
+    Incremental BM25 index.
+
+    Document counts, document frequencies and the average length are taken
+    over the documents being ranked (all of them, or the doc_ids passed to
+    scores/relevance), so a pool scores the same however many other
+    documents the index holds.
+
+    Args:
+        k1, b: BM25 term-frequency saturation and length normalization
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[Hashable] = []
+        self._row: Dict[Hashable, int] = {}
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[List[int]]] = {}  # term -> [rows, term frequencies]
+        self._frozen: Optional[Dict[str, tuple]] = None
+        self._length_array: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._row
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        """Index one document. Re-adding a known doc_id is a no-op."""
+        if doc_id in self._row:
+            return
+        row = len(self.doc_ids)
+        self._row[doc_id] = row
+        self.doc_ids.append(doc_id)
+        tokens = tokenize(text)
+        self._lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = [[], []]
+            posting[0].append(row)
+            posting[1].append(tf)
+        self._frozen = None
+
+    def retain(self, doc_ids: Iterable[Hashable]) -> int:
+        """Drop every document not in doc_ids, renumbering the rest. Returns how many were dropped."""
+        keep = set(doc_ids)
+        kept_rows = [row for row, doc_id in enumerate(self.doc_ids) if doc_id in keep]
+        dropped = len(self.doc_ids) - len(kept_rows)
+        if not dropped:
+            return 0
+        new_row = {old: new for new, old in enumerate(kept_rows)}
+        self.doc_ids = [self.doc_ids[row] for row in kept_rows]
+        self._row = {doc_id: row for row, doc_id in enumerate(self.doc_ids)}
+        self._lengths = [self._lengths[row] for row in kept_rows]
+        postings = {}
+        for term, (rows, tfs) in self._postings.items():
+            pairs = [(new_row[row], tf) for row, tf in zip(rows, tfs) if row in new_row]
+            if pairs:
+                postings[term] = [[row for row, _ in pairs], [tf for _, tf in pairs]]
+        self._postings = postings
+        self._frozen = None
+        return dropped
+
+    def _posting(self, term: str) -> Optional[tuple]:
+        """(rows, term frequencies) of a term as NumPy arrays, frozen until the next add."""
+        if self._frozen is None:
+            self._frozen = {}
+            self._length_array = np.asarray(self._lengths, dtype=np.float64)
+        entry = self._frozen.get(term)
+        if entry is None:
+            posting = self._postings.get(term)
+            if posting is None:
+                return None
+            entry = self._frozen[term] = (np.asarray(posting[0], dtype=np.int64),
+                                          np.asarray(posting[1], dtype=np.float64))
+        return entry
+
+    def _rows(self, doc_ids: Optional[List[Hashable]]) -> np.ndarray:
+        """Index rows of doc_ids (-1 for unknown IDs); every row when doc_ids is None."""
+        if doc_ids is None:
+            return np.arange(len(self.doc_ids), dtype=np.int64)
+        return np.array([self._row.get(d, -1) for d in doc_ids], dtype=np.int64)
+
+    def scores(self, query: str, doc_ids: Optional[List[Hashable]] = None) -> np.ndarray:
+        """
+        BM25 score for the query text of every indexed document (in add
+        order), or of doc_ids in that order with the pool statistics taken
+        over those documents only (unknown IDs score 0).
+        """
+        rows = self._rows(doc_ids)
+        out = np.zeros(len(rows), dtype=np.float64)
+        known = rows[rows >= 0]
+        member = np.zeros(len(self.doc_ids), dtype=np.bool_)
+        member[known] = True
+        n = int(member.sum())
+        if not n:
+            return out
+
+        full = np.zeros(len(self.doc_ids), dtype=np.float64)
+        norm = None
+        for term in set(tokenize(query)):
+            entry = self._posting(term)
+            if entry is None:
+                continue
+            term_rows, tf = entry
+            in_pool = member[term_rows]
+            term_rows, tf = term_rows[in_pool], tf[in_pool]
+            df = len(term_rows)
+            if not df:
+                continue
+            if norm is None:
+                lengths = self._length_array
+                avg_length = lengths[member].mean()
+                if avg_length:
+                    norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+                else:
+                    norm = np.full(len(lengths), self.k1)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            # Rows are unique within a posting, so a fancy-index add is safe
+            full[term_rows] += idf * tf * (self.k1 + 1) / (tf + norm[term_rows])
+        return np.where(rows >= 0, full[rows], 0.0) if len(rows) else out
+
+    def relevance(self, query: str, doc_ids: Optional[List[Hashable]] = None) -> np.ndarray:
+        """
+        Relevance on a 0-10 scale, rounded to 2 decimals: the best match gets
+        10. With doc_ids, values are returned in that order and computed over
+        those documents alone (unknown IDs score 0), so one index can serve
+        several pools.
+        """
+        scores = self.scores(query, doc_ids)
+        top = scores.max() if len(scores) else 0.0
+        return np.round(scores * (10.0 / top), 2) if top > 0 else scores
@@ -13,22 +13,45 @@ Developer Notes:
 
 import streamlit as st
 import hashlib
+import importlib.util
+import io
 import os
 import json
 import base64
+import re
+import uuid
+from collections import Counter
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from anonymize_jobs import JOB_ANONYMIZER_VERSION, anonymize_job_text
+from dedup import DuplicateIndex
+from feature_store import CandidateStore
+from job_library import JOB_LIBRARY
+from relevance import RelevanceIndex, job_query
+from text_cache import SessionCacheView, TextCache
+from text_store import RETENTION_POLICIES, SessionTextStore, deep_sizeof
 from utils import (
-    anonymize_text,
+    extract_texts,
+    ingest_resumes,
+    pipeline_version,
     extract_features,
-    score_candidates,
+    build_job_profile,
+    rank_from_matrix,
     generate_template_questions,
     log_record,
     clear_logs,
-    get_logs_csv,
-    bias_audit_stub,
     check_contrast_ratio,
-    generate_decision_pdf,
+    decision_pdf_key,
+    get_decision_pdf,
+    write_decision_pdfs_zip,
+    generate_panel_report,
+    iter_dedup,
+    iter_gate,
+    iter_score,
+    OnlineRanking,
 )
 
 # =============================================================================
@@ -68,6 +91,10 @@ st.set_page_config(
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Default rubric slider weights
+RUBRIC_DEFAULTS = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5, "relevance": 0.0}
+
+
 def generate_candidate_display_name(index: int) -> str:
     """
     Generate display name for candidate (A, B, C, etc).
@@ -100,6 +127,99 @@ def get_candidate_display_name(anon_id: str) -> str:
     return mapping.get(anon_id, f"`{anon_id}`")
 
 
+def extract_text_from_file(file_obj) -> str:
+    """Extract text from a single uploaded file (PDF or TXT)."""
+    result = extract_texts([file_obj], workers=1)[0]
+    if result["error"]:
+        st.warning(f"Text extraction failed for {result['name']}: {result['error']}")
+    return result["text"]
+
+
+@st.cache_resource
+def get_text_cache():
+    """
+    Shared on-disk cache of anonymized resume text, one per server process.
+    Configure with CANDIDATECOMPASS_CACHE_DIR ("off" disables) and CANDIDATECOMPASS_CACHE_MB.
+    """
+    return TextCache.from_env(version=pipeline_version())
+
+
+def session_text_cache():
+    """This session's view of the shared text cache (None when caching is off); see SessionCacheView."""
+    cache = get_text_cache()
+    if cache is None:
+        return None
+    view = st.session_state.get("text_cache_view")
+    if view is None or view.cache is not cache:
+        view = st.session_state["text_cache_view"] = SessionCacheView(cache)
+    return view
+
+
+def candidate_text(c: dict) -> str:
+    """
+    Anonymized text of a candidate. Text released after analysis is
+    rehydrated from the session text store, or re-extracted (cache-backed)
+    from a demo file if the retention policy dropped it.
+    """
+    if c.get("text"):
+        return c["text"]
+    text = st.session_state["text_store"].get(c["anon_id"])
+    if text is None and Path(c["filename"]).exists():
+        text = ingest_resumes([c["filename"]], cache=session_text_cache())[0]["text"]
+    return text or ""
+
+
+def format_bytes(n: int) -> str:
+    """Human-readable byte count (e.g. "1.4 MB")."""
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def session_memory_report() -> dict:
+    """Approximate bytes held by this session, by component."""
+    state = st.session_state
+    text_stats = state["text_store"].stats()
+    scoring_state = state.get("scoring_state") or {}
+    return {
+        "Candidates & features": deep_sizeof(state.get("candidates", [])),
+        "Resume text store": text_stats["memory_bytes"],
+        "Scoring & relevance indexes": deep_sizeof(
+            [scoring_state.get("store"), state.get("relevance_index"),
+             (state.get("dedup_state") or {}).get("index")]),
+        "Decision PDFs": sum(len(pdf) for pdf in state.get("decision_pdfs", {}).values())
+        + len(scoring_state.get("decision_zip", (None, b""))[1])
+        + len(scoring_state.get("panel_report", (None, b""))[1]),
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_job_profile(path: str, mtime: float, anonymizer_version: str) -> dict:
+    """
+    Extract, anonymize and profile a library job posting.
+    mtime and anonymizer_version are cache-key arguments only: editing the file
+    or a JOB_TEXT_RULES change invalidates the entry.
+    """
+    text = extract_texts([path], workers=1)[0]["text"]
+    return build_job_profile(anonymize_job_text(text))
+
+
+def load_job_profile(path) -> dict:
+    """Cached job profile for a JOB_LIBRARY file, or None if the file is missing."""
+    job_path = Path(path)
+    if not job_path.exists():
+        return None
+    return _cached_job_profile(str(job_path), job_path.stat().st_mtime, JOB_ANONYMIZER_VERSION)
+
+
+def set_job_text(text: str, profile: dict = None) -> None:
+    """Store the active job description together with its keyword profile."""
+    st.session_state["job_text"] = text
+    st.session_state["job_profile"] = profile if profile is not None else build_job_profile(text)
+
+
 def get_base64_image(image_path: str) -> str:
     """Convert image to base64 for embedding in HTML."""
     if not os.path.exists(image_path):
@@ -209,10 +329,18 @@ st.sidebar.markdown("**Data Management**")
 
 # Purge logs button
 if st.sidebar.button("Purge All Data", type="secondary"):
-    clear_logs()
+    if "audit_session_id" in st.session_state:
+        clear_logs(st.session_state["audit_session_id"])  # this session's records only
     st.session_state["candidates"] = []
-    st.session_state["job_text"] = ""
-    st.sidebar.success("All in-memory data purged.")
+    st.session_state["reviewer_notes"] = {}
+    st.session_state["decision_pdfs"] = {}
+    st.session_state["relevance_index"] = RelevanceIndex()
+    if "text_store" in st.session_state:
+        st.session_state["text_store"].clear()
+    set_job_text("")
+    if session_text_cache() is not None:
+        session_text_cache().clear()  # entries this session stored or read; other sessions keep theirs
+    st.sidebar.success("All in-memory data and this session's cached resume text purged.")
 
 # =============================================================================
 # SESSION STATE INITIALIZATION
@@ -220,8 +348,29 @@ if st.sidebar.button("Purge All Data", type="secondary"):
 
 if "candidates" not in st.session_state:
     st.session_state["candidates"] = []
+if "audit_session_id" not in st.session_state:
+    # This session's partition of the shared audit log
+    st.session_state["audit_session_id"] = uuid.uuid4().hex
 if "job_text" not in st.session_state:
-    st.session_state["job_text"] = ""
+    set_job_text("")
+if "relevance_index" not in st.session_state:
+    # BM25 index over anonymized resume text, grown as resumes arrive
+    st.session_state["relevance_index"] = RelevanceIndex()
+if "text_store" not in st.session_state:
+    # Resume text released from the candidate dicts after analysis
+    st.session_state["text_store"] = SessionTextStore.from_env()
+
+if "text_retention" not in st.session_state:
+    st.session_state["text_retention"] = st.session_state["text_store"].policy
+text_policy = st.sidebar.selectbox(
+    "Resume text retention",
+    options=list(RETENTION_POLICIES),
+    format_func=RETENTION_POLICIES.get,
+    key="text_retention",
+    help="How anonymized resume text is held once features are extracted. "
+         "It is rehydrated on demand, e.g. when a screened-out resume is analyzed for another job.",
+)
+st.session_state["text_store"].set_policy(text_policy)
 
 # =============================================================================
 # FILE UPLOAD SECTION
@@ -229,19 +378,6 @@ if "job_text" not in st.session_state:
 
 st.subheader("1. Select or Upload Job")
 
-# Real government job selector (simplified to single demo job)
-JOB_LIBRARY = {
-    "Data Analyst I-V (Infrastructure)": {
-        "file": "sample_data/generated/ActualJobs/TxDOT Data Analyst 1-5.pdf",
-        "levels": ["I", "II", "III", "IV", "V"],
-        "experience_required": [0, 1, 2, 3, 4],
-        "required_skills": ["SQL"],  # Core required skills
-        "required_any_of": ["Tableau", "Power BI", "Qlik"],  # Need at least ONE visualization tool
-        "required_education": "Bachelor's or equivalent experience",
-        "description": "Infrastructure Division - Data analysis and research position with 5 career levels"
-    }
-}
-
 # Quick Start Guide
 with st.expander("ℹ️ How to Use This Demo"):
     st.markdown("""
@@ -289,16 +425,11 @@ with col2:
         selected_job_key = list(JOB_LIBRARY.keys())[0]
         job_info = JOB_LIBRARY[selected_job_key]
 
-        # Load job description from PDF
-        from pypdf import PdfReader
+        # Load anonymized job description (cached; no PDF I/O after the first load)
         job_path = Path(job_info["file"])
-        if job_path.exists():
-            reader = PdfReader(job_path)
-            job_text = "\n".join([p.extract_text() or "" for p in reader.pages])
-
-            # Anonymize job description
-            from anonymize_jobs import anonymize_job_text
-            st.session_state["job_text"] = anonymize_job_text(job_text)
+        job_profile = load_job_profile(job_path)
+        if job_profile is not None:
+            set_job_text(job_profile["text"], job_profile)
             st.session_state["selected_job"] = selected_job_key
             st.session_state["job_info"] = job_info
 
@@ -342,16 +473,11 @@ if job_selector != "Upload Custom Job" and job_selector in JOB_LIBRARY:
         unsafe_allow_html=True
     )
 
-    # Load job description
-    from pypdf import PdfReader
+    # Load anonymized job description (cached; no PDF I/O after the first load)
     job_path = Path(job_info["file"])
-    if job_path.exists():
-        reader = PdfReader(job_path)
-        job_text = "\n".join([p.extract_text() or "" for p in reader.pages])
-
-        # Anonymize job description
-        from anonymize_jobs import anonymize_job_text
-        st.session_state["job_text"] = anonymize_job_text(job_text)
+    job_profile = load_job_profile(job_path)
+    if job_profile is not None:
+        set_job_text(job_profile["text"], job_profile)
         st.session_state["selected_job"] = job_selector
         st.session_state["job_info"] = job_info
 
@@ -408,7 +534,7 @@ if job_selector == "Upload Custom Job":
         help="Upload your own job requirements document"
     )
     if uploaded_jd:
-        st.session_state["job_text"] = extract_text_from_file(uploaded_jd)
+        set_job_text(extract_text_from_file(uploaded_jd))
         st.success(f"✅ Custom job loaded: {len(st.session_state['job_text'])} characters")
 
 st.subheader("2. Upload Candidate Resumes")
@@ -423,6 +549,13 @@ with col1:
         key="resume_upload",
         help="Upload candidate resumes for evaluation"
     )
+    fast_screening = st.checkbox(
+        "Fast screening",
+        key="fast_screening",
+        disabled=not st.session_state.get("job_info"),
+        help="Scan each resume for the job's required skills first; resumes missing one are "
+             "recorded as disqualified with the reason and skip full analysis",
+    )
 
 with col2:
     st.markdown("<br>", unsafe_allow_html=True)
@@ -447,60 +580,87 @@ with col2:
             st.error("Demo data not found. Check sample_data/generated/ExampleJob/")
 
 
-def extract_text_from_file(file_obj) -> str:
-    """Extract text from uploaded file (PDF or TXT)."""
-    if file_obj.type == "application/pdf":
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(file_obj)
-            pages = [p.extract_text() or "" for p in reader.pages]
-            return "\n".join(pages)
-        except Exception as e:
-            st.warning(f"PDF extraction failed: {e}")
-            return file_obj.getvalue().decode(errors="ignore")
-    else:
-        return file_obj.getvalue().decode(errors="ignore")
-
-
 def process_uploads(jd_file, resume_files):
     """Process uploaded job description and resumes."""
     if jd_file is not None:
-        st.session_state["job_text"] = extract_text_from_file(jd_file)
+        set_job_text(extract_text_from_file(jd_file))
 
     if resume_files:
         cand_list = []
-        for f in resume_files:
-            text = extract_text_from_file(f)
-            # Anonymize immediately
-            anon_text, _ = anonymize_text(text)
+        # Anonymized on ingest; raw text never leaves ingest_resumes
+        for f, result in zip(resume_files, ingest_resumes(resume_files, cache=session_text_cache())):
+            if result["error"]:
+                st.warning(f"Text extraction failed for {f.name}: {result['error']}")
+            anon_text = result["text"]
             # Generate anonymous ID from content hash
             anon_id = hashlib.sha256(anon_text.encode()).hexdigest()[:12]
             cand_list.append({
                 "filename": f.name,
                 "text": anon_text,
+                "features": result["features"],
                 "anon_id": anon_id
             })
         st.session_state["candidates"] = cand_list
 
 
-# Process resume uploads
-if uploaded_resumes:
+# Process resume uploads. Resumes are ingested in small batches and pushed onto
+# a live leaderboard, so the best candidates so far show up after the first
+# few files instead of after the whole upload.
+LIVE_TOP_K = 10
+LIVE_BATCH_SIZE = 8
+
+screen_job = st.session_state.get("job_info") if fast_screening else None
+upload_signature = (bool(screen_job),) + tuple(getattr(f, "file_id", f.name) for f in uploaded_resumes or [])
+if uploaded_resumes and (
+    upload_signature != st.session_state.get("upload_signature") or not st.session_state.get("candidates")
+):
     cand_list = []
     st.session_state["candidate_display_names"] = {}  # Reset mapping
-    for idx, f in enumerate(uploaded_resumes):
-        text = extract_text_from_file(f)
-        # Anonymize immediately
-        anon_text, _ = anonymize_text(text)
-        # Generate anonymous ID from content hash
-        anon_id = hashlib.sha256(anon_text.encode()).hexdigest()[:12]
-        cand_list.append({
-            "filename": f.name,
-            "text": anon_text,
-            "anon_id": anon_id
-        })
-        # Create display name mapping
-        st.session_state["candidate_display_names"][anon_id] = generate_candidate_display_name(idx)
+    job_info = st.session_state.get("job_info")
+    live = OnlineRanking(k=LIVE_TOP_K)
+    progress = st.progress(0.0, text="Processing resumes...")
+    leaderboard = st.empty()
+    for start in range(0, len(uploaded_resumes), LIVE_BATCH_SIZE):
+        batch = uploaded_resumes[start:start + LIVE_BATCH_SIZE]
+        # Anonymized on ingest; warm re-runs are served from the text cache
+        ingested = ingest_resumes(batch, cache=session_text_cache(), screen_job=screen_job)
+        for idx, (f, result) in enumerate(zip(batch, ingested), start=start):
+            if result["error"]:
+                st.warning(f"Text extraction failed for {f.name}: {result['error']}")
+            anon_text = result["text"]
+            # Generate anonymous ID from content hash
+            anon_id = hashlib.sha256(anon_text.encode()).hexdigest()[:12]
+            cand_list.append({
+                "filename": f.name,
+                "text": anon_text,
+                "features": result["features"],
+                "anon_id": anon_id
+            })
+            if result.get("screened_out"):
+                cand_list[-1]["screened_out"] = result["screened_out"]
+                cand_list[-1]["screened_for"] = st.session_state.get("selected_job")
+            # Create display name mapping
+            st.session_state["candidate_display_names"][anon_id] = generate_candidate_display_name(idx)
+
+        # Provisional scores with the current rubric; the full ranking below replaces them
+        for doc in iter_score(iter_gate(cand_list[start:], job_info),
+                              st.session_state.get("rubric_weights", RUBRIC_DEFAULTS)):
+            live.push(doc)
+        progress.progress(len(cand_list) / len(uploaded_resumes),
+                          text=f"Processed {len(cand_list)} of {len(uploaded_resumes)} resumes")
+        leaderboard.dataframe(pd.DataFrame([
+            {
+                "Rank": doc["rank"],
+                "Candidate": get_candidate_display_name(doc["anon_id"]).strip("`"),
+                "Score": doc["score"],
+                "Qualified": "✅" if doc["is_qualified"] else "❌",
+            }
+            for doc in live.top()
+        ], columns=["Rank", "Candidate", "Score", "Qualified"]), hide_index=True)
+    progress.empty()
+    leaderboard.empty()
     st.session_state["candidates"] = cand_list
+    st.session_state["upload_signature"] = upload_signature
     st.success(f"✅ Loaded {len(cand_list)} candidate resumes")
 
 # Show current data status
@@ -521,29 +681,39 @@ st.subheader("3. Adjust Scoring Rubric (Optional)")
 
 st.markdown("*Adjust weights to prioritize different qualifications:*")
 
-col_w1, col_w2, col_w3, col_w4 = st.columns(4)
+col_w1, col_w2, col_w3, col_w4, col_w5 = st.columns(5)
 
 with col_w1:
-    weight_skills = st.slider("Skills", 0.0, 5.0, 3.0, 0.5, help="Weight for matching skills")
+    weight_skills = st.slider("Skills", 0.0, 5.0, RUBRIC_DEFAULTS["skills"], 0.5, help="Weight for matching skills")
 with col_w2:
-    weight_exp = st.slider("Experience", 0.0, 5.0, 2.0, 0.5, help="Weight for years of experience")
+    weight_exp = st.slider("Experience", 0.0, 5.0, RUBRIC_DEFAULTS["experience"], 0.5,
+                           help="Weight for years of experience")
 with col_w3:
-    weight_edu = st.slider("Education", 0.0, 5.0, 1.0, 0.5, help="Weight for education level")
+    weight_edu = st.slider("Education", 0.0, 5.0, RUBRIC_DEFAULTS["education"], 0.5, help="Weight for education level")
 with col_w4:
-    weight_certs = st.slider("Certifications", 0.0, 3.0, 0.5, 0.5, help="Weight for certifications")
+    weight_certs = st.slider("Certifications", 0.0, 3.0, RUBRIC_DEFAULTS["certifications"], 0.5,
+                             help="Weight for certifications")
+with col_w5:
+    weight_relevance = st.slider("Job Relevance", 0.0, 3.0, RUBRIC_DEFAULTS["relevance"], 0.5,
+                                 help="Weight for keyword relevance (BM25) between resume and job description")
 
 weights = {
     "skills": weight_skills,
     "experience": weight_exp,
     "education": weight_edu,
     "certifications": weight_certs,
+    "relevance": weight_relevance,
 }
+# Remembered for the live leaderboard of the next upload
+st.session_state["rubric_weights"] = weights
 
 col_info, col_reset = st.columns([3, 1])
 
 with col_info:
     st.caption("**How scoring works:** Each category contributes based on its weight. "
                "Skills capped at 10, experience at 15 years to prevent outliers. "
+               "Job relevance scores each resume's wording against the job description, "
+               "0-10 relative to the best match in the pool. "
                "Adjust weights to reflect hiring priorities.")
 
 with col_reset:
@@ -556,46 +726,333 @@ with col_reset:
 
 candidates = st.session_state.get("candidates", [])
 
-# Extract text from demo PDFs if needed
-for c in candidates:
-    if not c.get("text"):
-        try:
-            p = Path(c["filename"])
-            if p.exists() and p.suffix.lower() == ".pdf":
-                from pypdf import PdfReader
-                reader = PdfReader(str(p))
-                raw_text = "\n".join([page.extract_text() or "" for page in reader.pages])
-                anon_text, _ = anonymize_text(raw_text)
-                c["text"] = anon_text
-            elif p.exists():
-                raw_text = p.read_text()
-                anon_text, _ = anonymize_text(raw_text)
-                c["text"] = anon_text
-        except Exception as e:
-            c["text"] = ""
-
-    # Extract features
-    if c.get("text") and not c.get("features"):
-        c["features"] = extract_features(c["text"])
-
-    # Apply qualification gating if job info available
-    if c.get("features") and st.session_state.get("job_info"):
-        from utils import gate_candidate
-        is_qualified, gate_results = gate_candidate(c["features"], st.session_state["job_info"])
-        c["is_qualified"] = is_qualified
-        c["gate_results"] = gate_results
-    else:
+# Extract text from demo PDFs if needed (one parallel batch, cache-backed)
+pending = [c for c in candidates
+           if not c.get("text") and not c.get("text_released") and Path(c["filename"]).exists()]
+if pending:
+    ingested = ingest_resumes([c["filename"] for c in pending], cache=session_text_cache())
+    for c, result in zip(pending, ingested):
+        c["text"] = result["text"]
+        c["features"] = result["features"]
+
+# Features and gating depend only on the candidate pool and the selected job.
+# They are computed once per pool and kept in a CandidateStore, so moving a
+# rubric slider only re-weights the matrix and re-sorts.
+job_key = st.session_state.get("selected_job") if st.session_state.get("job_info") else None
+scoring_state = st.session_state.get("scoring_state")
+if (
+    scoring_state is None
+    or scoring_state["candidates"] is not candidates
+    or scoring_state["size"] != len(candidates)
+    or scoring_state["job_key"] != job_key
+):
+    # Forget the text and BM25 postings of resumes no longer in the pool
+    pool_ids = [c["anon_id"] for c in candidates]
+    st.session_state["text_store"].retain(pool_ids)
+    st.session_state["relevance_index"].retain(pool_ids)
+
+    for c in candidates:
+        # A screening result only holds for the job it was screened against
+        if c.get("screened_out") and c.get("screened_for") != job_key:
+            del c["screened_out"]
+        # Extract features
+        if not c.get("features") and not c.get("screened_out"):
+            text = candidate_text(c)
+            if text:
+                c["features"] = extract_features(text)
+
+    # Flag re-submitted and lightly edited resumes. Only new resumes are
+    # indexed: the session's index keeps the earlier signatures, so matches
+    # are still found after their text was released or dropped.
+    dedup_state = st.session_state.get("dedup_state")
+    if dedup_state is None or dedup_state["candidates"] is not candidates:
+        dedup_state = st.session_state["dedup_state"] = {"candidates": candidates, "index": DuplicateIndex()}
+    new_candidates = [c for c in candidates if "duplicate_of" not in c]
+    for c, doc in zip(new_candidates, iter_dedup(
+            ({"anon_id": c["anon_id"], "text": candidate_text(c)} for c in new_candidates), dedup_state["index"])):
+        c["duplicate_of"] = doc["duplicate_of"]
+
+    if not st.session_state.get("job_info"):
         # No gating if no job info (custom uploads)
-        c["is_qualified"] = True
-        c["gate_results"] = {}
+        for c in candidates:
+            c["is_qualified"] = True
+            c["gate_results"] = {}
+
+    # Columnar features and gate flags; scoring and CSV export read from it
+    store = CandidateStore.from_candidates(candidates)
+    if st.session_state.get("job_info"):
+        # Apply qualification gating to the whole pool at once
+        store.apply_gates(st.session_state["job_info"])
+        gates = [c["screened_out"] if c.get("screened_out") else store.gate_results(i)
+                 for i, c in enumerate(candidates)]
+        if any(c.get("screened_out") for c in candidates):
+            store.set_gates(gates, store.levels)
+        for c, (is_qualified, gate_results) in zip(candidates, gates):
+            c["is_qualified"], c["gate_results"] = is_qualified, gate_results
+
+    scoring_state = {
+        "candidates": candidates,
+        "size": len(candidates),
+        "job_key": job_key,
+        "store": store,
+        "relevance_key": None,
+    }
+    st.session_state["scoring_state"] = scoring_state
+
+# Job relevance: new resumes are added to the BM25 index incrementally, and the
+# pool is re-queried only when the pool or the job description changes
+relevance_query = job_query(st.session_state.get("job_text", ""), st.session_state.get("job_info"))
+relevance_key = hashlib.sha256(relevance_query.encode()).hexdigest()
+if candidates and scoring_state["relevance_key"] != relevance_key:
+    relevance_index = st.session_state["relevance_index"]
+    for c in candidates:
+        if c["anon_id"] not in relevance_index:
+            text = candidate_text(c)
+            if text:
+                relevance_index.add(c["anon_id"], text)
+    scoring_state["store"].set_relevance(
+        relevance_index.relevance(relevance_query, [c["anon_id"] for c in candidates]))
+    scoring_state["relevance_key"] = relevance_key
+
+# Full text is not needed past this point: hand it to the session's retention
+# policy (screened-out resumes may need analysis for another job, so their
+# text is never dropped) and rehydrate it on demand with candidate_text()
+text_store = st.session_state["text_store"]
+for c in candidates:
+    if c.get("text"):
+        text_store.put(c["anon_id"], c.pop("text"), keep=bool(c.get("screened_out")))
+        c["text_released"] = True
 
 # Score and rank candidates
-scored = score_candidates(candidates, weights) if candidates else []
+scored = rank_from_matrix(candidates, scoring_state["store"].feature_matrix(), weights) if candidates else []
 
 # Separate qualified and disqualified candidates
 qualified_candidates = [c for c in scored if c.get("is_qualified", True)]
 disqualified_candidates = [c for c in scored if not c.get("is_qualified", True)]
 
+# =============================================================================
+# RESULT RENDERING
+# =============================================================================
+
+# Table sort options -> frame column (None keeps rank order)
+RESULTS_SORT_KEYS = {
+    "Rank": None,
+    "Score": "Score",
+    "Experience (years)": "Years",
+    "Skills score": "Skills",
+    "Education score": "Education",
+    "Certifications score": "Certifications",
+    "Relevance score": "Relevance",
+}
+
+
+def describe_duplicates(c: dict, copies: dict) -> str:
+    """Results-table label: which resume this one copies, or how many copies it absorbed."""
+    if c.get("duplicate_of"):
+        return f"copy of {get_candidate_display_name(c['duplicate_of']).strip('`')}"
+    if copies.get(c["anon_id"]):
+        return f"+{copies[c['anon_id']]} cop{'ies' if copies[c['anon_id']] > 1 else 'y'}"
+    return ""
+
+
+def build_results_frame(candidates: list, reviewer_notes: dict, copies: dict = None) -> pd.DataFrame:
+    """
+    One compact row per scored candidate; _pos indexes back into candidates.
+    copies maps a representative anon_id to its number of collapsed duplicates.
+    """
+    copies = copies or {}
+    rows = []
+    for pos, c in enumerate(candidates):
+        gate_results = c.get("gate_results", {})
+        breakdown = c.get("breakdown", {})
+        qualified = c.get("is_qualified", True)
+        if qualified:
+            status = "✅ Qualified"
+        elif not gate_results.get("education_check", {}).get("passed", True):
+            status = "❌ Education"
+        else:
+            status = "❌ Skills"
+        rows.append({
+            "_pos": pos,
+            "Rank": c["rank"],
+            "Candidate": get_candidate_display_name(c["anon_id"]).strip("`"),
+            "Status": status,
+            "Level": gate_results.get("level_name", "") if qualified else "",
+            "Score": c["score"],
+            "Skills": breakdown.get("skills", 0),
+            "Experience": breakdown.get("experience", 0),
+            "Education": breakdown.get("education", 0),
+            "Certifications": breakdown.get("certifications", 0),
+            "Relevance": breakdown.get("relevance", 0),
+            "Years": c.get("features", {}).get("years_experience", 0),
+            "Notes": "📝" if reviewer_notes.get(c["anon_id"]) else "",
+            "Duplicates": describe_duplicates(c, copies),
+        })
+    columns = ["_pos", "Rank", "Candidate", "Status", "Level", "Score", "Skills", "Experience",
+               "Education", "Certifications", "Relevance", "Years", "Notes", "Duplicates"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def build_job_pivot_frame(store, matches: dict, order, totals, job_name: str) -> pd.DataFrame:
+    """Candidates qualified for one job, in score order."""
+    j = matches["jobs"].index(job_name)
+    rows = [i for i in order.tolist() if matches["qualified"][i, j]]
+    anon_ids = store.columns["anon_id"]
+    return pd.DataFrame({
+        "Rank": range(1, len(rows) + 1),
+        "Candidate": [get_candidate_display_name(anon_ids[i]).strip("`") for i in rows],
+        "Score": [float(totals[i]) for i in rows],
+        "Level": [matches["level_names"][i, j] for i in rows],
+    })
+
+
+def build_job_matrix_frame(store, matches: dict, order, totals) -> pd.DataFrame:
+    """Candidates × jobs: the qualified level per job, or ❌."""
+    rows = order.tolist()
+    anon_ids = store.columns["anon_id"]
+    frame = pd.DataFrame({
+        "Candidate": [get_candidate_display_name(anon_ids[i]).strip("`") for i in rows],
+        "Score": [float(totals[i]) for i in rows],
+    })
+    for j, job_name in enumerate(matches["jobs"]):
+        frame[job_name] = [
+            f"✅ {matches['level_names'][i, j]}".strip() if matches["qualified"][i, j] else "❌" for i in rows
+        ]
+    return frame
+
+
+def reviewer_notes_input(c: dict, label: str, placeholder: str, record: dict) -> None:
+    """
+    Notes box for one candidate. Notes live in session state rather than only
+    in the widget, so they survive while another candidate's details are open.
+    Each change is logged once.
+    """
+    notes = st.session_state.setdefault("reviewer_notes", {})
+    override = st.text_area(
+        label,
+        value=notes.get(c["anon_id"], ""),
+        key=f"override_{c['anon_id']}",
+        height=100,
+        placeholder=placeholder
+    )
+    if override != notes.get(c["anon_id"], ""):
+        notes[c["anon_id"]] = override
+        if override:
+            log_record({"anon_id": c["anon_id"], "override": override, **record},
+                       st.session_state["audit_session_id"])
+    if override:
+        st.success("Logged")
+
+
+def render_candidate_detail(c: dict, weights: dict) -> None:
+    """Detailed view for the single candidate opened from the results table."""
+    gate_results = c.get("gate_results", {})
+    features = c.get("features", {})
+
+    if c.get("is_qualified", True):
+        level_name = gate_results.get("level_name", "")
+        level_badge = f"**Level {level_name}**" if level_name else ""
+        title = f"✅ **#{c['rank']}** — {get_candidate_display_name(c['anon_id'])} — Score: **{c['score']}** {level_badge}"
+
+        with st.expander(title, expanded=True):
+            # Show qualification details
+            if gate_results:
+                st.success(f"**Qualifies for Level {level_name}**")
+                edu_check = gate_results.get("education_check", {})
+                if edu_check.get("message"):
+                    st.caption(f"✅ Education: {edu_check['message']}")
+                skills_check = gate_results.get("skills_check", {})
+                if skills_check.get("message"):
+                    st.caption(f"✅ Skills: {skills_check['message']}")
+                st.divider()
+
+            col_info, col_actions = st.columns([3, 1])
+
+            with col_info:
+                # Score breakdown
+                st.markdown("**Score Breakdown:**")
+                breakdown = c.get("breakdown", {})
+                breakdown_cols = st.columns(len(breakdown) or 1)
+                for i, (cat, score) in enumerate(breakdown.items()):
+                    with breakdown_cols[i]:
+                        st.metric(cat.title(), f"{score:.1f}")
+
+                # Features detected
+                st.markdown("**Skills Detected:**")
+                skills = features.get("skills", [])
+                if skills:
+                    st.write(", ".join(skills))
+                else:
+                    st.write("*No skills detected*")
+
+                st.markdown(f"**Education:** {features.get('education', 'Not detected')}")
+                st.markdown(f"**Experience:** {features.get('years_experience', 0)} years")
+
+                # Evidence
+                evidence = features.get("evidence_lines", {})
+                if evidence:
+                    st.markdown("**Evidence Snippets:**")
+                    for skill, snippet in list(evidence.items())[:3]:
+                        # Bold the skill keyword in the snippet
+                        snippet_formatted = snippet[:100]
+                        if skill.lower() in snippet_formatted.lower():
+                            pattern = re.compile(re.escape(skill), re.IGNORECASE)
+                            snippet_formatted = pattern.sub(f"**{skill}**", snippet_formatted, count=1)
+                        st.markdown(f"- ...{snippet_formatted}...")
+
+            with col_actions:
+                # Human override field
+                st.markdown("**Human Override:**")
+                reviewer_notes_input(c, "Notes/adjustments", "Add reviewer notes...",
+                                     {"score": c["score"], "weights": weights})
+    else:
+        # Extract primary disqualification reason
+        reason = ""
+        if not gate_results.get("education_check", {}).get("passed", True):
+            reason = " (Education)"
+        elif not gate_results.get("skills_check", {}).get("passed", True):
+            reason = " (Skills)"
+        title = f"❌ {get_candidate_display_name(c['anon_id'])} — Score: **{c['score']}**{reason}"
+
+        with st.expander(title, expanded=True):
+            # Show disqualification reasons
+            st.error("**Does Not Meet Minimum Qualifications**")
+
+            edu_check = gate_results.get("education_check", {})
+            if not edu_check.get("passed", True):
+                st.markdown(f"❌ **Education:** {edu_check.get('message', 'Does not meet requirement')}")
+
+            skills_check = gate_results.get("skills_check", {})
+            if not skills_check.get("passed", True):
+                st.markdown(f"❌ **Skills:** {skills_check.get('message', 'Missing required skills')}")
+
+            if gate_results.get("screened_out"):
+                st.caption("⏭ Screened out on required skills before full analysis; "
+                           "the profile below was not extracted.")
+
+            st.divider()
+
+            col_info, col_actions = st.columns([3, 1])
+
+            with col_info:
+                # Show what they DO have
+                st.markdown("**Candidate Profile:**")
+                st.markdown(f"**Education:** {features.get('education', 'Not detected')}")
+                st.markdown(f"**Experience:** {features.get('years_experience', 0)} years")
+
+                st.markdown("**Skills Detected:**")
+                skills = features.get("skills", [])
+                if skills:
+                    st.write(", ".join(skills))
+                else:
+                    st.write("*No skills detected*")
+
+            with col_actions:
+                st.markdown("**Reviewer Notes:**")
+                reviewer_notes_input(c, "Optional notes", "Add notes if reconsidering...",
+                                     {"disqualified": True, "reason": gate_results})
+
+
 # =============================================================================
 # RANKED RESULTS
 # =============================================================================
@@ -663,149 +1120,93 @@ else:
 
         st.divider()
 
-    # Display QUALIFIED candidates first
-    if qualified_candidates:
-        st.markdown("### ✅ Qualified Candidates")
-        for c in qualified_candidates:
-            # Get gate results for level info
-            gate_results = c.get("gate_results", {})
-            level_name = gate_results.get("level_name", "")
-            level_badge = f"**Level {level_name}**" if level_name else ""
-
-            # Create expander title with qualification badge
-            title = f"✅ **#{c['rank']}** — {get_candidate_display_name(c['anon_id'])} — Score: **{c['score']}** {level_badge}"
-
-            with st.expander(title, expanded=(c['rank'] == 1)):
-                # Show qualification details
-                if gate_results:
-                    st.success(f"**Qualifies for Level {level_name}**")
-                    edu_check = gate_results.get("education_check", {})
-                    if edu_check.get("message"):
-                        st.caption(f"✅ Education: {edu_check['message']}")
-                    skills_check = gate_results.get("skills_check", {})
-                    if skills_check.get("message"):
-                        st.caption(f"✅ Skills: {skills_check['message']}")
-                    st.divider()
-
-                col_info, col_actions = st.columns([3, 1])
-
-                with col_info:
-                    # Score breakdown
-                    st.markdown("**Score Breakdown:**")
-                    breakdown = c.get("breakdown", {})
-                    breakdown_cols = st.columns(4)
-                    for i, (cat, score) in enumerate(breakdown.items()):
-                        with breakdown_cols[i % 4]:
-                            st.metric(cat.title(), f"{score:.1f}")
-
-                    # Features detected
-                    features = c.get("features", {})
-                    st.markdown("**Skills Detected:**")
-                    skills = features.get("skills", [])
-                    if skills:
-                        st.write(", ".join(skills))
-                    else:
-                        st.write("*No skills detected*")
-
-                    st.markdown(f"**Education:** {features.get('education', 'Not detected')}")
-                    st.markdown(f"**Experience:** {features.get('years_experience', 0)} years")
-
-                    # Evidence
-                    evidence = features.get("evidence_lines", {})
-                    if evidence:
-                        st.markdown("**Evidence Snippets:**")
-                        for skill, snippet in list(evidence.items())[:3]:
-                            # Bold the skill keyword in the snippet
-                            snippet_formatted = snippet[:100]
-                            if skill.lower() in snippet_formatted.lower():
-                                import re
-                                pattern = re.compile(re.escape(skill), re.IGNORECASE)
-                                snippet_formatted = pattern.sub(f"**{skill}**", snippet_formatted, count=1)
-                            st.markdown(f"- ...{snippet_formatted}...")
-
-                with col_actions:
-                    # Human override field
-                    st.markdown("**Human Override:**")
-                    override = st.text_area(
-                        "Notes/adjustments",
-                        key=f"override_{c['anon_id']}",
-                        height=100,
-                        placeholder="Add reviewer notes..."
-                    )
-                    if override:
-                        log_record({
-                            "anon_id": c["anon_id"],
-                            "override": override,
-                            "score": c["score"],
-                            "weights": weights
-                        })
-                        st.success("Logged")
-
-    # Display DISQUALIFIED candidates
-    if disqualified_candidates:
-        st.markdown("---")
-        st.markdown("### ❌ Disqualified Candidates")
-        st.warning(f"**{len(disqualified_candidates)} candidate(s) did not meet minimum qualifications**")
-
-        for c in disqualified_candidates:
-            gate_results = c.get("gate_results", {})
-
-            # Extract primary disqualification reason
-            reason = ""
-            if not gate_results.get("education_check", {}).get("passed", True):
-                reason = " (Education)"
-            elif not gate_results.get("skills_check", {}).get("passed", True):
-                reason = " (Skills)"
-
-            # Create expander title with disqualification badge
-            title = f"❌ {get_candidate_display_name(c['anon_id'])} — Score: **{c['score']}**{reason}"
-
-            with st.expander(title, expanded=False):
-                # Show disqualification reasons
-                st.error("**Does Not Meet Minimum Qualifications**")
-
-                edu_check = gate_results.get("education_check", {})
-                if not edu_check.get("passed", True):
-                    st.markdown(f"❌ **Education:** {edu_check.get('message', 'Does not meet requirement')}")
-
-                skills_check = gate_results.get("skills_check", {})
-                if not skills_check.get("passed", True):
-                    st.markdown(f"❌ **Skills:** {skills_check.get('message', 'Missing required skills')}")
-
-                st.divider()
-
-                col_info, col_actions = st.columns([3, 1])
-
-                with col_info:
-                    # Show what they DO have
-                    features = c.get("features", {})
-                    st.markdown("**Candidate Profile:**")
-                    st.markdown(f"**Education:** {features.get('education', 'Not detected')}")
-                    st.markdown(f"**Experience:** {features.get('years_experience', 0)} years")
-
-                    st.markdown("**Skills Detected:**")
-                    skills = features.get("skills", [])
-                    if skills:
-                        st.write(", ".join(skills))
-                    else:
-                        st.write("*No skills detected*")
-
-                with col_actions:
-                    st.markdown("**Reviewer Notes:**")
-                    override = st.text_area(
-                        "Optional notes",
-                        key=f"override_{c['anon_id']}",
-                        height=100,
-                        placeholder="Add notes if reconsidering..."
-                    )
-                    if override:
-                        log_record({
-                            "anon_id": c["anon_id"],
-                            "override": override,
-                            "disqualified": True,
-                            "reason": gate_results
-                        })
-                        st.success("Logged")
+    # Compact table over every candidate; only the candidate the reviewer opens
+    # gets the detailed view, so render cost no longer grows with the pool.
+    st.markdown("### 📋 Results")
+    col_filter, col_sort, col_page_size, col_dupes = st.columns([2, 2, 1, 1])
+    with col_filter:
+        show = st.radio("Show", ["All", "Qualified", "Disqualified"], horizontal=True, key="results_filter")
+    with col_sort:
+        sort_by = st.selectbox("Sort by", list(RESULTS_SORT_KEYS), key="results_sort")
+    with col_page_size:
+        page_size = st.selectbox("Rows per page", [25, 50, 100], key="results_page_size")
+    with col_dupes:
+        collapse = st.toggle("Collapse duplicates", value=True, key="results_collapse_duplicates",
+                             help="Show each re-submitted or near-identical resume once")
+
+    if show == "Qualified":
+        shown = qualified_candidates
+    elif show == "Disqualified":
+        shown = disqualified_candidates
+    else:
+        shown = qualified_candidates + disqualified_candidates
+
+    duplicate_count = sum(1 for c in scored if c.get("duplicate_of"))
+    copies = {}
+    if collapse:
+        shown = [c for c in shown if not c.get("duplicate_of")]
+        copies = Counter(c["duplicate_of"] for c in scored if c.get("duplicate_of"))
+
+    frame = build_results_frame(shown, st.session_state.get("reviewer_notes", {}), copies)
+    if RESULTS_SORT_KEYS[sort_by]:
+        # Stable sort keeps rank order among ties
+        frame = frame.sort_values(RESULTS_SORT_KEYS[sort_by], ascending=False, kind="stable")
+
+    n_pages = max(1, -(-len(frame) // page_size))
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+                           key=f"results_page_{show}_{page_size}")
+    page_frame = frame.iloc[(page - 1) * page_size:page * page_size]
+
+    event = st.dataframe(
+        page_frame.drop(columns=["_pos"]),
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"results_table_{show}_{sort_by}_{page_size}_{page}_{collapse}",
+    )
+    caption = f"Showing {len(page_frame)} of {len(frame)} candidates. Select a row to open its details."
+    if duplicate_count:
+        caption += (f" {duplicate_count} near-duplicate resume{'s' if duplicate_count != 1 else ''} "
+                    f"{'hidden' if collapse else 'marked in the Duplicates column'}.")
+    st.caption(caption)
+
+    if len(page_frame):
+        selected_rows = event.selection.rows if event is not None else []
+        row = selected_rows[0] if selected_rows else 0
+        render_candidate_detail(shown[int(page_frame["_pos"].iloc[row])], weights)
+
+    # Same pool against every library job: features are already extracted, so
+    # each extra job is one more set of bitmask and threshold checks
+    if len(JOB_LIBRARY) > 1:
+        with st.expander("🧮 Job Match Matrix — screen this pool for every library job"):
+            store = scoring_state["store"]
+            if "job_matches" not in scoring_state:
+                matches = store.match_jobs(JOB_LIBRARY)
+                # Screened-out resumes were never analysed, so they match no job here
+                matches["screened"] = [i for i, c in enumerate(candidates) if c.get("screened_out")]
+                matches["qualified"][matches["screened"]] = False
+                scoring_state["job_matches"] = matches
+            matches = scoring_state["job_matches"]
+            if matches["screened"]:
+                st.caption(f"{len(matches['screened'])} resumes screened out for the selected job "
+                           "were not analysed against the other jobs.")
+            order, totals, _ = store.score(weights)
+
+            count_cols = st.columns(len(matches["jobs"]))
+            for j, job_name in enumerate(matches["jobs"]):
+                with count_cols[j]:
+                    st.metric(job_name, f"{int(matches['qualified'][:, j].sum())} qualified")
+
+            pivot_job = st.selectbox("Pivot by job", matches["jobs"], key="job_matrix_pivot")
+            st.dataframe(
+                build_job_pivot_frame(store, matches, order, totals, pivot_job),
+                hide_index=True,
+                use_container_width=True,
+            )
+            if st.checkbox("Show full candidate × job matrix", key="job_matrix_full"):
+                st.dataframe(build_job_matrix_frame(store, matches, order, totals), hide_index=True,
+                             use_container_width=True)
 
 # =============================================================================
 # TOP CANDIDATE DETAILS
@@ -841,7 +1242,8 @@ if qualified_candidates:
                 tmpl_qs = generate_template_questions(
                     candidate.get("features", {}),
                     st.session_state.get("job_text", ""),
-                    candidate.get("gate_results")
+                    candidate.get("gate_results"),
+                    job_profile=st.session_state.get("job_profile")
                 )
                 for i, q in enumerate(tmpl_qs, 1):
                     st.markdown(f"{i}. {q}")
@@ -876,17 +1278,19 @@ Generated by CandidateCompass.
                     key=f"dl_txt_{idx}"
                 )
 
-                # PDF summary
+                # PDF summary: rendered only on request, memoized per session
                 display_name = get_candidate_display_name(candidate['anon_id'])
-                pdf_bytes = generate_decision_pdf(
-                    candidate,
-                    st.session_state.get("job_text", ""),
-                    display_name
-                )
-                if pdf_bytes:
+                job_text = st.session_state.get("job_text", "")
+                pdf_cache = st.session_state.setdefault("decision_pdfs", {})
+                pdf_key = decision_pdf_key(candidate, job_text, display_name)
+                if pdf_key not in pdf_cache:
+                    if st.button("Prepare Summary (PDF)", key=f"prep_pdf_{idx}"):
+                        with st.spinner("Building PDF..."):
+                            get_decision_pdf(pdf_cache, candidate, job_text, display_name)
+                if pdf_key in pdf_cache:
                     st.download_button(
                         "Download Summary (PDF)",
-                        pdf_bytes,
+                        pdf_cache[pdf_key],
                         file_name=f"decision_{candidate['anon_id']}.pdf",
                         mime="application/pdf",
                         key=f"dl_pdf_{idx}"
@@ -901,20 +1305,103 @@ st.subheader("5. Export & Audit")
 
 col_exp1, col_exp2, col_exp3 = st.columns(3)
 
+
+def export_scores(fmt: str) -> bytes:
+    """
+    Ranked export of the pool (scores, gate results, evidence counts) as
+    CSV or Parquet bytes. Kept per format until the weights or relevance change.
+    """
+    key = (tuple(sorted(weights.items())), scoring_state["relevance_key"])
+    exports = scoring_state.setdefault("exports", {})
+    if exports.get(fmt, (None,))[0] != key:
+        out = io.BytesIO()
+        scoring_state["store"].export(out, weights, st.session_state.get("candidate_display_names", {}), fmt=fmt)
+        exports[fmt] = (key, out.getvalue())
+    return exports[fmt][1]
+
+
+def bias_audit_report() -> dict:
+    """
+    Score audit of the pool, without collapsed duplicates when those are
+    hidden. One AuditAccumulator per session is fed only the candidates added
+    since the last audit; it is rebuilt when the weights, job or duplicate
+    setting change, or on any pool change while relevance (relative to the
+    pool) is weighted.
+    """
+    store = scoring_state["store"]
+    collapse = st.session_state.get("results_collapse_duplicates", True)
+    key = (tuple(sorted(weights.items())), scoring_state["job_key"], scoring_state["relevance_key"], collapse)
+    state = st.session_state.get("audit_state")
+    if (state is None or state["candidates"] is not candidates or state["key"] != key
+            or state["rows"] > len(store) or (weights.get("relevance") and state["store"] is not store)):
+        state = st.session_state["audit_state"] = {
+            "candidates": candidates, "key": key, "rows": 0, "store": store, "audit": None}
+    if state["rows"] < len(store):
+        mask = np.array([not c.get("duplicate_of") for c in candidates]) if collapse else None
+        try:
+            state["audit"] = store.bias_audit(weights, mask, state["audit"], state["rows"])
+        except ValueError:  # rebuilt store with a different skill vocabulary
+            state["audit"] = store.bias_audit(weights, mask)
+        state["rows"], state["store"] = len(store), store
+    return state["audit"].report()
+
+
 with col_exp1:
     if scored:
-        csv_data = get_logs_csv(scored, st.session_state.get("candidate_display_names", {}))
         st.download_button(
             "Download Scores CSV",
-            csv_data,
+            export_scores("csv"),
             file_name="candidate_scores.csv",
             mime="text/csv",
-            help="Anonymized scores for all candidates"
+            help="Anonymized scores, gate results and evidence counts for all candidates"
         )
+        if importlib.util.find_spec("pyarrow") is not None:
+            st.download_button(
+                "Download Scores (Parquet)",
+                export_scores("parquet"),
+                file_name="candidate_scores.parquet",
+                mime="application/vnd.apache.parquet",
+                help="Same columns as the CSV, for analytics tools"
+            )
+
+        # Every qualified candidate's decision summary, rendered on request
+        display_names = st.session_state.get("candidate_display_names", {})
+        job_text = st.session_state.get("job_text", "")
+        zip_key = (tuple(sorted(weights.items())), scoring_state["relevance_key"], job_text)
+        if qualified_candidates and scoring_state.get("decision_zip", (None,))[0] != zip_key:
+            if st.button(f"Prepare All Summaries (ZIP, {len(qualified_candidates)} PDFs)"):
+                with st.spinner("Building decision summaries..."):
+                    out = io.BytesIO()
+                    write_decision_pdfs_zip(qualified_candidates, out, job_text, display_names)
+                    scoring_state["decision_zip"] = (zip_key, out.getvalue())
+        if scoring_state.get("decision_zip", (None,))[0] == zip_key:
+            st.download_button(
+                "Download All Summaries (ZIP)",
+                scoring_state["decision_zip"][1],
+                file_name="decision_summaries.zip",
+                mime="application/zip",
+                help="One decision summary PDF per qualified candidate, in rank order"
+            )
+
+        # The same summaries as one packet for the hiring panel
+        if qualified_candidates and scoring_state.get("panel_report", (None,))[0] != zip_key:
+            if st.button("Prepare Panel Report (PDF)"):
+                with st.spinner("Building panel report..."):
+                    scoring_state["panel_report"] = (
+                        zip_key, generate_panel_report(qualified_candidates, job_text, display_names))
+        if scoring_state.get("panel_report", (None,))[0] == zip_key:
+            st.download_button(
+                "Download Panel Report (PDF)",
+                scoring_state["panel_report"][1],
+                file_name="panel_report.pdf",
+                mime="application/pdf",
+                help="Ranked summary, level distribution and a page per qualified candidate"
+            )
 
 with col_exp2:
     if scored and st.button("Run Bias Audit"):
-        report = bias_audit_stub(scored)
+        # Count each person once: audit without the collapsed duplicates
+        report = bias_audit_report()
         st.json(report)
         st.download_button(
             "Download Audit Report (JSON)",
@@ -1003,3 +1490,16 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+# =============================================================================
+# SESSION MEMORY REPORT
+# =============================================================================
+# Rendered last so it reflects this run's state
+
+memory_report = session_memory_report()
+text_stats = st.session_state["text_store"].stats()
+st.sidebar.markdown("**Session Memory**")
+st.sidebar.metric("Approximate use", format_bytes(sum(memory_report.values())))
+st.sidebar.caption("  \n".join(f"{name}: {format_bytes(size)}" for name, size in memory_report.items()))
+if text_stats["disk_bytes"]:
+    st.sidebar.caption(f"Spilled resume text on disk: {format_bytes(text_stats['disk_bytes'])}")
@@ -0,0 +1,91 @@
+"""
+legacy.py — Reference implementations kept as test oracles
+===========================================================
+Earlier, slower versions of functions that have since been rewritten. The
+tests compare the current code against them, and the scripts in benchmarks/
+time the two side by side.
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+from utils import (
+    ADDR_RE,
+    CERTIFICATION_KEYWORDS,
+    EMAIL_RE,
+    NAME_RE,
+    PHONE_RE,
+    SKILL_KEYWORDS,
+    SSN_RE,
+    score_candidate,
+)
+
+
+def legacy_anonymize_text(text: str) -> Tuple[str, Dict[str, str]]:
+    """Previous implementation: one findall per class, one str.replace per match."""
+    t = text
+    mapping = {}
+
+    for m in SSN_RE.findall(t):
+        placeholder = "[SSN_REDACTED]"
+        mapping[placeholder] = mapping.get(placeholder, [])
+        if isinstance(mapping[placeholder], list):
+            mapping[placeholder] = m
+        t = t.replace(m, placeholder)
+
+    for m in EMAIL_RE.findall(t):
+        placeholder = "[EMAIL_REDACTED]"
+        mapping[placeholder] = m
+        t = t.replace(m, placeholder)
+
+    for m in PHONE_RE.findall(t):
+        placeholder = "[PHONE_REDACTED]"
+        mapping[placeholder] = m
+        t = t.replace(m, placeholder)
+
+    for m in ADDR_RE.findall(t):
+        placeholder = "[ADDR_REDACTED]"
+        t = t.replace(m, placeholder)
+
+    t = NAME_RE.sub(r"\1[NAME_REDACTED]", t)
+
+    return t, mapping
+
+
+def legacy_score_candidates(candidates: List[Dict], weights: Dict[str, float]) -> List[Dict]:
+    """Previous implementation: score_candidate per dict, then a Python sort."""
+    out = []
+    for c in candidates:
+        f = c.get("features", {})
+        s, b = score_candidate(f, weights)
+        out.append({
+            "anon_id": c.get("anon_id"),
+            "score": s,
+            "breakdown": b,
+            "features": f,
+            "filename": c.get("filename", ""),
+            "is_qualified": c.get("is_qualified", True),
+            "gate_results": c.get("gate_results", {}),
+            "duplicate_of": c.get("duplicate_of"),
+        })
+    out = sorted(out, key=lambda x: x["score"], reverse=True)
+    for i, c in enumerate(out):
+        c["rank"] = i + 1
+    return out
+
+
+def random_candidates(n: int, seed: int = 7) -> List[Dict]:
+    """Synthetic candidates with realistic feature ranges (many score ties)."""
+    rng = random.Random(seed)
+    return [
+        {
+            "anon_id": f"cand_{i}",
+            "features": {
+                "skills": rng.sample(SKILL_KEYWORDS, rng.randint(0, 14)),
+                "certifications": rng.sample(CERTIFICATION_KEYWORDS, rng.randint(0, 6)),
+                "years_experience": rng.randint(0, 25),
+                "education_level": rng.randint(0, 3),
+            },
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,67 @@
+"""
+test_anonymize_jobs.py — Unit tests for job posting anonymization
+==================================================================
+Run with: pytest tests/test_anonymize_jobs.py -v
+
+The golden fixture holds the text of every posting in
+sample_data/generated/ActualJobs that has an extractable text layer (the
+image-only PDFs yield a few characters and are skipped), plus a synthetic
+posting that exercises every rule, together with the output of the original
+rule-by-rule anonymize_job_text.
+"""
+
+import json
+import random
+import re
+from pathlib import Path
+
+import anonymize_jobs
+from anonymize_jobs import JOB_TEXT_RULES, _anonymize_job_text_sequential, anonymize_job_text
+
+GOLDEN_PATH = Path(__file__).parent / "golden" / "anonymize_job_text.json"
+
+# Fragments that trigger, straddle, or sit next to each rule's matches
+FUZZ_TOKENS = [
+    "TxDOT", "txdot", "Texas", "Department of Transportation", "State of ", "Austin", ",", " ", "TX",
+    "78701", "Tyler", "75702", "125", "East", "Street", "St", "\n", "Bridge Division",
+    "Financial Management Division", "Tyler District", "Stassney campus", "(", "12345678", ")",
+    "1234567", "Jan", "uary", "5", ", 2026", "December", "A1", "234", "State Job Code/s:", "1234",
+    "/5678", "State Job Title/s:", "https://", "www.", "hr.texas.gov", "/x", "ERS (texas.gov)", "ERS",
+    "Benefits at a Glance | ", " ERS", "Texans", "2025", "Dr", "x",
+    # Dates whose year runs into a requisition number
+    "January 5, 2026", "Mar 12, 2024", "Dec 1 2025", "(1234567)", "20",
+]
+
+
+class TestAnonymizeJobText:
+    """Tests for the compiled job text anonymizer."""
+
+    def test_golden_outputs(self):
+        """Output must match the original implementation on real postings."""
+        golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+        assert len(golden) >= 5
+        for name, case in golden.items():
+            assert anonymize_job_text(case["input"]) == case["expected"], name
+
+    def test_matches_sequential_rules(self):
+        """Merged passes must agree with applying each rule in turn."""
+        rng = random.Random(0)
+        for _ in range(20000):
+            text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 10)))
+            assert anonymize_job_text(text) == _anonymize_job_text_sequential(text), repr(text)
+
+    def test_fewer_passes_than_rules(self):
+        """Rules should be compiled into a handful of passes at import."""
+        assert len(anonymize_jobs._JOB_TEXT_PASSES) < len(JOB_TEXT_RULES)
+        for regex, _ in anonymize_jobs._JOB_TEXT_PASSES:
+            assert isinstance(regex, re.Pattern)
+
+    def test_rule_patterns_do_not_capture(self):
+        """Capturing groups inside a rule would break rule lookup by lastindex."""
+        for pattern, _, flags in JOB_TEXT_RULES:
+            assert re.compile(pattern, flags).groups == 0, pattern
+
+    def test_basic_replacements(self):
+        """Agency, location and requisition references should be removed."""
+        result = anonymize_job_text("TxDOT is hiring in Austin, TX (00123456).")
+        assert result == "State Transportation Agency is hiring in State Capital [REQ-XXXXX]."
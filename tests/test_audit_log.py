@@ -0,0 +1,108 @@
+"""
+Tests for audit_log.py — bounded, session-partitioned audit log.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audit_log import AuditLogStore
+from utils import clear_logs, get_logs, log_record
+
+
+def record(i, override="note"):
+    return {"anon_id": f"id{i}", "override": override, "timestamp": str(i)}
+
+
+class TestAuditLogStore:
+    """Tests for partitioning, bounding and deduplication."""
+
+    def test_sessions_are_partitioned(self, tmp_path):
+        store = AuditLogStore(spill_dir=tmp_path)
+        store.append(record(1), "alice")
+        store.append(record(2), "bob")
+        assert [r["anon_id"] for r in store.iter_records("alice")] == ["id1"]
+        store.clear("alice")
+        assert list(store.iter_records("alice")) == []
+        assert store.count("bob") == 1
+
+    def test_unchanged_record_is_not_logged_again(self, tmp_path):
+        store = AuditLogStore(spill_dir=tmp_path)
+        assert store.append(record(1, "a"))
+        assert not store.append({**record(1, "a"), "timestamp": "later"})
+        assert store.append(record(1, "b"))
+        assert store.append(record(1, "a"))  # changed back: a new decision
+        assert [r["override"] for r in store.iter_records()] == ["a", "b", "a"]
+
+    def test_ring_buffer_spills_oldest_records(self, tmp_path):
+        store = AuditLogStore(capacity=10, spill_dir=tmp_path)
+        for i in range(25):
+            store.append(record(i))
+        partition = store._partitions["default"]
+        assert len(partition.buffer) <= 10 and partition.spilled >= 15
+        assert [r["anon_id"] for r in store.iter_records()] == [f"id{i}" for i in range(25)]
+        assert store.count() == 25
+
+    def test_without_spill_dir_oldest_records_are_discarded(self, caplog):
+        store = AuditLogStore(capacity=10, spill_dir=None)
+        for i in range(25):
+            store.append(record(i))
+        ids = [r["anon_id"] for r in store.iter_records()]
+        assert len(ids) <= 10 and ids[-1] == "id24"
+        assert store.stats()["dropped"] == 25 - len(ids)
+        assert "discarded its 5 oldest records" in caplog.text
+
+    def test_spilling_is_opt_in(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CANDIDATECOMPASS_AUDIT_SPILL_DIR", raising=False)
+        store = AuditLogStore.from_env()
+        for i in range(store.capacity + 5):
+            store.append(record(i))
+        assert store._spill_dir is None and store.count() <= store.capacity
+        monkeypatch.setenv("CANDIDATECOMPASS_AUDIT_SPILL_DIR", str(tmp_path))
+        assert AuditLogStore.from_env()._parent_dir == str(tmp_path)
+
+    def test_released_session_keeps_its_records(self, tmp_path):
+        store = AuditLogStore(spill_dir=tmp_path, max_sessions=2)
+        for session in ("a", "b", "c"):
+            store.append(record(1), session)
+        assert "a" not in store._partitions
+        assert store.count("a") == 1
+        store.append(record(2), "a")
+        assert [r["anon_id"] for r in store.iter_records("a")] == ["id1", "id2"]
+        store.clear()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sessions_with_records_are_not_released_without_spill_dir(self):
+        store = AuditLogStore(spill_dir=None, max_sessions=2)
+        for session in ("a", "b", "c"):
+            store.append(record(1), session)
+        assert [r["anon_id"] for r in store.iter_records("a")] == ["id1"]
+        assert store.stats() == {"sessions": 3, "buffered": 3, "spilled": 0, "dropped": 0}
+
+    def test_concurrent_appends(self, tmp_path):
+        store = AuditLogStore(capacity=50, spill_dir=tmp_path)
+
+        def worker(session):
+            for i in range(200):
+                store.append(record(i), session)
+
+        threads = [threading.Thread(target=worker, args=(f"s{n % 2}",)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for session in ("s0", "s1"):
+            ids = [r["anon_id"] for r in store.iter_records(session)]
+            assert sorted(set(ids)) == sorted(f"id{i}" for i in range(200))
+            assert store.count(session) == len(ids)
+
+    def test_utils_logging_functions(self):
+        clear_logs("test-session")
+        assert log_record({"anon_id": "x", "override": "hire"}, "test-session")
+        assert not log_record({"anon_id": "x", "override": "hire"}, "test-session")
+        logs = list(get_logs("test-session"))
+        assert [(r["type"], r["override"]) for r in logs] == [("audit", "hire")]
+        clear_logs("test-session")
+        assert list(get_logs("test-session")) == []
@@ -0,0 +1,95 @@
+"""
+Tests for bias_audit.py — vectorized, incremental score audit.
+"""
+
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bias_audit import HISTOGRAM_EDGES, AuditAccumulator, bit_counts
+from feature_store import CandidateStore
+from test_feature_store import JOB, WEIGHTS, random_candidates
+from utils import bias_audit_stub, score_candidates
+
+
+def without_timestamp(report):
+    return {k: v for k, v in report.items() if k != "audit_timestamp"}
+
+
+class TestAuditAccumulator:
+    """Tests for the audit engine."""
+
+    def test_statistics_match_numpy(self):
+        rng = np.random.default_rng(5)
+        scores = rng.gamma(2.0, 12.0, 5000).round(2)
+        audit = AuditAccumulator()
+        audit.add(scores)
+        report = audit.report()
+        assert report["statistics"]["candidates_evaluated"] == 5000
+        assert report["statistics"]["score_median"] == round(float(sorted(scores)[2500]), 2)  # upper median
+        assert report["score_quantiles"]["p90"] == round(float(np.quantile(scores, 0.9)), 2)
+        assert report["score_histogram"]["counts"] == np.histogram(scores, HISTOGRAM_EDGES)[0].tolist()
+        assert sum(report["score_distribution"].values()) == 5000
+        assert report["score_distribution"]["low (0-10)"] == int((scores < 10).sum())
+
+    def test_even_pool_reports_upper_median(self):
+        audit = AuditAccumulator()
+        audit.add([4.0, 1.0, 3.0, 2.0], [True, True, False, False])
+        report = audit.report()
+        assert report["statistics"]["score_median"] == 3.0
+        assert report["by_qualification"]["qualified"]["median"] == 4.0
+
+    def test_incremental_batches_match_one_batch(self):
+        rng = random.Random(2)
+        scores = [rng.uniform(0, 60) for _ in range(3000)]
+        qualified = [rng.random() < 0.6 for _ in scores]
+        levels = [rng.choice(["I", "II", ""]) for _ in scores]
+        skills = [rng.sample(["sql", "python", "excel", "tableau"], rng.randint(0, 3)) for _ in scores]
+        whole, batched = AuditAccumulator(), AuditAccumulator()
+        whole.add(scores, qualified, levels, skills)
+        for start in range(0, len(scores), 700):
+            end = start + 700
+            batched.add(scores[start:end], qualified[start:end], levels[start:end], skills[start:end])
+        assert without_timestamp(batched.report()) == without_timestamp(whole.report())
+        assert batched.report()["by_qualification"]["qualified"]["count"] == sum(qualified)
+        assert batched.report()["top_skills_detected"][0][1] == max(Counter(s for row in skills for s in row).values())
+
+    def test_bit_counts(self):
+        bits = np.random.default_rng(1).integers(0, 2 ** 63, (1000, 3), dtype=np.uint64)
+        expected = [int(((bits[:, i // 64] >> np.uint64(i % 64)) & np.uint64(1)).sum()) for i in range(192)]
+        assert bit_counts(bits).tolist() == expected
+        assert bit_counts(bits, 70).tolist() == expected[:70]
+
+    def test_store_audit_matches_dict_audit(self):
+        """Bitset and per-dict inputs give the same report."""
+        candidates = random_candidates(400)
+        store = CandidateStore.from_candidates(candidates)
+        store.apply_gates(JOB)
+        scored = score_candidates(candidates, WEIGHTS)
+        assert without_timestamp(store.bias_audit(WEIGHTS).report()) == without_timestamp(bias_audit_stub(scored))
+
+        mask = np.arange(len(candidates)) % 3 == 0
+        subset = [s for s in scored if int(s["anon_id"][2:]) % 3 == 0]
+        assert without_timestamp(store.bias_audit(WEIGHTS, mask).report()) == without_timestamp(bias_audit_stub(subset))
+
+    def test_grown_store_audit_is_incremental(self):
+        """Feeding only the appended rows to the earlier accumulator matches a full audit."""
+        candidates = random_candidates(300)
+        candidates[250]["features"]["skills"].append("zz-new-skill")  # grows the store's vocabulary
+        mask = np.arange(len(candidates)) % 4 != 0
+        first = CandidateStore.from_candidates(candidates[:200])
+        audit = first.bias_audit(WEIGHTS, mask[:200])
+        grown = CandidateStore.from_candidates(candidates)
+        incremental = grown.bias_audit(WEIGHTS, mask, audit, start=200)
+        assert incremental is audit
+        assert without_timestamp(incremental.report()) == without_timestamp(grown.bias_audit(WEIGHTS, mask).report())
+
+    def test_empty_audit(self):
+        audit = AuditAccumulator()
+        audit.add([])
+        assert "error" in audit.report()
@@ -0,0 +1,206 @@
+"""
+test_candidatecompass.py — Unit tests for the batch ranking CLI
+================================================================
+Run with: pytest tests/test_candidatecompass.py -v
+"""
+
+import csv
+import json
+
+import pytest
+from candidatecompass import OUTPUT_FIELDS, iter_resume_paths, main, parse_weights, rank_resumes, write_results
+from job_library import JOB_LIBRARY, load_job_spec
+from utils import anonymize_text, extract_features, gate_candidate, score_candidates
+
+JOB = JOB_LIBRARY["Data Analyst I-V (Infrastructure)"]
+WEIGHTS = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5}
+
+RESUMES = {
+    "a.txt": "Jane Doe\nSQL, Python, Tableau. Bachelor of Science. 6 years of experience. PMP.",
+    "b.txt": "John Roe\nSQL and Power BI. 2 years experience. Bachelor's degree.",
+    "c.txt": "Sam Poe\nPython, Excel. 10 years of experience.",
+    "d.txt": "Ann Loe\nSQL, Qlik. Master's degree. 3 years of experience.",
+    "e.txt": "Bo Moe\nSQL and Power BI. 2 years experience. Bachelor's degree.",
+}
+
+
+@pytest.fixture
+def resume_dir(tmp_path):
+    for name, text in RESUMES.items():
+        (tmp_path / name).write_text(text)
+    (tmp_path / "notes.md").write_text("not a resume")
+    return tmp_path
+
+
+class TestRankResumes:
+    """Tests for headless batch ranking."""
+
+    def test_matches_app_pipeline(self, resume_dir):
+        """Scores, gates and order should match score_candidates over the same pool."""
+        paths = list(iter_resume_paths(str(resume_dir)))
+        assert [p.rsplit("/", 1)[1] for p in paths] == sorted(RESUMES)
+
+        expected = []
+        for p in paths:
+            features = extract_features(anonymize_text(open(p).read())[0])
+            is_qualified, gate_results = gate_candidate(features, JOB)
+            expected.append({"anon_id": p, "features": features, "is_qualified": is_qualified,
+                             "gate_results": gate_results})
+        expected = score_candidates(expected, WEIGHTS)
+
+        result = rank_resumes(iter(paths), JOB, WEIGHTS, workers=1, batch_size=2)
+        assert result["processed"] == len(RESUMES) and result["failed"] == 0
+        assert [r["file"] for r in result["rows"]] == [e["anon_id"] for e in expected]
+        for row, e in zip(result["rows"], expected):
+            assert row["rank"] == e["rank"]
+            assert row["score"] == e["score"]
+            assert row["skills_score"] == e["breakdown"]["skills"]
+            assert row["is_qualified"] == e["is_qualified"]
+            assert row["level_name"] == e["gate_results"]["level_name"]
+            assert set(row) == set(OUTPUT_FIELDS)  # nothing else is held per resume
+
+    def test_top_keeps_best_rows(self, resume_dir):
+        """--top keeps the same leading rows as a full ranking, ties in input order."""
+        paths = list(iter_resume_paths(str(resume_dir)))
+        full = rank_resumes(paths, JOB, WEIGHTS, workers=1)["rows"]
+        for top in (1, 3, 10):
+            rows = rank_resumes(paths, JOB, WEIGHTS, workers=1, batch_size=2, top=top)["rows"]
+            assert rows == full[:top]
+
+    def test_qualified_only(self, resume_dir):
+        """Candidates failing the gates are dropped and ranks stay contiguous."""
+        rows = rank_resumes(iter_resume_paths(str(resume_dir)), JOB, WEIGHTS, workers=1,
+                            qualified_only=True)["rows"]
+        assert rows and all(r["is_qualified"] for r in rows)
+        assert [r["rank"] for r in rows] == list(range(1, len(rows) + 1))
+
+    def test_relevance_weight(self, resume_dir):
+        """A relevance weight scores BM25 against the job spec over the ranked pool."""
+        paths = list(iter_resume_paths(str(resume_dir)))
+        plain = rank_resumes(paths, JOB, WEIGHTS, workers=1)["rows"]
+        assert all(r["relevance_score"] == 0 for r in plain)
+
+        rows = rank_resumes(paths, JOB, {**WEIGHTS, "relevance": 1.0}, workers=1, batch_size=2)["rows"]
+        by_file = {r["file"]: r for r in rows}
+        assert max(r["relevance_score"] for r in rows) == 10.0
+        assert all(0 <= r["relevance_score"] <= 10 for r in rows)
+        for r in plain:
+            assert by_file[r["file"]]["score"] == round(r["score"] + by_file[r["file"]]["relevance_score"], 2)
+
+    def test_relevance_query_includes_job_description(self, resume_dir, tmp_path_factory):
+        """As in the app, the description file's text is part of the relevance query."""
+        description = tmp_path_factory.mktemp("job") / "job.txt"
+        description.write_text("Qlik dashboards, Master's preferred")
+        spec = {**JOB, "required_skills": [], "required_any_of": [], "description": "", "file": str(description)}
+        rows = rank_resumes(iter_resume_paths(str(resume_dir)), spec, {**WEIGHTS, "relevance": 1.0}, workers=1)["rows"]
+        assert {r["file"].rsplit("/", 1)[1]: r["relevance_score"] for r in rows if r["relevance_score"]} == {"d.txt": 10.0}
+
+    def test_failed_files_are_counted(self, tmp_path):
+        """Unreadable resumes are skipped without stopping the batch."""
+        (tmp_path / "bad.pdf").write_bytes(b"%PDF-1.4 broken")
+        (tmp_path / "ok.txt").write_text(RESUMES["a.txt"])
+        result = rank_resumes(iter_resume_paths(str(tmp_path)), None, WEIGHTS, workers=1)
+        assert result["processed"] == 2 and result["failed"] == 1
+        assert len(result["rows"]) == 1 and result["rows"][0]["is_qualified"]
+
+    def test_collapse_duplicates(self, resume_dir):
+        """A lightly edited re-submission is ranked once, keeping the first copy."""
+        history = " ".join(f"Built SQL reporting pipeline number {i} for the infrastructure division." for i in range(20))
+        (resume_dir / "f.txt").write_text(RESUMES["a.txt"] + "\n" + history)
+        (resume_dir / "g.txt").write_text(RESUMES["a.txt"] + "\n" + history + " Available immediately.")
+        paths = list(iter_resume_paths(str(resume_dir)))
+        full = rank_resumes(paths, JOB, WEIGHTS, workers=1)
+        collapsed = rank_resumes(paths, JOB, WEIGHTS, workers=1, collapse_duplicates=True)
+        assert full["duplicates"] == 0 and collapsed["duplicates"] == 1
+        assert [r["file"] for r in collapsed["rows"]] == [r["file"] for r in full["rows"] if r["file"] != paths[-1]]
+
+        # An exact re-submission shares the first copy's anon_id and is skipped too
+        (resume_dir / "h.txt").write_text((resume_dir / "f.txt").read_text())
+        paths = list(iter_resume_paths(str(resume_dir)))
+        collapsed = rank_resumes(paths, JOB, WEIGHTS, workers=1, collapse_duplicates=True)
+        assert collapsed["duplicates"] == 2
+        assert not {r["file"] for r in collapsed["rows"]} & {paths[-2], paths[-1]}
+
+    def test_screen_matches_full_gating(self, resume_dir):
+        """Screening only changes the scores of resumes that fail on skills."""
+        full = {r["file"]: r for r in rank_resumes(iter_resume_paths(str(resume_dir)), JOB, WEIGHTS, workers=1)["rows"]}
+        result = rank_resumes(iter_resume_paths(str(resume_dir)), JOB, WEIGHTS, workers=1, screen=True)
+        assert result["screened_out"] == 1 and result["failed"] == 0
+        for row in result["rows"]:
+            assert row["is_qualified"] == full[row["file"]]["is_qualified"]
+            if row["score"] != full[row["file"]]["score"]:
+                assert row["score"] == 0 and not row["is_qualified"]
+
+    def test_glob_source(self, resume_dir):
+        """A glob selects resume files only."""
+        paths = sorted(iter_resume_paths(str(resume_dir / "*")))
+        assert len(paths) == len(RESUMES)
+
+
+class TestCommandLine:
+    """Tests for argument handling and output formats."""
+
+    def test_parse_weights(self):
+        """Overrides apply on top of the slider defaults."""
+        assert parse_weights("skills=1, education=2")["education"] == 2.0
+        assert parse_weights(None) == {**WEIGHTS, "relevance": 0.0}
+        assert parse_weights("relevance=1.5")["relevance"] == 1.5
+        with pytest.raises(ValueError):
+            parse_weights("charisma=5")
+
+    def test_load_job_spec(self, tmp_path):
+        """Job specs resolve from the library or a JSON file."""
+        spec = tmp_path / "job.json"
+        spec.write_text(json.dumps({"required_skills": ["SQL"]}))
+        assert load_job_spec(str(spec)) == {"required_skills": ["SQL"]}
+        assert load_job_spec("Data Analyst I-V (Infrastructure)") is JOB
+        with pytest.raises(KeyError):
+            load_job_spec("No Such Job")
+
+    def test_main_writes_csv_and_jsonl(self, resume_dir, tmp_path):
+        """Both formats carry the same anonymized rows."""
+        out_csv, out_jsonl = tmp_path / "ranked.csv", tmp_path / "ranked.jsonl"
+        for out in (out_csv, out_jsonl):
+            assert main(["rank", "--resumes", str(resume_dir), "--job", "Data Analyst I-V (Infrastructure)",
+                         "--out", str(out), "--workers", "1", "--no-cache"]) == 0
+
+        with open(out_csv, newline="") as f:
+            csv_rows = list(csv.DictReader(f))
+        json_rows = [json.loads(line) for line in out_jsonl.read_text().splitlines()]
+        assert len(csv_rows) == len(json_rows) == len(RESUMES)
+        assert [r["anon_id"] for r in csv_rows] == [r["anon_id"] for r in json_rows]
+        assert float(csv_rows[0]["score"]) == json_rows[0]["score"]
+        assert "Jane" not in out_csv.read_text()
+
+    def test_main_writes_parquet(self, resume_dir, tmp_path):
+        """Parquet output has the CSV columns, including gate results and evidence counts."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        out_csv, out_parquet = tmp_path / "ranked.csv", tmp_path / "ranked.parquet"
+        for out in (out_csv, out_parquet):
+            assert main(["rank", "--resumes", str(resume_dir), "--job", "Data Analyst I-V (Infrastructure)",
+                         "--out", str(out), "--workers", "1", "--no-cache"]) == 0
+        table = pq.read_table(out_parquet)
+        with open(out_csv, newline="") as f:
+            csv_rows = list(csv.DictReader(f))
+        assert table.column_names == list(csv_rows[0])
+        assert table.column("anon_id").to_pylist() == [r["anon_id"] for r in csv_rows]
+        assert table.column("evidence_count").to_pylist() == [int(r["evidence_count"]) for r in csv_rows]
+
+    def test_main_writes_audit(self, resume_dir, tmp_path):
+        """--audit writes a score audit covering every ranked resume."""
+        out, audit = tmp_path / "ranked.csv", tmp_path / "audit.json"
+        assert main(["rank", "--resumes", str(resume_dir), "--job", "Data Analyst I-V (Infrastructure)",
+                     "--out", str(out), "--audit", str(audit), "--workers", "1", "--no-cache",
+                     "--batch-size", "2"]) == 0
+        report = json.loads(audit.read_text())
+        with open(out, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert report["statistics"]["candidates_evaluated"] == len(rows) == len(RESUMES)
+        assert report["statistics"]["score_max"] == max(float(r["score"]) for r in rows)
+        assert report["by_qualification"]["qualified"]["count"] == sum(r["is_qualified"] == "True" for r in rows)
+
+    def test_write_results_empty(self, tmp_path):
+        """An empty result still writes the CSV header."""
+        out = tmp_path / "empty.csv"
+        write_results([], str(out))
+        assert out.read_text().startswith("rank,anon_id,file,score")
@@ -0,0 +1,91 @@
+"""
+Tests for dedup.py — near-duplicate resume detection.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dedup import DuplicateIndex, shingle_hashes
+from utils import iter_dedup
+
+WORDS = ("analyst sql python tableau budget report team lead project review process vendor "
+         "dashboard audit schedule training customer quality data stakeholder").split()
+
+
+def random_resume(rng, n=300):
+    return " ".join(rng.choices(WORDS + [f"w{i}" for i in range(2000)], k=n))
+
+
+class TestDuplicateIndex:
+    """Tests for MinHash LSH clustering."""
+
+    def test_shingles(self):
+        assert len(shingle_hashes("one two three four five six")) == 2
+        assert len(shingle_hashes("Too short")) == 1
+        assert len(shingle_hashes("  ")) == 0
+
+    def test_edited_copy_joins_first_resume(self):
+        rng = random.Random(3)
+        original = random_resume(rng)
+        index = DuplicateIndex()
+        assert index.add("a", original) == "a"
+        assert index.add("b", random_resume(rng)) == "b"
+        assert index.add("c", original.replace("w", "W", 1) + " references available") == "a"
+        assert index.similarity("a", "c") >= index.threshold
+        assert index.clusters() == {"a": ["a", "c"]}
+
+    def test_unrelated_resumes_stay_apart(self):
+        rng = random.Random(5)
+        index = DuplicateIndex()
+        for i in range(300):
+            index.add(i, random_resume(rng))
+        assert index.clusters() == {}
+
+    def test_clusters_merge_transitively_to_earliest(self):
+        rng = random.Random(9)
+        words = random_resume(rng, 400).split()
+        index = DuplicateIndex()
+        index.add("x", "completely different text about nursing and patient care in the ICU")
+        index.add("late", " ".join(words[:380]))
+        index.add("early_edit", " ".join(words[10:]))
+        index.add("bridge", " ".join(words))
+        assert index.cluster_of("early_edit") == "late"
+        assert index.cluster_of("x") == "x"
+
+    def test_empty_text_never_matches(self):
+        index = DuplicateIndex()
+        assert index.add("a", "") == "a"
+        assert index.add("b", "") == "b"
+        assert index.similarity("a", "b") == 0.0
+
+    def test_invalid_bands(self):
+        with pytest.raises(ValueError):
+            DuplicateIndex(num_perm=100, bands=16)
+
+    def test_iter_dedup_flags_copies_in_stream_order(self):
+        rng = random.Random(11)
+        text = random_resume(rng)
+        docs = [
+            {"anon_id": "a", "text": text},
+            {"anon_id": "b", "text": random_resume(rng)},
+            {"anon_id": "a", "text": text},
+            {"anon_id": "c", "text": text + " updated phone"},
+        ]
+        assert [d["duplicate_of"] for d in iter_dedup(docs, DuplicateIndex())] == [None, None, "a", "a"]
+
+    def test_exact_resubmission_points_at_first_copy(self):
+        rng = random.Random(12)
+        text = random_resume(rng)
+        alone = [{"anon_id": "a", "text": text}, {"anon_id": "a", "text": text}]
+        assert [d["duplicate_of"] for d in iter_dedup(alone, DuplicateIndex())] == [None, "a"]
+
+        index = DuplicateIndex()
+        first = [{"anon_id": "a", "text": text}, {"anon_id": "b", "text": text + " updated phone"}]
+        assert [d["duplicate_of"] for d in iter_dedup(first, index)] == [None, "a"]
+        again = [{"anon_id": "a", "text": ""}, {"anon_id": "b", "text": ""}, {"anon_id": "c", "text": text}]
+        assert [d["duplicate_of"] for d in iter_dedup(again, index)] == ["a", "a", "a"]
@@ -0,0 +1,205 @@
+"""
+test_feature_store.py — Unit tests for the columnar candidate store
+====================================================================
+Run with: pytest tests/test_feature_store.py -v
+"""
+
+import csv
+import io
+import random
+
+import numpy as np
+import pytest
+from feature_store import CandidateStore, popcount
+from job_library import JOB_LIBRARY
+from utils import (
+    CERTIFICATION_KEYWORDS,
+    SCORE_COLUMNS,
+    SKILL_KEYWORDS,
+    build_feature_matrix,
+    EXPORT_COLUMNS,
+    gate_candidate,
+    get_logs_csv,
+    iter_export_rows,
+    score_candidates,
+)
+
+JOB = {
+    "levels": ["I", "II", "III"],
+    "experience_required": [0, 2, 5],
+    "required_skills": ["SQL"],
+    "required_any_of": ["Tableau", "Power BI"],
+    "required_education": "Bachelor's",
+}
+WEIGHTS = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5}
+
+
+def random_candidates(n, seed=3):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        level = rng.randint(0, 3)
+        features = {
+            "skills": sorted(rng.sample(SKILL_KEYWORDS, rng.randint(0, 14)), key=SKILL_KEYWORDS.index),
+            "certifications": rng.sample(CERTIFICATION_KEYWORDS, rng.randint(0, 6)),
+            "years_experience": rng.randint(0, 25),
+            "education": ["Other", "B.S.", "M.S.", "Ph.D."][level],
+            "education_level": level,
+        }
+        is_qualified, gate_results = gate_candidate(features, JOB)
+        out.append({"anon_id": f"id{i:04d}", "filename": f"r{i}.pdf", "features": features,
+                    "is_qualified": is_qualified, "gate_results": gate_results})
+    return out
+
+
+class TestCandidateStore:
+    """Tests for CandidateStore."""
+
+    def test_feature_matrix_matches_dicts(self):
+        """The columnar matrix must equal build_feature_matrix over the dicts."""
+        candidates = random_candidates(500)
+        store = CandidateStore.from_candidates(candidates)
+        assert len(store) == 500
+        expected = build_feature_matrix([c["features"] for c in candidates])
+        assert np.array_equal(store.feature_matrix(), expected)
+
+    def test_skills_round_trip(self):
+        """Bitsets decode back to the original skill and certification lists."""
+        candidates = random_candidates(200)
+        store = CandidateStore.from_candidates(candidates)
+        for i, c in enumerate(candidates):
+            assert store.skills(i) == c["features"]["skills"]
+            assert sorted(store.certifications(i)) == sorted(c["features"]["certifications"])
+
+    def test_unknown_skills_are_interned(self):
+        """Skills outside the keyword list get new IDs, widening the bitsets."""
+        extra = [f"skill {i}" for i in range(80)]
+        store = CandidateStore.from_candidates([
+            {"anon_id": "a", "features": {"skills": ["sql"] + extra}},
+            {"anon_id": "b", "features": {"skills": [extra[-1]]}},
+        ])
+        assert store.skill_bits.shape[1] * 64 >= len(SKILL_KEYWORDS) + 80
+        assert popcount(store.skill_bits).tolist() == [81, 1]
+        assert store.skills(1) == [extra[-1]]
+
+    def test_gate_columns(self):
+        """Gate flags and level names mirror gate_candidate."""
+        candidates = random_candidates(300)
+        store = CandidateStore.from_candidates(candidates)
+        store.set_gates([(c["is_qualified"], c["gate_results"]) for c in candidates], JOB["levels"])
+        assert store.columns["is_qualified"].tolist() == [c["is_qualified"] for c in candidates]
+        assert store.level_names().tolist() == [c["gate_results"]["level_name"] for c in candidates]
+        assert store.columns["education_passed"].tolist() == [
+            c["gate_results"]["education_check"]["passed"] for c in candidates]
+
+    def test_csv_matches_get_logs_csv(self):
+        """Ranked CSV export must be byte-identical to the dict-based export."""
+        candidates = random_candidates(400)
+        names = {c["anon_id"]: f"Candidate {i}" for i, c in enumerate(candidates[:50])}
+        store = CandidateStore.from_candidates(candidates)
+        assert store.to_csv(WEIGHTS, names) == get_logs_csv(score_candidates(candidates, WEIGHTS), names)
+
+    def test_ranked_frame(self):
+        """to_frame(weights) lists candidates in rank order with scores."""
+        candidates = random_candidates(100)
+        scored = score_candidates(candidates, WEIGHTS)
+        frame = CandidateStore.from_candidates(candidates).to_frame(WEIGHTS)
+        assert frame["anon_id"].tolist() == [s["anon_id"] for s in scored]
+        assert frame["score"].tolist() == [s["score"] for s in scored]
+        assert frame["skills_score"].tolist() == [s["breakdown"]["skills"] for s in scored]
+
+    def test_export_matches_dict_rows(self):
+        """Streamed export rows equal utils.iter_export_rows over the scored dicts."""
+        candidates = random_candidates(300)
+        for i, c in enumerate(candidates):
+            c["features"]["evidence_lines"] = {s: "..." for s in c["features"]["skills"][:i % 6]}
+        names = {c["anon_id"]: f"Candidate {i}" for i, c in enumerate(candidates)}
+        store = CandidateStore.from_candidates(candidates)
+        store.apply_gates(JOB)
+        expected = list(iter_export_rows(score_candidates(candidates, WEIGHTS), names))
+        assert list(store.iter_export_rows(WEIGHTS, names, chunk_size=64)) == expected
+
+    def test_export_csv_quotes_values(self):
+        """Display names with commas or quotes survive a CSV round trip."""
+        candidates = random_candidates(20)
+        names = {candidates[0]["anon_id"]: 'Smith, "J"'}
+        out = io.BytesIO()
+        assert CandidateStore.from_candidates(candidates).export(out, WEIGHTS, names) == 20
+        rows = list(csv.DictReader(io.StringIO(out.getvalue().decode("utf-8"))))
+        assert list(rows[0]) == EXPORT_COLUMNS
+        assert 'Smith, "J"' in [r["display_name"] for r in rows]
+
+    def test_export_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        candidates = random_candidates(50)
+        store = CandidateStore.from_candidates(candidates)
+        store.apply_gates(JOB)
+        assert store.export(tmp_path / "scores.parquet", WEIGHTS) == 50
+        table = pq.read_table(tmp_path / "scores.parquet")
+        assert table.column_names == EXPORT_COLUMNS
+        assert table.column("rank").to_pylist() == list(range(1, 51))
+        assert table.column("is_qualified").to_pylist() == [r["is_qualified"] for r in store.iter_export_rows(WEIGHTS)]
+        with pytest.raises(ValueError):
+            store.export(io.BytesIO(), WEIGHTS, fmt="xlsx")
+
+    def test_empty_store(self):
+        """An empty pool still yields well-shaped columns."""
+        store = CandidateStore.from_candidates([])
+        assert len(store) == 0
+        assert store.feature_matrix().shape == (0, len(SCORE_COLUMNS))
+        assert store.to_csv(WEIGHTS).count("\n") == 0
+
+    @pytest.mark.parametrize("suffix", [".npz", ".parquet"])
+    def test_save_load(self, tmp_path, suffix):
+        """Columns, bitsets and vocabulary survive a save/load round trip."""
+        if suffix == ".parquet":
+            pytest.importorskip("pyarrow")
+        candidates = random_candidates(150) + [{"anon_id": "x", "features": {"skills": ["custom skill"]}}]
+        store = CandidateStore.from_candidates(candidates)
+        store.set_gates([(c.get("is_qualified", True), c.get("gate_results", {})) for c in candidates],
+                        JOB["levels"])
+        path = tmp_path / f"store{suffix}"
+        store.save(path)
+        loaded = CandidateStore.load(path)
+
+        for name, values in store.columns.items():
+            assert loaded.columns[name].tolist() == values.tolist(), name
+        assert np.array_equal(loaded.skill_bits, store.skill_bits)
+        assert np.array_equal(loaded.cert_bits, store.cert_bits)
+        assert loaded.skill_vocab == store.skill_vocab and loaded.levels == store.levels
+        assert loaded.to_csv(WEIGHTS) == store.to_csv(WEIGHTS)
+
+    def test_apply_gates_matches_gate_candidate(self):
+        """Vectorized gating matches gate_candidate row by row, messages included."""
+        candidates = random_candidates(1000)
+        candidates[5]["features"]["skills"].append("MySQL")
+        candidates[7]["features"] = {}
+        jobs = [JOB, {"required_skills": ["python", "data"], "required_education": "Master's"},
+                {"levels": ["A", "B"], "experience_required": [3, 1, 9]}, {}]
+        for job in jobs:
+            store = CandidateStore.from_candidates(candidates)
+            store.apply_gates(job)
+            for i, c in enumerate(candidates):
+                expected = gate_candidate(c["features"], job) if c["features"] else (True, {})
+                assert store.gate_results(i) == expected, (i, job)
+                assert store.columns["is_qualified"][i] == expected[0]
+                assert store.level_names()[i] == expected[1].get("level_name", "")
+
+    def test_match_jobs(self):
+        """The candidates × jobs matrix matches gating each job separately."""
+        candidates = random_candidates(400)
+        candidates[3]["features"] = {}
+        store = CandidateStore.from_candidates(candidates)
+        before = {k: v.copy() for k, v in store.columns.items()}
+        jobs = {**JOB_LIBRARY, "custom": JOB}
+        matches = store.match_jobs(jobs)
+
+        assert matches["jobs"] == list(jobs)
+        assert matches["qualified"].shape == matches["level_names"].shape == (400, len(jobs))
+        for j, job in enumerate(jobs.values()):
+            for i, c in enumerate(candidates):
+                expected = gate_candidate(c["features"], job) if c["features"] else (True, {})
+                assert matches["qualified"][i, j] == expected[0]
+                assert matches["level_names"][i, j] == expected[1].get("level_name", "")
+        for name, values in before.items():
+            assert np.array_equal(store.columns[name], values), name
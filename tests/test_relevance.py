@@ -0,0 +1,117 @@
+"""
+Tests for relevance.py — BM25 job/resume relevance.
+"""
+
+import math
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from relevance import BM25_B, BM25_K1, RelevanceIndex, tokenize
+
+
+def reference_bm25(docs, query, k1=BM25_K1, b=BM25_B):
+    """Textbook Okapi BM25, one document at a time."""
+    tokenized = [tokenize(d) for d in docs]
+    n = len(tokenized)
+    avg_length = sum(map(len, tokenized)) / n
+    out = []
+    for tokens in tokenized:
+        tf = Counter(tokens)
+        score = 0.0
+        for term in set(tokenize(query)):
+            if not tf[term]:
+                continue
+            df = sum(term in t for t in tokenized)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(tokens) / avg_length))
+        out.append(score)
+    return out
+
+
+JOB = "Data analyst with SQL, Tableau and Python to build dashboards for infrastructure reporting."
+RESUMES = {
+    "a": "Senior data analyst. SQL, Tableau dashboards, Python automation, infrastructure reporting.",
+    "b": "Registered nurse with ICU experience and patient care.",
+    "c": "Analyst building SQL reports. Excel and some Python.",
+}
+
+
+class TestRelevanceIndex:
+    """Tests for the incremental BM25 index."""
+
+    def test_tokenize_drops_stopwords_and_short_tokens(self):
+        assert tokenize("The SQL & Python skills, 5 years of C#") == ["sql", "python"]
+
+    def test_scores_match_reference_bm25(self):
+        rng = random.Random(11)
+        words = ["sql", "python", "tableau", "excel", "budget", "procurement", "nursing", "audit", "etl"]
+        docs = [" ".join(rng.choices(words, k=rng.randint(1, 40))) for _ in range(60)]
+        index = RelevanceIndex()
+        for i, doc in enumerate(docs):
+            index.add(i, doc)
+        query = "sql python etl audit dashboards"
+        assert np.allclose(index.scores(query), reference_bm25(docs, query))
+
+    def test_relevance_scale_and_order(self):
+        index = RelevanceIndex()
+        for doc_id, text in RESUMES.items():
+            index.add(doc_id, text)
+        relevance = index.relevance(JOB, ["a", "b", "c"]).tolist()
+        assert relevance[0] == 10.0
+        assert relevance[1] == 0.0
+        assert 0 < relevance[2] < 10
+
+    def test_incremental_add_matches_batch(self):
+        """Querying between additions gives the same result as indexing at once."""
+        batch, incremental = RelevanceIndex(), RelevanceIndex()
+        for doc_id, text in RESUMES.items():
+            batch.add(doc_id, text)
+            incremental.add(doc_id, text)
+            incremental.scores(JOB)
+        incremental.add("a", "ignored: already indexed")
+        assert len(incremental) == 3
+        assert np.array_equal(incremental.scores(JOB), batch.scores(JOB))
+
+    def test_pool_subset_and_unknown_ids(self):
+        index = RelevanceIndex()
+        for doc_id, text in RESUMES.items():
+            index.add(doc_id, text)
+        assert index.relevance(JOB, ["c", "missing"]).tolist() == [10.0, 0.0]
+        assert index.relevance(JOB, []).tolist() == []
+        assert RelevanceIndex().relevance(JOB).tolist() == []
+        assert index.relevance("").tolist() == [0.0, 0.0, 0.0]
+
+    def test_pool_statistics_ignore_other_documents(self):
+        """A pool scores the same whatever else the index holds."""
+        alone = RelevanceIndex()
+        for doc_id, text in RESUMES.items():
+            alone.add(doc_id, text)
+        crowded = RelevanceIndex()
+        for i in range(20):
+            crowded.add(f"other{i}", "SQL Python Tableau dashboards " * (i + 1))
+        for doc_id, text in RESUMES.items():
+            crowded.add(doc_id, text)
+        pool = ["a", "b", "c"]
+        assert np.allclose(crowded.scores(JOB, pool), alone.scores(JOB))
+        assert crowded.relevance(JOB, pool).tolist() == alone.relevance(JOB, pool).tolist()
+        assert np.allclose(crowded.scores(JOB, pool), reference_bm25(list(RESUMES.values()), JOB))
+
+    def test_retain_drops_other_documents(self):
+        index = RelevanceIndex()
+        for i in range(5):
+            index.add(f"other{i}", "SQL Python Tableau dashboards " * (i + 1))
+        for doc_id, text in RESUMES.items():
+            index.add(doc_id, text)
+        index.scores(JOB)  # freezes postings, which retain must invalidate
+        assert index.retain(["c", "a", "b"]) == 5
+        assert index.doc_ids == ["a", "b", "c"] and "other0" not in index
+        assert np.allclose(index.scores(JOB), reference_bm25(list(RESUMES.values()), JOB))
+        assert index.retain(RESUMES) == 0
+        index.add("d", RESUMES["a"])
+        assert index.relevance(JOB, ["a", "d"]).tolist() == [10.0, 10.0]
@@ -0,0 +1,113 @@
+"""
+test_text_cache.py — Unit tests for the on-disk resume text cache
+==================================================================
+Run with: pytest tests/test_text_cache.py -v
+"""
+
+import os
+
+import utils
+from text_cache import EVICT_LOW_WATER, SessionCacheView, TextCache
+from utils import ingest_resumes
+
+
+class TestTextCache:
+    """Tests for the content-addressed text cache."""
+
+    def test_roundtrip(self, tmp_path):
+        """A stored entry should be returned for the same bytes."""
+        cache = TextCache(tmp_path, version="v1")
+        key = cache.key(b"resume bytes")
+        cache.put(key, {"text": "anonymized", "features": {"skills": ["sql"]}})
+        assert cache.get(key) == {"text": "anonymized", "features": {"skills": ["sql"]}}
+
+    def test_version_changes_key(self, tmp_path):
+        """A new pipeline version must not serve entries from an old one."""
+        old = TextCache(tmp_path, version="v1")
+        new = TextCache(tmp_path, version="v2")
+        old.put(old.key(b"same bytes"), {"text": "stale", "features": None})
+        assert new.get(new.key(b"same bytes")) is None
+
+    def test_lru_eviction(self, tmp_path):
+        """The least recently used entry should be evicted first."""
+        cache = TextCache(tmp_path, version="v1", max_bytes=10 ** 6)
+        keys = [cache.key(bytes([i])) for i in range(3)]
+        for i, k in enumerate(keys):
+            cache.put(k, {"text": "x" * 100, "features": None})
+            os.utime(cache._path(k), (1000 + i, 1000 + i))
+        cache.get(keys[0])  # Refresh the oldest entry
+        cache.max_bytes = 2 * os.path.getsize(cache._path(keys[0]))
+        cache.evict()
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+    def test_over_budget_write_evicts_to_low_water_mark(self, tmp_path):
+        """One over-budget write frees headroom, so the next writes do not rescan."""
+        cache = TextCache(tmp_path, version="v1", max_bytes=10 ** 6)
+        entry = {"text": "x" * 1000, "features": None}
+        cache.put(cache.key(b"probe"), entry)
+        size = os.path.getsize(cache._path(cache.key(b"probe")))
+        cache.max_bytes = 20 * size
+        for i in range(20):
+            cache.put(cache.key(bytes([i])), entry)
+        assert cache._approx_bytes <= cache.max_bytes * EVICT_LOW_WATER
+        scans = []
+        cache._scan = lambda original=cache._scan: scans.append(1) or original()
+        cache.put(cache.key(b"next"), entry)
+        assert not scans
+
+    def test_overwrite_is_not_double_counted(self, tmp_path):
+        cache = TextCache(tmp_path, version="v1")
+        key = cache.key(b"a")
+        for _ in range(3):
+            cache.put(key, {"text": "a" * 100, "features": None})
+        assert cache._approx_bytes == os.path.getsize(cache._path(key))
+        cache.remove(key)
+        assert cache._approx_bytes == 0 and cache.get(key) is None
+
+    def test_session_view_clears_only_its_entries(self, tmp_path):
+        cache = TextCache(tmp_path, version="v1")
+        mine, theirs = SessionCacheView(cache), SessionCacheView(cache)
+        mine.put(mine.key(b"a"), {"text": "a", "features": None})
+        theirs.put(theirs.key(b"b"), {"text": "b", "features": None})
+        mine.clear()
+        assert cache.get(cache.key(b"a")) is None
+        assert theirs.get(theirs.key(b"b")) is not None
+
+    def test_no_temp_files_left(self, tmp_path):
+        """Atomic writes should not leave partial files behind."""
+        cache = TextCache(tmp_path, version="v1")
+        cache.put(cache.key(b"a"), {"text": "a", "features": None})
+        assert not list(tmp_path.glob("*/*.tmp"))
+
+
+class TestIngestWithCache:
+    """Tests for cache-backed resume ingestion."""
+
+    def test_warm_load_skips_extraction(self, tmp_path, monkeypatch):
+        """Second ingestion of identical bytes should not extract again."""
+        resume = tmp_path / "resume.txt"
+        resume.write_text("Email: jane@example.com\n5 years of experience with Python and SQL")
+        cache = TextCache(tmp_path / "cache", version="v1")
+
+        cold = ingest_resumes([resume], workers=1, cache=cache)
+        assert "[EMAIL_REDACTED]" in cold[0]["text"]
+        assert "sql" in cold[0]["features"]["skills"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("extraction should be served from cache")
+
+        monkeypatch.setattr(utils, "_extract_items", fail)
+        warm = ingest_resumes([resume], workers=1, cache=cache)
+        assert warm == cold
+
+    def test_cache_never_stores_raw_pii(self, tmp_path):
+        """Only anonymized text should reach disk."""
+        resume = tmp_path / "resume.txt"
+        resume.write_text("Contact jane@example.com or 555-123-4567")
+        cache = TextCache(tmp_path / "cache", version="v1")
+        ingest_resumes([resume], workers=1, cache=cache)
+        stored = "".join(p.read_text() for p in (tmp_path / "cache").glob("*/*.json"))
+        assert "jane@example.com" not in stored
+        assert "555-123-4567" not in stored
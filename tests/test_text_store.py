@@ -0,0 +1,86 @@
+"""
+Tests for text_store.py — per-session resume text retention.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from text_store import RETENTION_POLICIES, SessionTextStore, deep_sizeof
+
+TEXT = "Senior data analyst. SQL, Tableau dashboards, Python automation. " * 40
+
+
+class TestSessionTextStore:
+    """Tests for the retention policies."""
+
+    @pytest.mark.parametrize("policy", ["keep", "compress", "spill"])
+    def test_retained_text_round_trips(self, policy, tmp_path):
+        store = SessionTextStore(policy, directory=tmp_path)
+        store.put("a", TEXT)
+        assert "a" in store and len(store) == 1
+        assert store.get("a") == TEXT
+        assert store.get("missing") is None
+
+    def test_compress_and_spill_shrink_memory(self, tmp_path):
+        sizes = {}
+        for policy in RETENTION_POLICIES:
+            store = SessionTextStore(policy, directory=tmp_path)
+            store.put("a", TEXT)
+            sizes[policy] = store.stats()["memory_bytes"]
+        assert sizes["compress"] < sizes["keep"] / 5
+        assert sizes["spill"] == sizes["drop"] == 0
+
+    def test_drop_discards_unless_pinned(self):
+        store = SessionTextStore("drop")
+        store.put("a", TEXT)
+        store.put("b", TEXT, keep=True)
+        assert store.get("a") is None
+        assert store.get("b") == TEXT
+
+    def test_set_policy_moves_text(self, tmp_path):
+        store = SessionTextStore("compress", directory=tmp_path)
+        store.put("a", TEXT)
+        store.put("b", "pinned", keep=True)
+        store.set_policy("spill")
+        assert store.stats()["disk_bytes"] > 0
+        assert store.get("a") == TEXT
+        store.set_policy("drop")
+        assert store.get("a") is None
+        assert store.get("b") == "pinned"
+        assert list(tmp_path.iterdir()) == []  # spill directory removed
+
+    def test_retain_discards_other_keys(self, tmp_path):
+        store = SessionTextStore("spill", directory=tmp_path)
+        for key in "abc":
+            store.put(key, TEXT)
+        assert store.retain(["b", "missing"]) == 2
+        assert len(store) == 1 and store.get("b") == TEXT
+        assert len(list(next(tmp_path.iterdir()).iterdir())) == 1
+
+    def test_clear_removes_spilled_files(self, tmp_path):
+        store = SessionTextStore("spill", directory=tmp_path)
+        store.put("a", TEXT)
+        assert len(list(tmp_path.iterdir())) == 1
+        store.clear()
+        assert len(store) == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_policy_rejected(self, monkeypatch):
+        with pytest.raises(ValueError):
+            SessionTextStore("archive")
+        monkeypatch.setenv("CANDIDATECOMPASS_TEXT_RETENTION", "archive")
+        assert SessionTextStore.from_env().policy == "compress"
+        monkeypatch.setenv("CANDIDATECOMPASS_TEXT_RETENTION", "Spill")
+        assert SessionTextStore.from_env().policy == "spill"
+
+    def test_deep_sizeof_counts_nested_and_shared_objects(self):
+        text = "x" * 10_000
+        assert deep_sizeof({"a": text, "b": [text]}) < 2 * len(text)
+        assert deep_sizeof({"a": text}) > len(text)
+        array = np.zeros(1000)
+        assert deep_sizeof([array, array[:10]]) < 2 * array.nbytes
@@ -4,20 +4,105 @@ test_utils.py — Unit tests for Candidate Ranker utilities
 Run with: pytest tests/test_utils.py -v
 """
 
+import hashlib
+import io
+import random
+import zipfile
+from pathlib import Path
+
+import numpy as np
 import pytest
 from utils import (
     anonymize_text,
+    extract_texts,
     extract_features,
+    find_keywords,
     score_candidate,
     score_candidates,
+    build_feature_matrix,
+    score_matrix,
+    rank_scores,
+    rank_from_matrix,
+    round_scores,
     generate_template_questions,
+    build_job_profile,
     get_relative_luminance,
     check_contrast_ratio,
     get_logs_csv,
+    write_csv,
     bias_audit_stub,
+    ingest_resumes,
+    gate_candidate,
+    detect_qualification_level,
+    check_education_requirement,
+    SKILL_KEYWORDS,
+    iter_extract,
+    iter_anonymize,
+    iter_ingest,
+    iter_features,
+    iter_gate,
+    iter_score,
+    top_k_candidates,
+    OnlineRanking,
+    screen_pages,
+    screen_gate_results,
+    gate_plan_for,
+    decision_pdf_key,
+    get_decision_pdf,
+    decision_pdf_filename,
+    pdf_styles,
+    iter_decision_pdfs,
+    write_decision_pdfs_zip,
+    decision_flowables,
+    decision_story,
+    generate_panel_report,
 )
 
 
+DEMO_RESUMES = Path(__file__).resolve().parent.parent / "sample_data" / "generated" / "DemoResumes"
+
+
+# =============================================================================
+# TEXT EXTRACTION TESTS
+# =============================================================================
+
+class TestTextExtraction:
+    """Tests for batch text extraction."""
+
+    def test_extract_txt_preserves_order(self, tmp_path):
+        """Results should come back in input order."""
+        paths = []
+        for i in range(3):
+            p = tmp_path / f"resume_{i}.txt"
+            p.write_text(f"Resume number {i}")
+            paths.append(p)
+        results = extract_texts(paths, workers=1)
+        assert [r["text"] for r in results] == ["Resume number 0", "Resume number 1", "Resume number 2"]
+        assert all(r["error"] is None for r in results)
+
+    def test_extract_reports_errors_without_aborting(self, tmp_path):
+        """A broken file should be reported while the rest of the batch succeeds."""
+        pytest.importorskip("pypdf")
+        good = io.BytesIO(b"Python and SQL")
+        good.name = "good.txt"
+        bad = io.BytesIO(b"%PDF-1.4 truncated garbage")
+        bad.name = "bad.pdf"
+        missing = tmp_path / "missing.pdf"
+        results = extract_texts([good, bad, missing], workers=1)
+        assert results[0]["text"] == "Python and SQL"
+        assert results[1]["text"] == "" and results[1]["error"]
+        assert results[2]["text"] == "" and results[2]["error"]
+
+    def test_extract_parallel_matches_serial(self):
+        """The process pool should return the same text as in-process extraction."""
+        pytest.importorskip("pypdf")
+        pdfs = sorted(DEMO_RESUMES.glob("*.pdf"))[:4]
+        serial = extract_texts(pdfs, workers=1)
+        parallel = extract_texts(pdfs, workers=2)
+        assert [r["text"] for r in parallel] == [r["text"] for r in serial]
+        assert all(r["text"] for r in parallel)
+
+
 # =============================================================================
 # ANONYMIZATION TESTS
 # =============================================================================
@@ -59,6 +144,51 @@ class TestAnonymization:
         assert "John Smith" not in anon
         assert "[NAME_REDACTED]" in anon
 
+    def test_anonymize_ssn_takes_priority_over_phone(self):
+        """An SSN inside a longer phone-like run should still be redacted as an SSN."""
+        text = "Ref 1 123-45-6789"
+        anon, mapping = anonymize_text(text)
+        assert anon == "Ref 1 [SSN_REDACTED]"
+        assert mapping == {"[SSN_REDACTED]": "123-45-6789"}
+
+    def test_anonymize_mapping_keeps_first_ssn_last_email(self):
+        """Mapping semantics should match the original per-class loops."""
+        text = "SSN 111-22-3333, 444-55-6666; a@x.org then b@y.org"
+        anon, mapping = anonymize_text(text)
+        assert mapping["[SSN_REDACTED]"] == "111-22-3333"
+        assert mapping["[EMAIL_REDACTED]"] == "b@y.org"
+        assert anon.count("[SSN_REDACTED]") == 2
+
+    def test_anonymize_matches_previous_implementation(self):
+        """Randomized PII-dense strings should redact exactly as before."""
+        import random
+        from legacy import legacy_anonymize_text
+
+        tokens = ["123", "45", "6789", "-", " ", "(", ")", "+1", "555", "1234", "jane", "@",
+                  "x.com", ".", "Main", "Street", "Name:", "Jane", "Doe", "\n", "2019"]
+        rng = random.Random(42)
+        for _ in range(2000):
+            text = "".join(rng.choice(tokens) for _ in range(rng.randint(1, 12)))
+            assert anonymize_text(text) == legacy_anonymize_text(text), text
+
+    def test_anonymize_matches_previous_implementation_on_adjacent_pii(self):
+        """PII glued together with '.', '-' or nothing should redact exactly as before."""
+        from legacy import legacy_anonymize_text
+
+        # Each string appears at most once: the old loops also rewrote every
+        # other copy of a matched string, wherever it occurred.
+        pii = ["123-45-6789", "987 65 4321", "555-123-4567", "+1 (800) 555-1234", "jdoe@gmail.com",
+               "a_b@x.org", "x.y+z@mail.co", "12 Main Street", "9 Oak Ave", "Name: Jane Doe", "Name: Bo",
+               "Ref", "7", "2019"]
+        rng = random.Random(7)
+        for _ in range(5000):
+            parts = rng.sample(pii, rng.randint(2, 5))
+            text = "".join(p + rng.choice([".", "-", "", "", " ", "_", "@"]) for p in parts)
+            assert anonymize_text(text) == legacy_anonymize_text(text), text
+        assert anonymize_text("SSN 123-45-6789.jdoe@gmail.com")[0] == "SSN [SSN_REDACTED][EMAIL_REDACTED]"
+        assert anonymize_text("a_b@x.orga_b@x.org")[0] == "[EMAIL_REDACTED][EMAIL_REDACTED]"
+        assert anonymize_text("12 Main Street555-123-4567")[0] == "[ADDR_REDACTED][PHONE_REDACTED]"
+
     def test_anonymize_preserves_content(self):
         """Non-PII content should be preserved."""
         text = "5 years of Python experience with SQL and Tableau skills."
@@ -130,6 +260,34 @@ class TestFeatureExtraction:
         assert "pmp" in features["certifications"]
         assert "aws certified" in features["certifications"]
 
+    def test_keywords_respect_word_boundaries(self):
+        """Short keywords should not match inside longer words."""
+        features = extract_features("Their team in Kansas built a dashboard.")
+        assert "r" not in features["skills"]
+        assert "sas" not in features["skills"]
+
+        features = extract_features("Statistics in R and SAS; scikit-learn models.")
+        assert {"r", "sas", "scikit-learn"} <= set(features["skills"])
+
+    def test_multiword_keywords(self):
+        """Multi-word keywords span whitespace or hyphens but not punctuation."""
+        assert "power bi" in extract_features("Built Power\nBI reports")["skills"]
+        assert "power bi" in extract_features("Built Power-BI reports")["skills"]
+        assert "data analysis" not in extract_features("Big data. Analysis of trends")["skills"]
+
+    def test_overlapping_keywords(self):
+        """Keywords nested in longer ones should all be reported."""
+        features = extract_features("ADA compliance reviews; AWS Certified")
+        assert {"ada compliance", "compliance", "aws"} <= set(features["skills"])
+        assert "aws certified" in features["certifications"]
+
+    def test_find_keywords_offsets(self):
+        """Hits should carry the offset of the keyword's first character."""
+        text_l = "python and machine  learning"
+        hits = find_keywords(text_l)
+        assert (0, "python") in hits
+        assert (11, "machine learning") in hits
+
 
 # =============================================================================
 # SCORING TESTS
@@ -190,6 +348,18 @@ class TestScoring:
 
         assert breakdown["experience"] == 15.0  # Capped at 15
 
+    def test_score_relevance_is_optional(self):
+        """Relevance only counts when weighted, and is capped at 10."""
+        features = {"skills": ["sql"], "years_experience": 2, "education_level": 0, "certifications": [],
+                    "relevance": 12.5}
+        base, breakdown = score_candidate(features, {"skills": 1.0, "experience": 1.0})
+        assert breakdown["relevance"] == 0.0
+        assert base == 3.0
+
+        score, breakdown = score_candidate(features, {"skills": 1.0, "experience": 1.0, "relevance": 0.5})
+        assert breakdown["relevance"] == 5.0
+        assert score == 8.0
+
     def test_score_candidates_ranking(self):
         """Candidates should be ranked by score descending."""
         candidates = [
@@ -207,6 +377,296 @@ class TestScoring:
         assert scored[0]["rank"] == 1
         assert scored[2]["rank"] == 3
 
+    def test_score_candidates_matches_previous_implementation(self):
+        """The columnar path should return exactly what the per-dict scorer did, ties included."""
+        from legacy import legacy_score_candidates, random_candidates
+
+        candidates = random_candidates(500)
+        for weights in (
+            {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5},
+            {"skills": 0.1, "experience": 0.7, "education": 4.5, "certifications": 2.5},
+            {},
+        ):
+            assert score_candidates(candidates, weights) == legacy_score_candidates(candidates, weights)
+
+    def test_score_matrix_totals_match_score_candidate(self):
+        """Matrix totals should be bit-identical to score_candidate before rounding."""
+        from legacy import random_candidates
+
+        features = [c["features"] for c in random_candidates(200, seed=3)]
+        weights = {"skills": 0.1, "experience": 0.3, "education": 0.7, "certifications": 1.1}
+        totals, _ = score_matrix(build_feature_matrix(features), weights)
+        for f, total in zip(features, totals.tolist()):
+            assert round(total, 2) == score_candidate(f, weights)[0]
+
+    def test_rank_from_matrix_reranks_without_rebuilding(self):
+        """Re-weighting a kept matrix should match scoring from scratch."""
+        from legacy import random_candidates
+
+        candidates = random_candidates(300, seed=5)
+        matrix = build_feature_matrix([c["features"] for c in candidates])
+        for weights in ({"skills": 0.5}, {"skills": 5.0, "education": 2.5, "certifications": 3.0}):
+            assert rank_from_matrix(candidates, matrix, weights) == score_candidates(candidates, weights)
+
+    def test_round_scores_matches_round(self):
+        """Vectorized rounding should agree with round(x, 2), including ties."""
+        import random
+
+        rng = random.Random(1)
+        values = [rng.randint(0, 10 ** 6) / 1000 for _ in range(5000)] + [rng.uniform(0, 100) for _ in range(5000)]
+        values += [0.125, 2.675, 1.005, 0.5, 0.0]
+        assert round_scores(np.array(values)).tolist() == [round(v, 2) for v in values]
+
+    def test_rank_scores_ties_and_top_k(self):
+        """Ties keep input order and top_k returns the head of the full ranking."""
+        scores = np.array([3.0, 5.0, 3.0, 1.0, 5.0, 3.0])
+        assert rank_scores(scores).tolist() == [1, 4, 0, 2, 5, 3]
+        for k in range(0, 8):
+            assert rank_scores(scores, top_k=k).tolist() == [1, 4, 0, 2, 5, 3][:k]
+
+
+# =============================================================================
+# QUALIFICATION GATING TESTS
+# =============================================================================
+
+def _reference_gate_candidate(features, job_info):
+    """gate_candidate as originally written, before gate plans."""
+    gate_results = {"education_check": {"passed": True, "message": ""},
+                    "skills_check": {"passed": True, "message": ""},
+                    "level_qualified": 0, "level_name": ""}
+    if "required_education" in job_info:
+        edu, edu_level = features.get("education", "Other"), features.get("education_level", 0)
+        years_exp, req = features.get("years_experience", 0), job_info["required_education"]
+        if req in ("Bachelor's", "Bachelor's or equivalent experience"):
+            check = ((True, f"Has {edu}") if edu_level >= 1 else
+                     (True, f"Meets requirement via work experience substitution ({years_exp} years)") if years_exp >= 4
+                     else (False, f"Needs Bachelor's OR 4+ years experience (has {years_exp} years)"))
+        elif req == "Master's":
+            check = ((True, f"Has {edu}") if edu_level >= 2 else
+                     (True, f"Meets requirement via work experience substitution ({years_exp} years)") if years_exp >= 6
+                     else (False, f"Needs Master's OR 6+ years experience (has {years_exp} years)"))
+        else:
+            check = (True, "No specific education requirement")
+        gate_results["education_check"] = {"passed": check[0], "message": check[1]}
+    skills_lower = [s.lower() for s in features.get("skills", [])]
+    if "required_skills" in job_info:
+        missing = [r for r in job_info["required_skills"] if not any(r.lower() in cs for cs in skills_lower)]
+        gate_results["skills_check"] = {
+            "passed": not missing,
+            "message": f"Missing required skills: {', '.join(missing)}" if missing else "All required skills present"}
+    if "required_any_of" in job_info:
+        if not any(any(r.lower() in cs for cs in skills_lower) for r in job_info["required_any_of"]):
+            gate_results["skills_check"] = {
+                "passed": False,
+                "message": f"Missing required tools: Must have at least one of: {', '.join(job_info['required_any_of'])}"}
+    if "levels" in job_info and "experience_required" in job_info:
+        level = 0
+        for i, threshold in enumerate(job_info["experience_required"]):
+            if features.get("years_experience", 0) >= threshold:
+                level = i
+            else:
+                break
+        gate_results["level_qualified"] = level
+        gate_results["level_name"] = job_info["levels"][level] if level < len(job_info["levels"]) else "Unknown"
+    return (gate_results["education_check"]["passed"] and gate_results["skills_check"]["passed"]), gate_results
+
+
+GATING_JOBS = [
+    {"levels": ["I", "II", "III", "IV", "V"], "experience_required": [0, 1, 2, 3, 4], "required_skills": ["SQL"],
+     "required_any_of": ["Tableau", "Power BI", "Qlik"], "required_education": "Bachelor's or equivalent experience"},
+    {"required_skills": ["Python", "data", "Excel"], "required_education": "Master's"},
+    {"required_any_of": ["analysis", "aws"], "required_education": "High school",
+     "levels": ["Junior", "Senior"], "experience_required": [0, 5, 8]},
+    {"levels": ["A", "B", "C"], "experience_required": [2, 1, 6], "required_skills": []},
+    {},
+]
+
+
+class TestGating:
+    """Tests for compiled gate plans."""
+
+    def test_matches_reference(self):
+        """Gate plans must reproduce the original gates and messages exactly."""
+        rng = random.Random(11)
+        extra = ["MySQL", "Power BI Desktop", "advanced excel", "Go"]
+        for _ in range(3000):
+            level = rng.randint(0, 3)
+            features = {
+                "skills": rng.sample(SKILL_KEYWORDS + extra, rng.randint(0, 8)),
+                "years_experience": rng.randint(0, 12),
+                "education": ["Other", "B.S.", "M.S.", "Ph.D."][level],
+                "education_level": level,
+            }
+            if rng.random() < 0.05:
+                features = {}
+            for job in GATING_JOBS:
+                assert gate_candidate(features, job) == _reference_gate_candidate(features, job), (features, job)
+
+    def test_plan_follows_job_changes(self):
+        """A job dict edited in place is recompiled, not served from the cache."""
+        job = {"required_skills": ["SQL"]}
+        features = {"skills": ["python"]}
+        assert not gate_candidate(features, job)[0]
+        job["required_skills"] = ["Python"]
+        assert gate_candidate(features, job)[0]
+
+    def test_detect_level_thresholds(self):
+        """Levels stop at the first unmet threshold, even if thresholds are unsorted."""
+        assert detect_qualification_level(2, [0, 1, 2, 3, 4]) == 2
+        assert detect_qualification_level(10, [0, 1, 2, 3, 4]) == 4
+        assert detect_qualification_level(0, [1, 2]) == 0
+        assert detect_qualification_level(5, [0, 6, 1]) == 0
+        assert detect_qualification_level(3, []) == 0
+
+    def test_education_rules_messages(self):
+        """Education messages are unchanged by the rule table."""
+        f = {"education": "Other", "education_level": 0, "years_experience": 5}
+        assert check_education_requirement(f, "Master's") == (
+            False, "Needs Master's OR 6+ years experience (has 5 years)")
+        assert check_education_requirement(f, "Bachelor's") == (
+            True, "Meets requirement via work experience substitution (5 years)")
+        assert check_education_requirement(f, "Associate's") == (True, "No specific education requirement")
+
+
+class TestScreening:
+    """Tests for the early-reject screening mode."""
+
+    def test_never_rejects_what_gating_passes(self):
+        """Screened-out resumes fail gate_candidate on skills with the same message."""
+        rng = random.Random(2)
+        words = ["sql", "Power BI", "power\nbi", "tableau", "Python", "excel", "data", "aws", "analysis",
+                 "mysql", "Name: Jane Doe", "jane@sql.com", "report", "team"]
+        for _ in range(400):
+            pages = [" ".join(rng.choices(words, k=rng.randint(0, 12))) for _ in range(rng.randint(1, 4))]
+            for job in GATING_JOBS:
+                text, rejection = screen_pages(iter(pages), job)
+                assert text == "\n".join(pages)
+                anon_text = anonymize_text(text)[0]
+                _, gates = gate_candidate(extract_features(anon_text), job)
+                if rejection is not None:
+                    # As ingest_resumes does: the reason comes from the anonymized text
+                    _, rejection = screen_pages([anon_text], job)
+                    is_qualified, screened = screen_gate_results(gate_plan_for(job), *rejection)
+                    assert not is_qualified and screened["screened_out"]
+                    assert screened["skills_check"] == gates["skills_check"]
+
+    def test_keyword_split_across_pages(self):
+        """A multi-word skill broken by a page break still counts."""
+        job = {"required_any_of": ["Power BI"]}
+        assert screen_pages(["SQL and Power", "BI dashboards"], job)[1] is None
+        assert screen_pages(["SQL and Power", "dashboards"], job)[1] == ([], False)
+
+    def test_scan_stops_once_gates_pass(self, monkeypatch):
+        """Pages after the one satisfying every gate are kept but not scanned."""
+        import utils
+        scanned = []
+        real = utils.find_keywords
+        monkeypatch.setattr(utils, "find_keywords", lambda text, *a: scanned.append(text) or real(text, *a))
+        job = {"required_skills": ["SQL"], "required_any_of": ["Tableau"]}
+        text, rejection = screen_pages(["Tableau", "SQL", "Python", "Excel"], job)
+        assert rejection is None and len(scanned) == 2
+        assert text == "Tableau\nSQL\nPython\nExcel"
+
+    def test_ingest_screens_demo_resumes(self):
+        """Screening keeps features for passing resumes and a gate reason for the rest."""
+        pdfs = sorted(DEMO_RESUMES.glob("*.pdf"))
+        job = GATING_JOBS[0]
+        full = ingest_resumes(pdfs, workers=1)
+        screened = ingest_resumes(pdfs, workers=1, screen_job=job)
+        assert any(s.get("screened_out") for s in screened)
+        for f, s in zip(full, screened):
+            is_qualified, gates = gate_candidate(f["features"], job)
+            assert s["text"] == f["text"]
+            if s.get("screened_out"):
+                assert s["features"] is None and not gates["skills_check"]["passed"]
+                assert s["screened_out"][1]["skills_check"] == gates["skills_check"]
+                assert list(iter_gate([s], job))[0]["is_qualified"] is False
+            else:
+                assert s["features"] == f["features"]
+
+
+
+# =============================================================================
+# STREAMING PIPELINE TESTS
+# =============================================================================
+
+class TestStreamingPipeline:
+    """Tests for the generator pipeline and top-k sink."""
+
+    JOB = {"required_skills": ["SQL"], "levels": ["I", "II"], "experience_required": [0, 3]}
+    WEIGHTS = {"skills": 3.0, "experience": 2.0, "education": 1.0, "certifications": 0.5}
+
+    def test_matches_list_pipeline(self):
+        """Streaming stages should reproduce ingest + gate + score_candidates."""
+        pdfs = sorted(DEMO_RESUMES.glob("*.pdf"))
+        candidates = []
+        for entry in ingest_resumes(pdfs, workers=1):
+            is_qualified, gate_results = gate_candidate(entry["features"], self.JOB)
+            candidates.append({"anon_id": entry["name"], "features": entry["features"],
+                               "is_qualified": is_qualified, "gate_results": gate_results})
+        expected = score_candidates(candidates, self.WEIGHTS)
+
+        docs = iter_features(iter_anonymize(iter_extract(pdfs, workers=1, batch_size=3)))
+        ranked = top_k_candidates(iter_score(iter_gate(docs, self.JOB), self.WEIGHTS, batch_size=2))
+        assert [d["name"] for d in ranked] == [e["anon_id"] for e in expected]
+        for doc, e in zip(ranked, expected):
+            assert (doc["rank"], doc["score"], doc["breakdown"]) == (e["rank"], e["score"], e["breakdown"])
+            assert (doc["is_qualified"], doc["gate_results"]) == (e["is_qualified"], e["gate_results"])
+            assert "text" not in doc
+
+    def test_top_k_matches_full_ranking(self):
+        """A bounded sink keeps the same leading results, ties in input order."""
+        scored = [{"anon_id": i, "score": float(s)} for i, s in enumerate([3, 5, 3, 1, 5, 3, 0])]
+        full = top_k_candidates([dict(d) for d in scored])
+        assert [d["anon_id"] for d in full] == [1, 4, 0, 2, 5, 3, 6]
+        for k in (1, 2, 4, 10):
+            assert top_k_candidates([dict(d) for d in scored], k=k) == full[:k]
+
+    def test_top_k_zero_keeps_nothing(self):
+        """k=0 consumes the stream without indexing the empty heap."""
+        scored = ({"anon_id": i, "score": float(i)} for i in range(3))
+        assert top_k_candidates(scored, k=0) == []
+
+    def test_online_ranking_tracks_top_k(self):
+        """The live board matches a full ranking after every push."""
+        rng = random.Random(4)
+        scored = [{"anon_id": i, "score": float(rng.randint(0, 20))} for i in range(200)]
+        for k in (None, 0, 1, 5, 25):
+            board = OnlineRanking(k)
+            for n, doc in enumerate(scored, start=1):
+                entered = board.push(doc)
+                expected = top_k_candidates([dict(d) for d in scored[:n]], k=k)
+                assert board.top() == expected
+                assert entered == any(d["anon_id"] == doc["anon_id"] for d in expected)
+            assert board.count == len(scored)
+        board = OnlineRanking(3)
+        assert board.threshold() is None
+        for score in (4.0, 9.0, 1.0, 6.0):
+            board.push({"score": score})
+        assert board.threshold() == 4.0
+        assert [d["score"] for d in board.top(2)] == [9.0, 6.0]
+
+    def test_stages_are_lazy(self):
+        """Only one batch of files should be pulled before the first result."""
+        pulled = []
+
+        def files():
+            for i in range(100):
+                pulled.append(i)
+                yield io.BytesIO(f"Resume {i}: Python and SQL, 3 years experience".encode())
+
+        docs = iter_score(iter_gate(iter_features(iter_anonymize(
+            iter_extract(files(), workers=1, batch_size=4))), None), self.WEIGHTS, batch_size=4)
+        first = next(docs)
+        assert len(pulled) == 4
+        assert first["is_qualified"] and first["breakdown"]["skills"] == 6.0
+
+    def test_iter_ingest_adds_anon_id(self):
+        """Cache-backed ingestion yields anon_ids computed from anonymized text."""
+        docs = list(iter_ingest([io.BytesIO(b"Contact: jane.doe@example.com\nSQL analyst")], workers=1))
+        assert docs[0]["anon_id"] == hashlib.sha256(docs[0]["text"].encode()).hexdigest()[:12]
+        assert "jane.doe@example.com" not in docs[0]["text"]
+
 
 # =============================================================================
 # INTERVIEW QUESTIONS TESTS
@@ -244,6 +704,20 @@ class TestInterviewQuestions:
         assert any("dashboard" in q.lower() or "stakeholder" in q.lower() or "government" in q.lower()
                    for q in questions)
 
+    def test_job_profile_matches_raw_text(self):
+        """A precomputed job profile should yield the same questions as the raw text."""
+        features = {"skills": ["python", "sql"], "years_experience": 2, "education": "B.S."}
+        for job_text in (
+            "Data analyst building dashboards for a State agency",
+            "Business Analyst II: process improvement and requirements",
+            "Contract Specialist for procurement",
+            "Senior role",
+        ):
+            profile = build_job_profile(job_text)
+            assert profile["text_lower"] == job_text.lower()
+            assert (generate_template_questions(features, "", None, job_profile=profile)
+                    == generate_template_questions(features, job_text))
+
 
 # =============================================================================
 # CONTRAST RATIO TESTS
@@ -308,6 +782,21 @@ class TestCSVExport:
         assert "def456" in csv
         assert "10.5" in csv
 
+    def test_csv_quotes_commas(self):
+        """Values containing commas are quoted instead of shifting columns."""
+        scored = [{"anon_id": "abc123", "score": 10.5, "rank": 1, "breakdown": {}}]
+        out = get_logs_csv(scored, {"abc123": "Doe, Jane"})
+        assert out.split("\n")[1].startswith('1,"Doe, Jane",abc123,10.5')
+
+    def test_write_csv_streams_to_binary_buffer(self):
+        """write_csv accepts a BytesIO and leaves it open."""
+        buf = io.BytesIO()
+        rows = ({"rank": i, "anon_id": f"id{i}"} for i in range(1000))
+        assert write_csv(rows, buf, ["rank", "anon_id"]) == 1000
+        assert not buf.closed
+        lines = buf.getvalue().decode().splitlines()
+        assert lines[0] == "rank,anon_id" and lines[-1] == "999,id999"
+
 
 # =============================================================================
 # BIAS AUDIT TESTS
@@ -345,3 +834,148 @@ class TestBiasAudit:
 
         assert "recommendation" in report
         assert "human" in report["recommendation"].lower()
+
+
+# =============================================================================
+# PDF GENERATION TESTS
+# =============================================================================
+
+class TestDecisionPdf:
+    """Tests for memoized decision PDF generation."""
+
+    CANDIDATE = {
+        "anon_id": "a", "rank": 1, "score": 12.5,
+        "breakdown": {"skills": 9.0, "experience": 2.0, "education": 1.0, "certifications": 0.5},
+        "features": {"skills": ["python"], "education": "B.S.", "years_experience": 2},
+    }
+
+    def test_pdf_generated_once_per_key(self, monkeypatch):
+        """Identical summaries should be rendered only once."""
+        calls = []
+        monkeypatch.setattr("utils.generate_decision_pdf", lambda *args: calls.append(args) or b"%PDF")
+        cache = {}
+        assert get_decision_pdf(cache, self.CANDIDATE, "job", "Candidate A") == b"%PDF"
+        assert get_decision_pdf(cache, dict(self.CANDIDATE), "job", "Candidate A") == b"%PDF"
+        assert len(calls) == 1
+
+        get_decision_pdf(cache, {**self.CANDIDATE, "score": 13.0}, "job", "Candidate A")
+        get_decision_pdf(cache, self.CANDIDATE, "other job", "Candidate A")
+        assert len(calls) == 3
+
+    def test_key_tracks_rendered_fields(self):
+        """Rank, breakdown and display name all appear in the PDF."""
+        key = decision_pdf_key(self.CANDIDATE, "job", "Candidate A")
+        assert key == decision_pdf_key(dict(self.CANDIDATE), "job", "Candidate A")
+        assert key != decision_pdf_key({**self.CANDIDATE, "rank": 2}, "job", "Candidate A")
+        assert key != decision_pdf_key(
+            {**self.CANDIDATE, "breakdown": {**self.CANDIDATE["breakdown"], "skills": 6.0}}, "job", "Candidate A")
+        assert key != decision_pdf_key(self.CANDIDATE, "job", "Candidate B")
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """Oldest PDFs are evicted beyond the cache size."""
+        monkeypatch.setattr("utils.generate_decision_pdf", lambda *args: b"%PDF")
+        monkeypatch.setattr("utils.DECISION_PDF_CACHE_SIZE", 2)
+        cache = {}
+        for rank in range(1, 4):
+            get_decision_pdf(cache, {**self.CANDIDATE, "rank": rank}, "job")
+        assert len(cache) == 2
+        assert decision_pdf_key(self.CANDIDATE, "job") not in cache
+
+    def test_filename_is_ranked_and_sanitized(self):
+        assert decision_pdf_filename(self.CANDIDATE, "Candidate A") == "0001_Candidate_A.pdf"
+        assert decision_pdf_filename({"anon_id": "../x y"}) == "x_y.pdf"
+
+    def test_styles_built_once(self):
+        assert pdf_styles() is pdf_styles()
+
+    def test_zip_holds_one_pdf_per_candidate_in_rank_order(self):
+        candidates = [{**self.CANDIDATE, "anon_id": f"id{r}", "rank": r} for r in range(1, 6)]
+        names = {"id1": "Candidate A", "id2": "Candidate B"}
+        out = io.BytesIO()
+        assert write_decision_pdfs_zip(candidates, out, "job", names, workers=1) == 5
+        with zipfile.ZipFile(out) as archive:
+            assert archive.namelist() == ["0001_Candidate_A.pdf", "0002_Candidate_B.pdf",
+                                          "0003_id3.pdf", "0004_id4.pdf", "0005_id5.pdf"]
+            assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+    def test_process_pool_keeps_rank_order(self, monkeypatch, caplog):
+        """Above PDF_PARALLEL_MIN the pool renders PDFs, still yielded in input order."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        pools = []
+
+        def spy(*args, **kwargs):
+            pools.append(kwargs)
+            return ProcessPoolExecutor(*args, **kwargs)
+
+        monkeypatch.setattr("utils.PDF_PARALLEL_MIN", 2)
+        monkeypatch.setattr("utils.ProcessPoolExecutor", spy)
+        candidates = [{**self.CANDIDATE, "anon_id": f"id{r}", "rank": r} for r in (3, 1, 4, 2)]
+        out = io.BytesIO()
+        assert write_decision_pdfs_zip(candidates, out, "job", {"id1": "Candidate A"}, workers=2) == 4
+        assert len(pools) == 1 and pools[0]["initializer"] is pdf_styles
+        assert "falling back" not in caplog.text
+        with zipfile.ZipFile(out) as archive:
+            assert archive.namelist() == ["0003_id3.pdf", "0001_Candidate_A.pdf", "0004_id4.pdf", "0002_id2.pdf"]
+            assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+    def test_process_pool_failure_falls_back_to_serial(self, monkeypatch):
+        def broken(*args, **kwargs):
+            raise OSError("no processes")
+
+        monkeypatch.setattr("utils.PDF_PARALLEL_MIN", 2)
+        monkeypatch.setattr("utils.ProcessPoolExecutor", broken)
+        candidates = [{**self.CANDIDATE, "anon_id": f"id{r}", "rank": r} for r in range(1, 4)]
+        pdfs = list(iter_decision_pdfs(candidates, "job", workers=2))
+        assert [name for name, _ in pdfs] == ["0001_id1.pdf", "0002_id2.pdf", "0003_id3.pdf"]
+        assert all(pdf.startswith(b"%PDF") for _, pdf in pdfs)
+
+    def test_story_reuses_shared_flowables(self):
+        shared = decision_flowables()
+        first = decision_story(self.CANDIDATE, "Candidate A", shared=shared)
+        second = decision_story({**self.CANDIDATE, "anon_id": "b"}, "Candidate B", shared=shared)
+        assert shared["disclaimer"] in first and shared["disclaimer"] in second
+        assert first[0] is not second[0]
+
+    def test_panel_report_from_iterator(self):
+        """One PDF: overview page, then a page per candidate, read from a generator."""
+        pypdf = pytest.importorskip("pypdf")
+        candidates = ({**self.CANDIDATE, "anon_id": f"id{r}", "rank": r, "is_qualified": r != 3,
+                       "gate_results": {"level_name": "II" if r % 2 else ""}} for r in range(1, 4))
+        pdf = generate_panel_report(candidates, "Data Analyst <II> & Co\nDetails", {"id1": "Candidate A"})
+        pages = pypdf.PdfReader(io.BytesIO(pdf)).pages
+        assert len(pages) == 4
+        overview = pages[0].extract_text()
+        assert "Position: Data Analyst <II> & Co" in overview
+        assert "Candidates: 3 (2 qualified)" in overview
+        assert overview.index("Candidate A") < overview.index("id2") < overview.index("id3")
+        assert "No level" in overview
+        assert "Technical ID: id3" in pages[3].extract_text()
+
+    def test_panel_report_streams_its_story(self, monkeypatch):
+        """
+        The story is refilled a chunk at a time through the filterFlowables
+        hook. This relies on SimpleDocTemplate.build consuming the list it is
+        given (as reportlab 4.x and 5.x do): if it stopped doing so, pages
+        would go missing here.
+        """
+        pypdf = pytest.importorskip("pypdf")
+        import utils
+        lengths = []
+        refill_story = utils._refill_story
+
+        def recording(story, chunks):
+            refill = refill_story(story, chunks)
+            return lambda flowables: refill(flowables) or lengths.append(len(story))
+
+        monkeypatch.setattr(utils, "_refill_story", recording)
+        candidates = [{**self.CANDIDATE, "anon_id": f"id{r}", "rank": r} for r in range(1, 61)]
+        pdf = generate_panel_report(iter(candidates))
+        assert len(pypdf.PdfReader(io.BytesIO(pdf)).pages) >= 61
+        per_candidate = len(decision_story(self.CANDIDATE)) + 1
+        assert 0 < max(lengths) <= 2 * per_candidate
+
+    def test_panel_report_writes_to_path(self, tmp_path):
+        path = tmp_path / "panel.pdf"
+        assert generate_panel_report([self.CANDIDATE], out=path) == b""
+        assert path.read_bytes().startswith(b"%PDF")
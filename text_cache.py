@@ -0,0 +1,195 @@
+"""
+text_cache.py — Content-addressed on-disk cache for anonymized resume text
+===========================================================================
+Entries are keyed by the SHA-256 of the raw file bytes plus the pipeline
+version tag (utils.pipeline_version()), so re-screening the same applicant
+pool skips PDF parsing and anonymization entirely.
+
+Responsible AI note: only the anonymized text and extracted features are
+stored. Raw file bytes are hashed, never written.
+
+Concurrency: writes go to a temp file in the target directory and are
+published with os.replace(), so readers in other sessions or processes only
+ever see complete entries. Eviction is best-effort LRU by file mtime; once
+over budget, entries are evicted down to a low-water mark so the next writes
+do not each rescan the directory.
+
+The cache is shared by every session and CLI run on the host. A
+SessionCacheView records the keys one session touched, so that session can
+remove just its own entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "candidatecompass-cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Share of max_bytes left after an over-budget write triggers eviction
+EVICT_LOW_WATER = 0.9
+
+
+class TextCache:
+    """
+    Size-bounded LRU cache of {"text", "features"} entries on local disk.
+
+    Args:
+        directory: Cache root (created if missing)
+        version: Pipeline version tag mixed into every key
+        max_bytes: Evict least recently used entries beyond this total size
+    """
+
+    def __init__(self, directory: Any = DEFAULT_CACHE_DIR, version: str = "", max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.version = version
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._approx_bytes = sum(size for _, size, _ in self._scan())
+
+    @classmethod
+    def from_env(cls, version: str = "") -> Optional["TextCache"]:
+        """
+        Build a cache from CANDIDATECOMPASS_CACHE_DIR / CANDIDATECOMPASS_CACHE_MB.
+        Setting CANDIDATECOMPASS_CACHE_DIR to "off" disables caching (returns None).
+        """
+        directory = os.environ.get("CANDIDATECOMPASS_CACHE_DIR", str(DEFAULT_CACHE_DIR))
+        if directory.lower() in ("off", "none", "0", ""):
+            return None
+        max_mb = int(os.environ.get("CANDIDATECOMPASS_CACHE_MB", DEFAULT_MAX_BYTES // (1024 * 1024)))
+        try:
+            return cls(directory, version=version, max_bytes=max_mb * 1024 * 1024)
+        except OSError as e:
+            logger.warning(f"Text cache disabled: {e}")
+            return None
+
+    def key(self, data: bytes) -> str:
+        """Content address for raw file bytes under the current version tag."""
+        h = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{h}:{self.version}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry or None. A hit refreshes the entry's LRU position."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key[:12]}: {e}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted meanwhile; the entry we read is still valid
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Atomically write an entry, then evict if the cache is over budget."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            size = os.path.getsize(tmp)
+            replaced = self._size(path)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Text cache write failed: {e}")
+            return
+        self._approx_bytes += size - replaced
+        if self._approx_bytes > self.max_bytes:
+            self.evict(int(self.max_bytes * EVICT_LOW_WATER))
+
+    def remove(self, key: str) -> None:
+        """Delete one entry if present."""
+        path = self._path(key)
+        self._approx_bytes -= self._size(path)
+        self._remove(path)
+
+    def evict(self, target: Optional[int] = None) -> None:
+        """Delete least recently used entries until the cache fits in target (default max_bytes)."""
+        target = self.max_bytes if target is None else target
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        self._approx_bytes = total
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._approx_bytes = 0
+
+    def _scan(self):
+        """Yield (path, size, mtime) for every entry on disk."""
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            yield path, st.st_size, st.st_mtime
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SessionCacheView:
+    """
+    A TextCache as seen by one session: reads and writes go to the shared
+    cache, and clear() removes only the entries this session looked up or
+    stored.
+
+    Args:
+        cache: The shared TextCache
+    """
+
+    def __init__(self, cache: TextCache):
+        self.cache = cache
+        self._keys: Set[str] = set()
+
+    def key(self, data: bytes) -> str:
+        return self.cache.key(data)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.cache.get(key)
+        if entry is not None:
+            self._keys.add(key)
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        self._keys.add(key)
+        self.cache.put(key, entry)
+
+    def clear(self) -> None:
+        """Remove this session's entries from the shared cache."""
+        for key in self._keys:
+            self.cache.remove(key)
+        self._keys.clear()
@@ -0,0 +1,203 @@
+"""
+text_store.py — Per-session retention of anonymized resume text
+================================================================
+After feature extraction, duplicate detection and relevance indexing, the
+app only needs a resume's full text again in rare cases (e.g. a screened-out
+resume that must be analyzed for another job). SessionTextStore holds that
+text under a retention policy instead of the candidate dicts:
+
+    keep       plain text in memory (previous behaviour)
+    compress   zlib-compressed in memory, decompressed on access
+    spill      zlib-compressed files in a private temp directory
+    drop       discarded; the caller rehydrates from the source file if it can
+
+Configure the default with CANDIDATECOMPASS_TEXT_RETENTION.
+
+Responsible AI note: only anonymized text is stored. Spilled files live in a
+per-session directory that is deleted on clear() and when the store is
+garbage collected with its session.
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import weakref
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RETENTION_POLICIES = {
+    "keep": "Keep in memory",
+    "compress": "Compress in memory",
+    "spill": "Spill to temp disk",
+    "drop": "Drop after analysis",
+}
+DEFAULT_POLICY = "compress"
+
+
+class SessionTextStore:
+    """
+    Resume text keyed by anon_id, held under a retention policy.
+
+    Args:
+        policy: One of RETENTION_POLICIES
+        directory: Parent directory for spilled text (system temp dir by default)
+    """
+
+    def __init__(self, policy: str = DEFAULT_POLICY, directory: Any = None):
+        if policy not in RETENTION_POLICIES:
+            raise ValueError(f"Unknown retention policy {policy!r}; expected one of {list(RETENTION_POLICIES)}")
+        self.policy = policy
+        self.directory = directory
+        self._memory: Dict[str, Any] = {}  # key -> str ("keep") or zlib bytes
+        self._spilled: Dict[str, Path] = {}
+        self._pinned: set = set()  # keys stored with keep=True
+        self._spill_dir: Optional[Path] = None
+        self._finalizer = None
+
+    @classmethod
+    def from_env(cls) -> "SessionTextStore":
+        """Build a store with the policy from CANDIDATECOMPASS_TEXT_RETENTION."""
+        policy = os.environ.get("CANDIDATECOMPASS_TEXT_RETENTION", DEFAULT_POLICY).lower()
+        if policy not in RETENTION_POLICIES:
+            logger.warning(f"Unknown text retention policy {policy!r}; using {DEFAULT_POLICY!r}")
+            policy = DEFAULT_POLICY
+        return cls(policy)
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._spilled)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or key in self._spilled
+
+    def put(self, key: str, text: str, keep: bool = False) -> None:
+        """
+        Store text under the policy. keep=True retains it (compressed) even
+        under "drop", for text that cannot be recovered from a source file.
+        """
+        self.discard(key)
+        if keep:
+            self._pinned.add(key)
+        if self.policy == "keep":
+            self._memory[key] = text
+        elif self.policy == "spill":
+            if not self._spill(key, zlib.compress(text.encode("utf-8"))):
+                self._memory[key] = zlib.compress(text.encode("utf-8"))
+        elif self.policy == "compress" or keep:
+            self._memory[key] = zlib.compress(text.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        """Rehydrate stored text, or None if it was dropped or never stored."""
+        value = self._memory.get(key)
+        if value is None and key in self._spilled:
+            try:
+                value = self._spilled[key].read_bytes()
+            except OSError as e:
+                logger.warning(f"Spilled resume text for {key} is unreadable: {e}")
+                return None
+        if value is None or isinstance(value, str):
+            return value
+        return zlib.decompress(value).decode("utf-8")
+
+    def discard(self, key: str) -> None:
+        """Forget the text stored under key, if any."""
+        self._memory.pop(key, None)
+        self._pinned.discard(key)
+        path = self._spilled.pop(key, None)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def retain(self, keys: Iterable[str]) -> int:
+        """Discard the text of every key not in keys. Returns how many were discarded."""
+        keep = set(keys)
+        stale = [key for key in list(self._memory) + list(self._spilled) if key not in keep]
+        for key in stale:
+            self.discard(key)
+        return len(stale)
+
+    def set_policy(self, policy: str) -> None:
+        """Switch policy, re-storing every retained text under the new one."""
+        if policy not in RETENTION_POLICIES:
+            raise ValueError(f"Unknown retention policy {policy!r}; expected one of {list(RETENTION_POLICIES)}")
+        if policy == self.policy:
+            return
+        pinned = set(self._pinned)
+        texts = {key: self.get(key) for key in list(self._memory) + list(self._spilled)}
+        self.clear()
+        self.policy = policy
+        for key, text in texts.items():
+            if text is not None:
+                self.put(key, text, keep=key in pinned)
+
+    def clear(self) -> None:
+        """Remove every stored text, including spilled files."""
+        self._memory.clear()
+        self._spilled.clear()
+        self._pinned.clear()
+        if self._finalizer is not None:
+            self._finalizer()  # deletes the spill directory
+            self._finalizer = None
+            self._spill_dir = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Policy, number of stored texts, and bytes held in memory and on disk."""
+        disk_bytes = 0
+        for path in self._spilled.values():
+            try:
+                disk_bytes += path.stat().st_size
+            except OSError:
+                pass
+        return {
+            "policy": self.policy,
+            "documents": len(self),
+            "memory_bytes": sum(sys.getsizeof(v) for v in self._memory.values()),
+            "disk_bytes": disk_bytes,
+        }
+
+    def _spill(self, key: str, data: bytes) -> bool:
+        """Write compressed text to the session's spill directory."""
+        try:
+            if self._spill_dir is None:
+                self._spill_dir = Path(tempfile.mkdtemp(prefix="candidatecompass-text-", dir=self.directory))
+                self._finalizer = weakref.finalize(self, shutil.rmtree, str(self._spill_dir), True)
+            path = self._spill_dir / f"{key}.z"
+            path.write_bytes(data)
+        except OSError as e:
+            logger.warning(f"Could not spill resume text to disk, keeping it in memory: {e}")
+            return False
+        self._spilled[key] = path
+        return True
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximate memory footprint of obj and everything it references
+    (containers, instance attributes, NumPy buffers). Shared objects are
+    counted once.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        # An owning array's getsizeof includes its buffer; a view's does not
+        return sys.getsizeof(obj) + (deep_sizeof(obj.base, seen) if obj.base is not None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
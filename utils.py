@@ -2,25 +2,173 @@
 utils.py — CandidateCompass Utilities
 ======================================
 Navigate Talent, Focus on Mission
-Contains: anonymization, feature extraction, scoring, template questions,
-logging, bias audit, contrast checking, PDF generation.
+Contains: anonymization, feature extraction, scoring, streaming pipeline,
+template questions, logging, bias audit, contrast checking, PDF generation.
 
 Public-sector responsible AI guardrails are applied throughout.
 """
 
 import re
+import copy
+import csv
 import hashlib
 import datetime
+import heapq
 import io
 import json
 import logging
-from collections import Counter
-from typing import Dict, List, Tuple, Any, Optional
+import multiprocessing
+import os
+import zipfile
+from bisect import bisect_right
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, compress, islice
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from audit_log import DEFAULT_SESSION, AuditLogStore
+from bias_audit import AuditAccumulator
 
 # Configure logging for contrast warnings and audit trail
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# =============================================================================
+# PIPELINE VERSIONS
+# =============================================================================
+# Bump the matching tag whenever a change alters extracted text, anonymized
+# output or features. The tags key the on-disk text cache (text_cache.py), so
+# stale entries are never served after a logic change.
+
+EXTRACTOR_VERSION = "1"
+ANONYMIZER_VERSION = "2"
+FEATURES_VERSION = "2"
+
+
+def pipeline_version() -> str:
+    """Version tag covering extraction, anonymization and feature extraction."""
+    try:
+        from pypdf import __version__ as pypdf_version
+    except ImportError:
+        pypdf_version = "none"
+    return f"x{EXTRACTOR_VERSION}-a{ANONYMIZER_VERSION}-f{FEATURES_VERSION}-pypdf{pypdf_version}"
+
+
+# =============================================================================
+# TEXT EXTRACTION
+# =============================================================================
+# PDF parsing is CPU-bound pure Python, so batches are fanned out over a
+# process pool. Workers receive a path or raw bytes and return plain text.
+
+
+def _read_source(source: Any) -> Tuple[str, Any]:
+    """
+    Normalize an extraction source to (name, payload).
+
+    Paths are passed through so worker processes read them directly;
+    file-like objects (e.g. Streamlit UploadedFile) are read into bytes.
+    """
+    if isinstance(source, (str, Path)):
+        return str(source), str(source)
+    name = getattr(source, "name", "") or ""
+    if hasattr(source, "getvalue"):
+        return name, source.getvalue()
+    return name, source.read()
+
+
+def extract_text_from_bytes(data: bytes, name: str = "") -> str:
+    """
+    Extract text from raw PDF or TXT bytes.
+    PDFs are detected by their magic header, falling back to the file extension.
+    Raises on unreadable PDFs so callers can report the failure.
+    """
+    return "\n".join(iter_pages(data, name))
+
+
+def iter_pages(data: bytes, name: str = "") -> Iterator[str]:
+    """
+    Yield the text of each page of raw PDF bytes, extracting lazily so a
+    consumer can stop early. TXT files are a single page.
+    """
+    if data[:5] == b"%PDF-" or name.lower().endswith(".pdf"):
+        from pypdf import PdfReader
+        reader = PdfReader(io.BytesIO(data))
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    else:
+        yield data.decode(errors="ignore")
+
+
+def _extract_one(item: Tuple[str, Any]) -> Tuple[str, Optional[str]]:
+    """Worker entry point. Returns (text, error) and never raises."""
+    name, payload = item
+    try:
+        if isinstance(payload, str):
+            with open(payload, "rb") as f:
+                payload = f.read()
+        return extract_text_from_bytes(payload, name), None
+    except Exception as e:
+        return "", f"{type(e).__name__}: {e}"
+
+
+def _screen_one(item: Tuple[str, Any], job_info: Dict) -> Tuple[str, Optional[str], Optional[Tuple[List[str], bool]]]:
+    """Worker entry point for screening mode: (text, error, screen_pages rejection or None)."""
+    name, payload = item
+    try:
+        if isinstance(payload, str):
+            with open(payload, "rb") as f:
+                payload = f.read()
+        text, rejection = screen_pages(iter_pages(payload, name), job_info)
+        return text, None, rejection
+    except Exception as e:
+        return "", f"{type(e).__name__}: {e}", None
+
+
+def _extract_items(items: List[Tuple[str, Any]], workers: Optional[int] = None,
+                   extract_one: Callable = _extract_one) -> List[Tuple]:
+    """Run extract_one (default _extract_one) over normalized items, in parallel when worthwhile."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(items)))
+
+    results = None
+    if workers > 1:
+        try:
+            # spawn avoids forking the (multi-threaded) Streamlit server process
+            ctx = multiprocessing.get_context("spawn")
+            chunksize = max(1, len(items) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                results = list(pool.map(extract_one, items, chunksize=chunksize))
+        except Exception as e:
+            logger.warning(f"Parallel extraction unavailable ({e}); falling back to serial.")
+    if results is None:
+        results = [extract_one(item) for item in items]
+    return results
+
+
+def extract_texts(files: List[Any], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Extract text from a batch of files in parallel.
+
+    Args:
+        files: Paths or file-like objects (PDF or TXT)
+        workers: Number of worker processes (default: CPU count). 1 runs in-process.
+
+    Returns:
+        List of {"name", "text", "error"} dicts in input order. A file that
+        fails to parse gets an empty text and an error message; the rest of
+        the batch is unaffected.
+    """
+    items = [_read_source(f) for f in files]
+    return [
+        {"name": name, "text": text, "error": error}
+        for (name, _), (text, error) in zip(items, _extract_items(items, workers))
+    ]
+
+
 # =============================================================================
 # PII ANONYMIZATION
 # =============================================================================
@@ -34,49 +182,126 @@ NAME_RE = re.compile(r"(Name:\s*)([A-Z][a-z]+(?:\s[A-Z][a-z]+)*)")
 DATE_RE = re.compile(r"\b(?:0?[1-9]|1[0-2])[/-](?:0?[1-9]|[12]\d|3[01])[/-](?:19|20)\d{2}\b")
 
 
+# Ordered by redaction priority. When matches of two classes overlap, the
+# earlier class wins (e.g. an SSN is never redacted as a phone number).
+# Entries: (class, pattern, placeholder, mapping policy). The mapping keeps the
+# first SSN but the last e-mail/phone seen, as the original per-class loops did.
+PII_RULES = [
+    ("ssn", SSN_RE, "[SSN_REDACTED]", "first"),
+    ("email", EMAIL_RE, "[EMAIL_REDACTED]", "last"),
+    ("phone", PHONE_RE, "[PHONE_REDACTED]", "last"),
+    ("addr", ADDR_RE, "[ADDR_REDACTED]", None),
+    ("name", NAME_RE, None, None),  # Keeps the "Name:" label
+]
+
+# All classes in one pattern. Each branch matches exactly what its class
+# pattern matches; they are rewritten so the engine can skip non-candidate
+# positions cheaply: the leading guard only admits digits, "+", "N" (Name:)
+# or the start of an e-mail local part that reaches an "@". The local part
+# and domain classes exclude the "@" and "." that follow them, so plain "+"
+# never backtracks into a different match (no possessive "++": Python 3.8+).
+_LOCAL = "a-zA-Z0-9_.+-"
+_PII_RE = re.compile(
+    rf"(?=[\d+N]|(?<![{_LOCAL}])[{_LOCAL}]+@)"
+    rf"(?:(?P<ssn>(?<!\w)\d{{3}}[-\s]?\d{{2}}[-\s]?\d{{4}}\b)"
+    rf"|(?P<email>[{_LOCAL}]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
+    rf"|(?P<phone>{PHONE_RE.pattern})"
+    rf"|(?P<addr>(?i:{ADDR_RE.pattern}))"
+    rf"|(?P<name>{NAME_RE.pattern}))"
+)
+
+# How far past the end of a lower-priority match a higher-priority match
+# that starts inside it may need to run before it can be recognized.
+# An e-mail's "@" must also fall within 64 characters (max local part).
+_PII_REACH = {"ssn": 12, "email": 320, "phone": 10, "addr": 96}
+
+
+# Name matches hold only letters, so of the classes above them only an
+# e-mail (the others start with a digit or "+") can begin inside one.
+_PII_CAN_OVERLAP = {"name": {"email"}}
+
+# An address must end at a word boundary, which the old loops checked after
+# the classes above it had been replaced. So "12 Main Street555-123-4567"
+# holds an address once the text is cut where the phone number starts.
+_ADDR_CUT_BY = {"ssn", "email", "phone"}
+_ADDR_TAIL_RE = re.compile(r"(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way|Court|Ct)\Z",
+                           re.IGNORECASE)
+
+# Per class: (placeholder, mapping policy, [(higher class, pattern, reach), ...])
+_PII_PLAN = {
+    kind: (placeholder, policy, [
+        (h, hp, _PII_REACH[h]) for h, hp, _, _ in PII_RULES[:i]
+        if h in _PII_CAN_OVERLAP.get(kind, {h})
+    ])
+    for i, (kind, _, placeholder, policy) in enumerate(PII_RULES)
+}
+
+
+def _scan_pii(text: str, pos: int, endpos: int, pieces: List[str], mapping: Dict[str, str]) -> None:
+    """Append redacted text[pos:endpos] to pieces, recording PII in mapping."""
+    while True:
+        # The old loops saw an earlier match as its placeholder, so an e-mail
+        # may start right where the previous match ended even though the
+        # look-behind in _PII_RE sees a local-part character there.
+        m = pos and EMAIL_RE.match(text, pos, endpos)
+        kind = "email"
+        if not m:
+            m = _PII_RE.search(text, pos, endpos)
+            if m is None:
+                break
+            kind = m.lastgroup
+        winner = m
+        # A higher-priority match starting inside this one takes precedence,
+        # and so on until no higher class starts inside the winner
+        checked = False
+        while not checked:
+            checked = True
+            start, end = winner.span()
+            for higher, pattern, reach in _PII_PLAN[kind][2]:
+                if higher == "email" and text.find("@", start, min(endpos, end + 64)) < 0:
+                    continue
+                hm = pattern.search(text, start, min(endpos, end + reach))
+                if hm is not None and hm.start() < end:
+                    hm = pattern.match(text, hm.start(), endpos)  # Re-match without the window cut-off
+                    if hm is not None:
+                        kind, winner, checked = higher, hm, False
+                        break
+        if winner is m and not (kind in _ADDR_CUT_BY and
+                                _ADDR_TAIL_RE.search(text, max(pos, winner.start() - 9), winner.start())):
+            pieces.append(text[pos:winner.start()])
+        else:
+            # Lower-priority classes still apply left of the winning match
+            _scan_pii(text, pos, winner.start(), pieces, mapping)
+        matched = winner.group()
+        placeholder, policy, _ = _PII_PLAN[kind]
+        if placeholder is None:
+            pieces.append(NAME_RE.sub(r"\1[NAME_REDACTED]", matched))
+        else:
+            pieces.append(placeholder)
+            if policy == "last" or (policy == "first" and placeholder not in mapping):
+                mapping[placeholder] = matched
+        pos = winner.end()
+    pieces.append(text[pos:endpos])
+
+
 def anonymize_text(text: str) -> Tuple[str, Dict[str, str]]:
     """
     Anonymize PII in text. Returns (anonymized_text, mapping).
 
+    All PII classes are detected in one combined scan and the output is
+    built with a single join (see PII_RULES for the priority order).
+
     The mapping is kept in-memory only and should NOT be persisted.
     This is critical for public-sector responsible AI compliance.
     """
-    t = text
-    mapping = {}
-
-    # SSNs (high priority - must redact)
-    for m in SSN_RE.findall(t):
-        placeholder = "[SSN_REDACTED]"
-        mapping[placeholder] = mapping.get(placeholder, [])
-        if isinstance(mapping[placeholder], list):
-            mapping[placeholder] = m
-        t = t.replace(m, placeholder)
-
-    # Emails
-    for m in EMAIL_RE.findall(t):
-        placeholder = "[EMAIL_REDACTED]"
-        mapping[placeholder] = m
-        t = t.replace(m, placeholder)
-
-    # Phones
-    for m in PHONE_RE.findall(t):
-        placeholder = "[PHONE_REDACTED]"
-        mapping[placeholder] = m
-        t = t.replace(m, placeholder)
-
-    # Addresses
-    for m in ADDR_RE.findall(t):
-        placeholder = "[ADDR_REDACTED]"
-        t = t.replace(m, placeholder)
-
-    # Names (best effort - pattern-based)
-    t = NAME_RE.sub(r"\1[NAME_REDACTED]", t)
+    pieces: List[str] = []
+    mapping: Dict[str, str] = {}
+    _scan_pii(text, 0, len(text), pieces, mapping)
 
     # Dates of birth patterns (optional, be careful not to remove job dates)
-    # Keeping this commented as it may over-redact
-    # t = DATE_RE.sub("[DATE_REDACTED]", t)
+    # Keeping DATE_RE out of PII_RULES as it may over-redact
 
-    return t, mapping
+    return "".join(pieces), mapping
 
 
 # =============================================================================
@@ -116,6 +341,91 @@ CERTIFICATION_KEYWORDS = [
     "certified government auditing professional", "cgap"
 ]
 
+# Keywords are matched on whole [a-z0-9] tokens, so "r" never fires inside
+# "their" and "sas" never inside "kansas". Tokens of a multi-word keyword may be
+# separated by whitespace or hyphens ("power bi", "scikit-learn", "power-bi").
+_KEYWORD_SPLIT_RE = re.compile(r"([a-z0-9]+)")
+_KEYWORD_JOINERS = frozenset(" \t\r\n\f\v-")
+
+
+def build_keyword_automaton(keywords: List[str]) -> Tuple[List[Dict[str, int]], List[int], List[List[Tuple[str, int]]], frozenset]:
+    """
+    Build an Aho-Corasick automaton over keyword tokens.
+
+    Returns:
+        Tuple of (goto, fail, output, vocabulary). The first three are indexed
+        by state; output[state] lists (keyword, token_count) for every keyword
+        ending in that state, including those inherited through failure links.
+        vocabulary holds every token that occurs in a keyword.
+    """
+    goto: List[Dict[str, int]] = [{}]
+    output: List[List[Tuple[str, int]]] = [[]]
+    for keyword in keywords:
+        tokens = re.findall(r"[a-z0-9]+", keyword.lower())
+        state = 0
+        for tok in tokens:
+            if tok not in goto[state]:
+                goto.append({})
+                output.append([])
+                goto[state][tok] = len(goto) - 1
+            state = goto[state][tok]
+        if (keyword, len(tokens)) not in output[state]:
+            output[state].append((keyword, len(tokens)))
+
+    # Breadth-first failure links: the longest proper token suffix that is also a prefix
+    fail = [0] * len(goto)
+    queue = list(goto[0].values())
+    for state in queue:
+        for tok, nxt in goto[state].items():
+            queue.append(nxt)
+            if state == 0:
+                continue  # Depth-1 states fail to the root
+            f = fail[state]
+            while f and tok not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(tok, 0)
+            output[nxt] = output[nxt] + output[fail[nxt]]
+    vocabulary = frozenset(tok for edges in goto for tok in edges)
+    return goto, fail, output, vocabulary
+
+
+def find_keywords(text_l: str, automaton: Tuple = None) -> List[Tuple[int, str]]:
+    """
+    Find every keyword hit in lowercased text in a single pass.
+
+    Returns:
+        List of (offset, keyword) in order of where each hit ends; overlapping
+        hits ("aws" and "aws certified") are all reported.
+    """
+    goto, fail, output, vocabulary = automaton or _KEYWORD_AUTOMATON
+    # parts alternates separator, token, separator, ...; ends[i] is the end offset of parts[i]
+    parts = _KEYWORD_SPLIT_RE.split(text_l)
+    ends = None
+    hits = []
+    state = 0
+    prev = -1
+    # Only tokens that occur in some keyword can move the automaton off the root
+    for i in compress(range(1, len(parts), 2), map(vocabulary.__contains__, islice(parts, 1, None, 2))):
+        tok = parts[i]
+        if state:
+            if i != prev + 2 or not _KEYWORD_JOINERS.issuperset(parts[i - 1]):
+                state = 0  # An unknown token or punctuation ends any keyword in progress
+            while state and tok not in goto[state]:
+                state = fail[state]
+        state = goto[state].get(tok, 0)
+        prev = i
+        if output[state]:
+            if ends is None:
+                ends = list(accumulate(map(len, parts)))
+            for keyword, n_tokens in output[state]:
+                first = i - 2 * (n_tokens - 1)
+                hits.append((ends[first] - len(parts[first]), keyword))
+    return hits
+
+
+# Built once at import
+_KEYWORD_AUTOMATON = build_keyword_automaton(SKILL_KEYWORDS + CERTIFICATION_KEYWORDS)
+
 
 def extract_features(text: str) -> Dict[str, Any]:
     """
@@ -124,11 +434,13 @@ def extract_features(text: str) -> Dict[str, Any]:
     """
     text_l = text.lower()
 
-    # Skills detection
-    skills = [k for k in SKILL_KEYWORDS if k in text_l]
-
-    # Certifications detection
-    certs = [c for c in CERTIFICATION_KEYWORDS if c in text_l]
+    # Skills and certifications detection: first offset of each keyword
+    first_hit: Dict[str, int] = {}
+    for offset, keyword in find_keywords(text_l):
+        if offset < first_hit.get(keyword, len(text_l)):
+            first_hit[keyword] = offset
+    skills = [k for k in SKILL_KEYWORDS if k in first_hit]
+    certs = [c for c in CERTIFICATION_KEYWORDS if c in first_hit]
 
     # Years of experience: find patterns like 'X years' or 'X+ years'
     yrs = 0
@@ -158,12 +470,11 @@ def extract_features(text: str) -> Dict[str, Any]:
     # Evidence lines: capture context around skill mentions
     evidence = {}
     for s in skills[:5]:  # Limit to top 5 to avoid excessive evidence
-        idx = text_l.find(s)
-        if idx >= 0:
-            start = max(0, idx - 60)
-            end = min(len(text), idx + len(s) + 100)
-            snippet = text[start:end].strip().replace("\n", " ")
-            evidence[s] = snippet
+        idx = first_hit[s]
+        start = max(0, idx - 60)
+        end = min(len(text), idx + len(s) + 100)
+        snippet = text[start:end].strip().replace("\n", " ")
+        evidence[s] = snippet
 
     return {
         "skills": skills,
@@ -175,6 +486,70 @@ def extract_features(text: str) -> Dict[str, Any]:
     }
 
 
+# =============================================================================
+# RESUME INGESTION
+# =============================================================================
+
+def ingest_resumes(files: List[Any], workers: Optional[int] = None, cache: Any = None,
+                   screen_job: Optional[Dict] = None) -> List[Dict[str, Any]]:
+    """
+    Extract, anonymize and featurize a batch of resumes.
+
+    Args:
+        files: Paths or file-like objects (PDF or TXT)
+        workers: Worker processes for extraction (see extract_texts)
+        cache: Optional text_cache.TextCache. Hits skip extraction entirely;
+               only anonymized text and features are ever written to it.
+        screen_job: Screening mode. Resumes missing one of this job's
+               required skills (see screen_pages) are not featurized: their
+               entry has features None and "screened_out" holding the
+               (is_qualified, gate_results) that rejects them.
+
+    Returns:
+        List of {"name", "text", "features", "error"} dicts in input order,
+        where "text" is already anonymized.
+    """
+    items = [_read_source(f) for f in files]
+    entries: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    keys: List[Optional[str]] = [None] * len(items)
+
+    if cache is not None:
+        for i, (name, payload) in enumerate(items):
+            try:
+                if isinstance(payload, str):
+                    with open(payload, "rb") as f:
+                        payload = f.read()
+                    # Keep the bytes so a cache miss is not read from disk twice
+                    items[i] = (name, payload)
+                keys[i] = cache.key(payload)
+            except OSError:
+                continue  # Unreadable: let extraction report the error
+            hit = cache.get(keys[i])
+            if hit is not None:
+                entries[i] = {"name": name, "text": hit["text"], "features": hit["features"], "error": None}
+
+    misses = [i for i, e in enumerate(entries) if e is None]
+    extract_one = partial(_screen_one, job_info=screen_job) if screen_job else _extract_one
+    results = _extract_items([items[i] for i in misses], workers, extract_one) if misses else []
+    for i, (text, error, *screen) in zip(misses, results):
+        anon_text, _ = anonymize_text(text)
+        if screen and screen[0] is not None:
+            # Re-check the anonymized text so the reason reads exactly as
+            # gate_candidate's would (redaction can only remove keywords)
+            _, rejection = screen_pages([anon_text], screen_job)
+            if rejection is not None:
+                # Screened out: recorded with its gate reason, never featurized or cached
+                entries[i] = {"name": items[i][0], "text": anon_text, "features": None, "error": error,
+                              "screened_out": screen_gate_results(gate_plan_for(screen_job), *rejection)}
+                continue
+        features = extract_features(anon_text) if anon_text else None
+        entries[i] = {"name": items[i][0], "text": anon_text, "features": features, "error": error}
+        if cache is not None and keys[i] is not None and error is None:
+            cache.put(keys[i], {"text": anon_text, "features": features})
+
+    return entries
+
+
 # =============================================================================
 # SCORING
 # =============================================================================
@@ -211,9 +586,94 @@ def score_candidate(features: Dict[str, Any], weights: Dict[str, float]) -> Tupl
     breakdown["certifications"] = round(score_certs, 2)
     score += score_certs
 
+    # Relevance score (BM25 match against the job text, 0-10; see relevance.py)
+    score_rel = weights.get("relevance", 0.0) * min(features.get("relevance", 0), 10)
+    breakdown["relevance"] = round(score_rel, 2)
+    score += score_rel
+
     return round(score, 2), breakdown
 
 
+# Columnar scoring: one row per candidate, one column per score category, with
+# the same caps as score_candidate. Re-ranking a large pool when the weights
+# change is then a few array operations instead of a Python loop.
+SCORE_COLUMNS = ("skills", "experience", "education", "certifications", "relevance")
+_SCORE_DEFAULT_WEIGHTS = {"skills": 1.0, "experience": 1.0, "education": 0.0, "certifications": 0.0,
+                          "relevance": 0.0}
+
+
+def build_feature_matrix(features_list: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Build the (n_candidates, len(SCORE_COLUMNS)) matrix of capped feature values.
+
+    Columns: skill count (max 10), years of experience (max 15), education
+    level, certification count (max 5), job relevance (max 10).
+    """
+    rows = [
+        (
+            min(len(f.get("skills", [])), 10),
+            min(f.get("years_experience", 0), 15),
+            f.get("education_level", 0),
+            min(len(f.get("certifications", [])), 5),
+            min(f.get("relevance", 0), 10),
+        )
+        for f in (f or {} for f in features_list)
+    ]
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(SCORE_COLUMNS))
+
+
+def score_matrix(matrix: np.ndarray, weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every row of a feature matrix.
+
+    Returns:
+        (totals, parts): unrounded total per candidate and the per-category
+        weighted values. Totals are accumulated column by column in
+        SCORE_COLUMNS order, so they are bit-identical to score_candidate.
+    """
+    w = np.array([weights.get(k, _SCORE_DEFAULT_WEIGHTS[k]) for k in SCORE_COLUMNS], dtype=np.float64)
+    parts = matrix * w
+    totals = np.zeros(len(matrix), dtype=np.float64)
+    for j in range(len(SCORE_COLUMNS)):
+        totals += parts[:, j]
+    return totals, parts
+
+
+def round_scores(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized round(x, 2) that returns exactly what Python's round() would.
+
+    rint(x * 100) / 100 picks the same hundredth as round() unless x * 100
+    lies within rounding error of a .5 boundary; those few values fall back
+    to round() itself.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100
+    out = np.rint(scaled) / 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    for idx in zip(*np.nonzero(near_tie)):
+        out[idx] = round(float(values[idx]), 2)
+    return out
+
+
+def rank_scores(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """
+    Return row indices ordered by descending score, ties kept in input order.
+
+    With top_k, only the best top_k rows are returned; argpartition narrows the
+    pool first so the full array is never sorted.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    candidates = np.arange(len(scores))
+    if top_k is not None and top_k < len(scores):
+        if top_k <= 0:
+            return candidates[:0]
+        kth = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        candidates = np.flatnonzero(scores >= kth)
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order if top_k is None else order[:top_k]
+
+
 # =============================================================================
 # LEVEL MATCHING & QUALIFICATION GATING
 # =============================================================================
@@ -232,13 +692,18 @@ def detect_qualification_level(years_experience: int, level_thresholds: List[int
     Example:
         detect_qualification_level(2, [0, 1, 2, 3, 4]) -> 2 (qualifies for level III)
     """
-    qualified_level = 0
-    for i, threshold in enumerate(level_thresholds):
-        if years_experience >= threshold:
-            qualified_level = i
-        else:
-            break
-    return qualified_level
+    # Levels are climbed in order until a threshold is not met, so search the
+    # running maximum (sorted even if the thresholds are not)
+    return max(0, bisect_right(list(accumulate(level_thresholds, max)), years_experience) - 1)
+
+
+# Education requirement text -> (degree label, minimum education_level,
+# years of experience that substitute for the degree)
+EDUCATION_RULES = {
+    "Bachelor's": ("Bachelor's", 1, 4),
+    "Bachelor's or equivalent experience": ("Bachelor's", 1, 4),
+    "Master's": ("Master's", 2, 6),  # Master's typically = 6 years (4 + 2)
+}
 
 
 def check_education_requirement(features: Dict, requirement: str = "Bachelor's") -> Tuple[bool, str]:
@@ -259,26 +724,18 @@ def check_education_requirement(features: Dict, requirement: str = "Bachelor's")
     edu_level = features.get("education_level", 0)
     years_exp = features.get("years_experience", 0)
 
-    # Direct match
-    if requirement == "Bachelor's" or requirement == "Bachelor's or equivalent experience":
-        if edu_level >= 1:  # Has Bachelor's, Master's, or Ph.D.
-            return True, f"Has {edu}"
-        elif years_exp >= 4:
-            return True, f"Meets requirement via work experience substitution ({years_exp} years)"
-        else:
-            return False, f"Needs Bachelor's OR 4+ years experience (has {years_exp} years)"
-
-    elif requirement == "Master's":
-        if edu_level >= 2:
-            return True, f"Has {edu}"
-        elif years_exp >= 6:  # Master's typically = 6 years (4 + 2)
-            return True, f"Meets requirement via work experience substitution ({years_exp} years)"
-        else:
-            return False, f"Needs Master's OR 6+ years experience (has {years_exp} years)"
-
-    else:  # No specific requirement or "Other"
+    rule = EDUCATION_RULES.get(requirement)
+    if rule is None:  # No specific requirement or "Other"
         return True, "No specific education requirement"
 
+    label, min_level, substitute_years = rule
+    if edu_level >= min_level:
+        return True, f"Has {edu}"
+    elif years_exp >= substitute_years:
+        return True, f"Meets requirement via work experience substitution ({years_exp} years)"
+    else:
+        return False, f"Needs {label} OR {substitute_years}+ years experience (has {years_exp} years)"
+
 
 def check_mandatory_skills(candidate_skills: List[str], required_skills: List[str]) -> Tuple[bool, List[str]]:
     """
@@ -302,16 +759,70 @@ def check_mandatory_skills(candidate_skills: List[str], required_skills: List[st
     return len(missing) == 0, missing
 
 
-def gate_candidate(features: Dict, job_info: Dict) -> Tuple[bool, Dict[str, Any]]:
+# Job requirements are compiled once into a gate plan. A required skill matches
+# any candidate skill containing it (as in check_mandatory_skills), so each
+# requirement resolves to the set of vocabulary IDs it matches; candidates are
+# then gated by set/bitmask intersection (see feature_store.CandidateStore.
+# apply_gates for the vectorized form over a whole pool).
+_GATE_PLANS: Dict[int, Tuple[Dict, Dict[str, Any]]] = {}
+
+
+def compile_gate_plan(job_info: Dict, vocab: List[str] = SKILL_KEYWORDS) -> Dict[str, Any]:
     """
-    Apply mandatory qualification gates before scoring.
+    Compile a job's gates against a skill vocabulary.
+
+    Returns dict with:
+        required: [(skill, frozenset of vocab IDs)] or None if not gated
+        any_of: (skills, frozenset of vocab IDs) or None
+        education: requirement text or None
+        level_maxima: running maximum of the level thresholds, or None
+        levels: level names
+    """
+    vocab_lower = [v.lower() for v in vocab]
 
-    Args:
-        features: Candidate features
-        job_info: Job information with requirements (from JOB_LIBRARY)
+    def matches(req: str) -> frozenset:
+        req = req.lower()
+        return frozenset(i for i, v in enumerate(vocab_lower) if req in v)
 
-    Returns:
-        (is_qualified: bool, gate_results: Dict)
+    has_levels = "levels" in job_info and "experience_required" in job_info
+    return {
+        "vocab_lower": vocab_lower,
+        "vocab_index": {v: i for i, v in enumerate(vocab_lower)},
+        "required": [(req, matches(req)) for req in job_info["required_skills"]]
+        if "required_skills" in job_info else None,
+        "any_of": (job_info["required_any_of"], frozenset().union(*map(matches, job_info["required_any_of"])))
+        if "required_any_of" in job_info else None,
+        "education": job_info["required_education"] if "required_education" in job_info else None,
+        "level_maxima": list(accumulate(job_info["experience_required"], max)) if has_levels else None,
+        "levels": job_info.get("levels", []),
+    }
+
+
+def gate_plan_for(job_info: Dict) -> Dict[str, Any]:
+    """
+    Compiled plan for job_info over SKILL_KEYWORDS. Cached per job dict and
+    recompiled if the dict's contents have changed since.
+    """
+    cached = _GATE_PLANS.get(id(job_info))
+    if cached is None or cached[0] != job_info:
+        if len(_GATE_PLANS) >= 32:
+            _GATE_PLANS.clear()
+        cached = _GATE_PLANS[id(job_info)] = (copy.deepcopy(job_info), compile_gate_plan(job_info))
+    return cached[1]
+
+
+def gate_results_from_checks(plan: Dict[str, Any], features: Dict, missing: List[str], has_any: bool,
+                             level_idx: int) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Assemble gate_candidate's (is_qualified, gate_results) from evaluated
+    checks, so scalar and vectorized gating report identical messages.
+
+    Args:
+        plan: Gate plan (compile_gate_plan)
+        features: Needs education, education_level and years_experience
+        missing: Required skills the candidate lacks
+        has_any: Whether an "any of" skill is present
+        level_idx: Qualified level index (ignored if the job has no levels)
     """
     gate_results = {
         "education_check": {"passed": True, "message": ""},
@@ -321,46 +832,29 @@ def gate_candidate(features: Dict, job_info: Dict) -> Tuple[bool, Dict[str, Any]
     }
 
     # Check education requirement
-    if "required_education" in job_info:
-        edu_passed, edu_msg = check_education_requirement(features, job_info["required_education"])
+    if plan["education"] is not None:
+        edu_passed, edu_msg = check_education_requirement(features, plan["education"])
         gate_results["education_check"] = {"passed": edu_passed, "message": edu_msg}
 
     # Check mandatory skills (must have ALL of these)
-    if "required_skills" in job_info:
-        skills_passed, missing = check_mandatory_skills(
-            features.get("skills", []),
-            job_info["required_skills"]
-        )
+    if plan["required"] is not None:
         gate_results["skills_check"] = {
-            "passed": skills_passed,
+            "passed": not missing,
             "message": f"Missing required skills: {', '.join(missing)}" if missing else "All required skills present"
         }
 
     # Check "any of" skills (must have AT LEAST ONE)
-    if "required_any_of" in job_info:
-        candidate_skills_lower = [s.lower() for s in features.get("skills", [])]
-        required_any = job_info["required_any_of"]
-
-        # Check if candidate has at least one of the required tools
-        has_any = any(
-            any(req.lower() in cs for cs in candidate_skills_lower)
-            for req in required_any
-        )
-
-        if not has_any:
-            gate_results["skills_check"] = {
-                "passed": False,
-                "message": f"Missing required tools: Must have at least one of: {', '.join(required_any)}"
-            }
+    if plan["any_of"] is not None and not has_any:
+        gate_results["skills_check"] = {
+            "passed": False,
+            "message": f"Missing required tools: Must have at least one of: {', '.join(plan['any_of'][0])}"
+        }
 
     # Determine qualification level
-    if "levels" in job_info and "experience_required" in job_info:
-        level_idx = detect_qualification_level(
-            features.get("years_experience", 0),
-            job_info["experience_required"]
-        )
+    if plan["level_maxima"] is not None:
+        levels = plan["levels"]
         gate_results["level_qualified"] = level_idx
-        gate_results["level_name"] = job_info["levels"][level_idx] if level_idx < len(job_info["levels"]) else "Unknown"
+        gate_results["level_name"] = levels[level_idx] if level_idx < len(levels) else "Unknown"
 
     # Overall qualification = pass all gates
     is_qualified = (
@@ -371,43 +865,348 @@ def gate_candidate(features: Dict, job_info: Dict) -> Tuple[bool, Dict[str, Any]
     return is_qualified, gate_results
 
 
+def gate_candidate(features: Dict, job_info: Dict) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Apply mandatory qualification gates before scoring.
+
+    Args:
+        features: Candidate features
+        job_info: Job information with requirements (from JOB_LIBRARY)
+
+    Returns:
+        (is_qualified: bool, gate_results: Dict)
+    """
+    plan = gate_plan_for(job_info)
+
+    # Candidate skills as vocabulary IDs; anything else is matched by substring
+    index = plan["vocab_index"]
+    ids, other = set(), []
+    for skill in features.get("skills", []):
+        skill = skill.lower()
+        i = index.get(skill)
+        if i is None:
+            other.append(skill)
+        else:
+            ids.add(i)
+
+    def has(req: str, req_ids: frozenset) -> bool:
+        return not req_ids.isdisjoint(ids) or any(req.lower() in s for s in other)
+
+    missing = [req for req, req_ids in plan["required"] or () if not has(req, req_ids)]
+    has_any = plan["any_of"] is None or not plan["any_of"][1].isdisjoint(ids) or any(
+        req.lower() in s for req in plan["any_of"][0] for s in other)
+    level_idx = 0
+    if plan["level_maxima"] is not None:
+        level_idx = max(0, bisect_right(plan["level_maxima"], features.get("years_experience", 0)) - 1)
+
+    return gate_results_from_checks(plan, features, missing, has_any, level_idx)
+
+
+# Early-reject screening: a cheap required-skill scan of the raw text, page by
+# page, before anonymization and feature extraction. The scan uses the same
+# keyword automaton as extract_features on a superset of the text, so it never
+# rejects a resume that gate_candidate would pass on skills.
+_SCREEN_OVERLAP = 96  # Characters carried across pages for keywords split by a page break
+
+
+def screen_pages(pages: Iterable[str], job_info: Dict) -> Tuple[str, Optional[Tuple[List[str], bool]]]:
+    """
+    Scan page texts for job_info's required skills, stopping the scan at the
+    first page where every skill gate is met. All pages are still consumed.
+
+    Returns:
+        (text, rejection): the pages joined as extract_text_from_bytes does,
+        and None if the skill gates can pass, else (missing required skills,
+        has an "any of" skill) as gate_results_from_checks expects.
+    """
+    plan = gate_plan_for(job_info)
+    required = plan["required"] or []
+    any_ids = plan["any_of"][1] if plan["any_of"] is not None else None
+    index = plan["vocab_index"]
+
+    texts, found, tail, satisfied = [], set(), "", False
+    for page in pages:
+        texts.append(page)
+        if satisfied:
+            continue
+        chunk = (tail + "\n" if texts[1:] else "") + page.lower()
+        found.update(i for i in (index.get(keyword) for _, keyword in find_keywords(chunk)) if i is not None)
+        satisfied = (all(not ids.isdisjoint(found) for _, ids in required)
+                     and (any_ids is None or not any_ids.isdisjoint(found)))
+        tail = chunk[-_SCREEN_OVERLAP:]
+
+    text = "\n".join(texts)
+    if satisfied:
+        return text, None
+    missing = [req for req, ids in required if ids.isdisjoint(found)]
+    return text, (missing, any_ids is None or not any_ids.isdisjoint(found))
+
+
+def screen_gate_results(plan: Dict[str, Any], missing: List[str], has_any: bool) -> Tuple[bool, Dict[str, Any]]:
+    """
+    (is_qualified, gate_results) for a screened-out resume: the skills check
+    reads as gate_candidate's would; education and level were not evaluated.
+    """
+    _, gate_results = gate_results_from_checks(plan, {}, missing, has_any, 0)
+    gate_results["education_check"] = {"passed": True, "message": "Not checked (screened out on required skills)"}
+    gate_results["level_name"] = ""
+    gate_results["screened_out"] = True
+    return False, gate_results
+
+
 def score_candidates(candidates: List[Dict], weights: Dict[str, float]) -> List[Dict]:
     """
     Score and rank all candidates. Returns sorted list (highest score first).
+    Thin wrapper over the columnar path (build_feature_matrix, score_matrix,
+    rank_scores); results match score_candidate per candidate.
+    """
+    features_list = [c.get("features") or {} for c in candidates]
+    return rank_from_matrix(candidates, build_feature_matrix(features_list), weights)
+
+
+def rank_from_matrix(candidates: List[Dict], matrix: np.ndarray, weights: Dict[str, float]) -> List[Dict]:
+    """
+    Rank candidates against a precomputed feature matrix (row i = candidates[i]).
+
+    Only the weighting and ordering are recomputed, so callers that keep the
+    matrix can re-rank when the weights change without touching features or
+    gating. Ties keep input order.
     """
+    totals, parts = score_matrix(matrix, weights)
+    totals = round_scores(totals)
+    scores = totals.tolist()
+    parts = round_scores(parts).tolist()
+
     out = []
-    for c in candidates:
-        f = c.get("features", {})
-        s, b = score_candidate(f, weights)
+    for rank, i in enumerate(rank_scores(totals).tolist(), start=1):
+        c = candidates[i]
         out.append({
             "anon_id": c.get("anon_id"),
-            "score": s,
-            "breakdown": b,
-            "features": f,
+            "score": scores[i],
+            "breakdown": dict(zip(SCORE_COLUMNS, parts[i])),
+            "features": c.get("features") or {},
             "filename": c.get("filename", ""),
             # Preserve qualification gating results
             "is_qualified": c.get("is_qualified", True),
-            "gate_results": c.get("gate_results", {})
+            "gate_results": c.get("gate_results", {}),
+            # Near-duplicate flag (see iter_dedup)
+            "duplicate_of": c.get("duplicate_of"),
+            "rank": rank
         })
-    out = sorted(out, key=lambda x: x["score"], reverse=True)
 
-    # Add rank
-    for i, c in enumerate(out):
-        c["rank"] = i + 1
+    return out
+
 
+# =============================================================================
+# STREAMING PIPELINE
+# =============================================================================
+# Generator counterparts of the list-based stages above. Documents are dicts
+# that flow through one at a time; stages only buffer a bounded batch (for
+# parallel extraction or columnar scoring), and top_k_candidates keeps k
+# results, so ranking N resumes needs O(k + batch) memory instead of holding
+# every text. Compose as:
+#
+#     docs = iter_features(iter_anonymize(iter_extract(paths)))
+#     docs = iter_dedup(docs, DuplicateIndex())  # optional, see dedup.py
+#     top = top_k_candidates(iter_score(iter_gate(docs, job_info), weights), k=50)
+
+
+def _iter_batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most size items."""
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_extract(files: Iterable[Any], workers: Optional[int] = None, batch_size: int = 64) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {"name", "text", "error"} per file, in input order.
+    At most batch_size files are read into memory at once (see extract_texts).
+    """
+    for batch in _iter_batches(files, batch_size):
+        yield from extract_texts(batch, workers)
+
+
+def iter_anonymize(docs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Replace each document's text with its anonymized form and add an anon_id."""
+    for doc in docs:
+        text, _ = anonymize_text(doc["text"])
+        yield {**doc, "text": text, "anon_id": hashlib.sha256(text.encode()).hexdigest()[:12]}
+
+
+def iter_ingest(files: Iterable[Any], workers: Optional[int] = None, cache: Any = None,
+                batch_size: int = 64, screen_job: Optional[Dict] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Cache-backed equivalent of iter_features(iter_anonymize(iter_extract(...))),
+    running ingest_resumes one batch at a time (screen_job: see ingest_resumes).
+    """
+    for batch in _iter_batches(files, batch_size):
+        for entry in ingest_resumes(batch, workers, cache, screen_job):
+            entry["anon_id"] = hashlib.sha256(entry["text"].encode()).hexdigest()[:12]
+            yield entry
+
+
+def iter_features(docs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Add extracted features (None for documents without text)."""
+    for doc in docs:
+        yield {**doc, "features": extract_features(doc["text"]) if doc["text"] else None}
+
+
+def iter_dedup(docs: Iterable[Dict[str, Any]], index: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Add duplicate_of: the anon_id of an earlier near-duplicate of the resume,
+    or None for the first one seen. index is a dedup.DuplicateIndex; pass the
+    same index to dedupe across several streams. An exact resubmission (an
+    anon_id already indexed) points at the earliest resume of its cluster,
+    which is its own anon_id if that resume was the first.
+    """
+    for doc in docs:
+        if doc["anon_id"] in index:
+            duplicate_of = index.cluster_of(doc["anon_id"])
+        else:
+            rep = index.add(doc["anon_id"], doc["text"])
+            duplicate_of = rep if rep != doc["anon_id"] else None
+        yield {**doc, "duplicate_of": duplicate_of}
+
+
+def iter_gate(docs: Iterable[Dict[str, Any]], job_info: Optional[Dict]) -> Iterator[Dict[str, Any]]:
+    """
+    Add is_qualified and gate_results. Without job_info (or features) every
+    document passes, as for custom uploads in the app. Documents screened out
+    at ingestion keep their screening result.
+    """
+    for doc in docs:
+        if doc.get("screened_out"):
+            is_qualified, gate_results = doc["screened_out"]
+        elif job_info and doc.get("features"):
+            is_qualified, gate_results = gate_candidate(doc["features"], job_info)
+        else:
+            is_qualified, gate_results = True, {}
+        yield {**doc, "is_qualified": is_qualified, "gate_results": gate_results}
+
+
+def iter_score(docs: Iterable[Dict[str, Any]], weights: Dict[str, float],
+               batch_size: int = 256) -> Iterator[Dict[str, Any]]:
+    """
+    Add score and breakdown, scoring batch_size documents at a time with the
+    columnar scorer. Values match score_candidate.
+    """
+    for batch in _iter_batches(docs, batch_size):
+        totals, parts = score_matrix(build_feature_matrix([d.get("features") for d in batch]), weights)
+        totals = round_scores(totals).tolist()
+        parts = round_scores(parts).tolist()
+        for doc, score, part in zip(batch, totals, parts):
+            yield {**doc, "score": score, "breakdown": dict(zip(SCORE_COLUMNS, part))}
+
+
+def top_k_candidates(scored: Iterable[Dict[str, Any]], k: Optional[int] = None,
+                     drop_text: bool = True) -> List[Dict[str, Any]]:
+    """
+    Sink: rank scored documents, keeping only the k best (all when k is None).
+
+    Ties keep input order, as in score_candidates. With drop_text, document
+    text is discarded as soon as a document arrives.
+
+    Returns a list sorted by score with "rank" set.
+    """
+    kept = []  # (score, -seq, doc): a min-heap when k is set
+    for seq, doc in enumerate(scored):
+        if drop_text:
+            doc.pop("text", None)
+        item = (doc["score"], -seq, doc)
+        if k is None:
+            kept.append(item)
+        elif len(kept) < k:
+            heapq.heappush(kept, item)
+        elif kept and item > kept[0]:
+            heapq.heapreplace(kept, item)
+
+    kept.sort(key=lambda item: item[:2], reverse=True)
+    out = []
+    for rank, (_, _, doc) in enumerate(kept, start=1):
+        doc["rank"] = rank
+        out.append(doc)
     return out
 
 
+class OnlineRanking:
+    """
+    Live leaderboard of the k best scored documents, updated one at a time.
+
+    Kept as a sorted index of (-score, arrival) keys, best first, so the
+    current top is always ready to display and a document that cannot enter a
+    full board is rejected with one comparison against the last entry. Ties
+    keep arrival order, as in score_candidates.
+    """
+
+    def __init__(self, k: Optional[int] = None):
+        self.k = k
+        self.count = 0  # documents pushed so far
+        self._keys: List[Tuple[float, int]] = []
+        self._docs: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def push(self, doc: Dict[str, Any]) -> bool:
+        """Offer a scored document; returns True if it is on the board."""
+        key = (-doc["score"], self.count)
+        self.count += 1
+        if self.k is not None and len(self._keys) >= self.k:
+            if self.k == 0 or key > self._keys[-1]:
+                return False
+            del self._docs[self._keys.pop()[1]]
+        self._keys.insert(bisect_right(self._keys, key), key)
+        self._docs[key[1]] = doc
+        return True
+
+    def threshold(self) -> Optional[float]:
+        """Score a new document must beat to enter a full board (None while filling)."""
+        if self.k is None or len(self._keys) < self.k or not self._keys:
+            return None
+        return -self._keys[-1][0]
+
+    def top(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Current best n (default all kept) as copies with "rank" set."""
+        keys = self._keys if n is None else self._keys[:n]
+        return [{**self._docs[seq], "rank": rank} for rank, (_, seq) in enumerate(keys, start=1)]
+
+
 # =============================================================================
 # INTERVIEW QUESTIONS
 # =============================================================================
 
-def generate_template_questions(features: Dict[str, Any], job_text: str, gate_results: Dict = None) -> List[str]:
+GOVERNMENT_JOB_KEYWORDS = ["government", "public sector", "state", "federal", "agency", "department"]
+
+
+def build_job_profile(job_text: str) -> Dict[str, Any]:
+    """
+    Precompute what question generation needs from a job description.
+    Returns dict with text, text_lower and keywords (role flags detected in the text).
+    """
+    job_lower = job_text.lower()
+    keywords = {
+        "government": any(keyword in job_lower for keyword in GOVERNMENT_JOB_KEYWORDS),
+        "data_analysis": "data" in job_lower and "analy" in job_lower,
+        "dashboard": "dashboard" in job_lower or "visualization" in job_lower,
+        "business_analysis": "business analy" in job_lower,
+        "process": "process" in job_lower,
+        "contract": "contract" in job_lower or "procurement" in job_lower,
+    }
+    return {"text": job_text, "text_lower": job_lower, "keywords": keywords}
+
+
+def generate_template_questions(features: Dict[str, Any], job_text: str, gate_results: Dict = None,
+                                job_profile: Dict[str, Any] = None) -> List[str]:
     """
     Generate template interview questions based on candidate features and qualification level.
     These are static, deterministic questions - no LLM involved.
 
     Enhanced for government/public sector positions with level-aware questioning.
+    Pass a precomputed job_profile (build_job_profile) to skip rescanning job_text.
     """
     qs = []
     skills = features.get("skills", [])
@@ -417,7 +1216,7 @@ def generate_template_questions(features: Dict[str, Any], job_text: str, gate_re
     level_name = gate_results.get("level_name", "") if gate_results else ""
 
     top_skills = skills[:3] if skills else ["relevant technical skills"]
-    job_lower = job_text.lower()
+    job_keywords = (job_profile or build_job_profile(job_text))["keywords"]
 
     # Level-specific intro question
     if level_name and years > 0:
@@ -434,22 +1233,22 @@ def generate_template_questions(features: Dict[str, Any], job_text: str, gate_re
             qs.append(f"How have you used {' and '.join(top_skills[:2])} together to solve a business problem?")
 
     # Government/Public Sector specific questions
-    if any(keyword in job_lower for keyword in ["government", "public sector", "state", "federal", "agency", "department"]):
+    if job_keywords["government"]:
         qs.append("Describe your experience working with government stakeholders, regulatory requirements, or public sector constraints.")
         qs.append("How do you balance efficiency with compliance and transparency in government work?")
 
     # Role-specific questions
-    if "data" in job_lower and "analy" in job_lower:
+    if job_keywords["data_analysis"]:
         qs.append("Walk us through how you've translated complex data analysis into actionable insights for decision-makers.")
-        if "dashboard" in job_lower or "visualization" in job_lower:
+        if job_keywords["dashboard"]:
             qs.append("Describe your process for designing a dashboard that serves both technical and non-technical audiences.")
 
-    if "business analy" in job_lower:
+    if job_keywords["business_analysis"]:
         qs.append("Describe a time when you had to gather requirements from multiple stakeholders with conflicting priorities. How did you resolve it?")
-        if "process improvement" in job_lower or "process" in job_lower:
+        if job_keywords["process"]:
             qs.append("Tell us about a business process you improved. What was your methodology and what were the results?")
 
-    if "contract" in job_lower or "procurement" in job_lower:
+    if job_keywords["contract"]:
         qs.append("Describe your experience reviewing contracts for compliance with regulations and policies.")
         qs.append("How do you handle situations where contract requirements conflict with operational needs?")
 
@@ -469,80 +1268,191 @@ def generate_template_questions(features: Dict[str, Any], job_text: str, gate_re
 
 
 # =============================================================================
-# LOGGING (In-Memory Only)
+# AUDIT LOGGING (per session, bounded; see audit_log.py)
 # =============================================================================
 
-_LOGS: List[Dict[str, Any]] = []
+_AUDIT_LOG = AuditLogStore.from_env()
 
 
-def log_record(record: Dict[str, Any]) -> None:
+def log_record(record: Dict[str, Any], session_id: str = DEFAULT_SESSION) -> bool:
     """
-    Log a record to in-memory storage.
-    Records include timestamp and are NOT persisted to disk.
+    Log an audit record for a session. A record that repeats the previous
+    one for the same candidate (apart from its timestamp) is skipped.
+
+    Returns:
+        True if the record was logged
     """
     rec = {
         "timestamp": datetime.datetime.utcnow().isoformat(),
         "type": "audit",
         **record
     }
-    _LOGS.append(rec)
-    logger.info(f"Logged record: {rec.get('anon_id', 'unknown')}")
+    logged = _AUDIT_LOG.append(rec, session_id)
+    if logged:
+        logger.info(f"Logged record: {rec.get('anon_id', 'unknown')}")
+    return logged
 
 
-def clear_logs() -> None:
-    """Clear all in-memory logs. Called when user purges data."""
-    global _LOGS
-    _LOGS = []
-    logger.info("All in-memory logs cleared.")
+def clear_logs(session_id: Optional[str] = None) -> None:
+    """Clear one session's audit log (every session's if None). Called when user purges data."""
+    _AUDIT_LOG.clear(session_id)
+    logger.info("Audit logs cleared.")
 
 
-def get_logs() -> List[Dict[str, Any]]:
-    """Return copy of current logs."""
-    return _LOGS.copy()
+def get_logs(session_id: str = DEFAULT_SESSION) -> Iterator[Dict[str, Any]]:
+    """Iterate over a session's audit records, oldest first."""
+    return _AUDIT_LOG.iter_records(session_id)
+
+
+# =============================================================================
+# SCORE EXPORT (streaming CSV / Parquet)
+# =============================================================================
+
+# Ranked export columns: scores, then gate outcome and evidence counts
+SCORES_CSV_HEADERS = ["rank", "display_name", "anon_id", "score"] + [f"{k}_score" for k in SCORE_COLUMNS]
+EXPORT_COLUMNS = SCORES_CSV_HEADERS + ["is_qualified", "level_name", "education_passed", "skills_passed",
+                                       "skill_count", "certification_count", "evidence_count"]
+EXPORT_CHUNK_SIZE = 4096
+
+
+def gate_export_fields(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Gate outcome and evidence counts of a gated candidate, for export rows."""
+    gates = doc.get("gate_results") or {}
+    features = doc.get("features") or {}
+    return {
+        "is_qualified": bool(doc.get("is_qualified", True)),
+        "level_name": gates.get("level_name", ""),
+        "education_passed": bool(gates.get("education_check", {}).get("passed", True)),
+        "skills_passed": bool(gates.get("skills_check", {}).get("passed", True)),
+        "skill_count": len(features.get("skills", [])),
+        "certification_count": len(features.get("certifications", [])),
+        "evidence_count": len(features.get("evidence_lines", {})),
+    }
+
+
+def iter_export_rows(scored_list: Iterable[Dict], display_name_mapping: Dict[str, str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one EXPORT_COLUMNS row per scored candidate dict."""
+    names = display_name_mapping or {}
+    for s in scored_list:
+        b = s.get("breakdown", {})
+        anon_id = s.get("anon_id", "")
+        row = {"rank": s.get("rank", ""), "display_name": names.get(anon_id, "Unknown"),
+               "anon_id": anon_id, "score": s.get("score", 0)}
+        row.update((f"{k}_score", b.get(k, 0)) for k in SCORE_COLUMNS)
+        row.update(gate_export_fields(s))
+        yield row
+
+
+def iter_row_batches(rows: Iterable[Dict[str, Any]], columns: List[str],
+                     size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, List[Any]]]:
+    """Regroup row dicts into {column: values} batches of up to size rows."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield {name: [row.get(name) for row in chunk] for name in columns}
+
+
+def _open_text(out: Any):
+    """(text stream, release) for a path, a text stream or a binary stream such as BytesIO."""
+    if isinstance(out, (str, Path)):
+        f = open(out, "w", encoding="utf-8", newline="")
+        return f, f.close
+    if isinstance(out, (io.RawIOBase, io.BufferedIOBase)):
+        f = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        return f, f.detach  # flushes, and leaves the caller's binary stream open
+    return out, out.flush
+
+
+def write_csv_batches(batches: Iterable[Dict[str, Any]], out: Any, columns: List[str] = EXPORT_COLUMNS) -> int:
+    """
+    Stream column batches ({column: list or array}) to a CSV path or stream
+    through the csv module, so values containing commas or quotes are
+    quoted. A binary stream (e.g. BytesIO) gets UTF-8 and is left open.
+
+    Returns:
+        Number of data rows written
+    """
+    f, release = _open_text(out)
+    count = 0
+    try:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        for batch in batches:
+            values = [batch[name] for name in columns]
+            writer.writerows(zip(*values))
+            count += len(values[0]) if values else 0
+    finally:
+        release()
+    return count
+
+
+def write_parquet_batches(batches: Iterable[Dict[str, Any]], out: Any, columns: List[str] = EXPORT_COLUMNS) -> int:
+    """
+    Stream column batches to a Parquet path or binary stream, one row group
+    per batch; NumPy columns go to Arrow without per-value conversion.
+    Requires pyarrow.
+
+    Returns:
+        Number of rows written
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow); use CSV instead.")
+
+    writer, count = None, 0
+    try:
+        for batch in batches:
+            table = pa.table({name: batch[name] for name in columns})
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            count += table.num_rows
+        if writer is None:  # no rows: still write the columns
+            writer = pq.ParquetWriter(out, pa.schema([(name, pa.null()) for name in columns]))
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], out: Any, columns: List[str] = EXPORT_COLUMNS) -> int:
+    """write_csv_batches for row dicts (e.g. iter_export_rows), consumed a batch at a time."""
+    return write_csv_batches(iter_row_batches(rows, columns), out, columns)
+
+
+def write_parquet(rows: Iterable[Dict[str, Any]], out: Any, columns: List[str] = EXPORT_COLUMNS) -> int:
+    """write_parquet_batches for row dicts, consumed a batch at a time."""
+    return write_parquet_batches(iter_row_batches(rows, columns), out, columns)
 
 
 def get_logs_csv(scored_list: List[Dict], display_name_mapping: Dict[str, str] = None) -> str:
     """
     Generate CSV string from scored candidates list.
     Does NOT include PII - only anonymized IDs and scores.
+    For the full export (gate results, evidence counts) use write_csv.
 
     Args:
         scored_list: List of scored candidate dicts
         display_name_mapping: Optional mapping of anon_id to display names (e.g., "Candidate A")
     """
-    if display_name_mapping is None:
-        display_name_mapping = {}
-
-    headers = ["rank", "display_name", "anon_id", "score", "skills_score", "experience_score", "education_score", "certifications_score"]
-    lines = [",".join(headers)]
-
-    for s in scored_list:
-        b = s.get("breakdown", {})
-        display_name = display_name_mapping.get(s.get("anon_id", ""), "Unknown")
-        row = [
-            str(s.get("rank", "")),
-            display_name,
-            s.get("anon_id", ""),
-            str(s.get("score", 0)),
-            str(b.get("skills", 0)),
-            str(b.get("experience", 0)),
-            str(b.get("education", 0)),
-            str(b.get("certifications", 0))
-        ]
-        lines.append(",".join(row))
-
-    return "\n".join(lines)
+    out = io.StringIO()
+    write_csv(iter_export_rows(scored_list, display_name_mapping), out, SCORES_CSV_HEADERS)
+    return out.getvalue()[:-1]  # no trailing newline, as before
 
 
 # =============================================================================
-# BIAS AUDIT STUB
+# BIAS AUDIT
 # =============================================================================
 
 def bias_audit_stub(scored_list: List[Dict]) -> Dict[str, Any]:
     """
-    Placeholder bias audit function.
+    Statistical audit of a scored candidate list (see bias_audit.py).
 
-    In production, this would:
+    In production, this would also:
     - Analyze score distributions across demographic groups (if available)
     - Calculate disparate impact ratios
     - Flag potential adverse impact
@@ -550,45 +1460,16 @@ def bias_audit_stub(scored_list: List[Dict]) -> Dict[str, Any]:
 
     For this demo, we provide statistical summaries only.
     No demographic data is collected or analyzed.
+    For a CandidateStore, CandidateStore.bias_audit avoids the per-dict pass.
     """
-    if not scored_list:
-        return {"error": "No candidates to audit", "candidates": 0}
-
-    scores = [s["score"] for s in scored_list]
-
-    # Basic statistics
-    stats = {
-        "candidates_evaluated": len(scores),
-        "score_min": round(min(scores), 2),
-        "score_max": round(max(scores), 2),
-        "score_mean": round(sum(scores) / len(scores), 2),
-        "score_median": round(sorted(scores)[len(scores) // 2], 2),
-    }
-
-    # Score distribution buckets
-    buckets = {"low (0-10)": 0, "medium (10-25)": 0, "high (25+)": 0}
-    for s in scores:
-        if s < 10:
-            buckets["low (0-10)"] += 1
-        elif s < 25:
-            buckets["medium (10-25)"] += 1
-        else:
-            buckets["high (25+)"] += 1
-
-    # Top features by frequency
-    feature_counts = Counter()
-    for s in scored_list:
-        for skill in s.get("features", {}).get("skills", []):
-            feature_counts[skill] += 1
-
-    return {
-        "audit_timestamp": datetime.datetime.utcnow().isoformat(),
-        "statistics": stats,
-        "score_distribution": buckets,
-        "top_skills_detected": feature_counts.most_common(10),
-        "disparate_impact_note": "No demographic data available. In production, collect voluntary self-identification data to enable disparate impact analysis per EEOC guidelines.",
-        "recommendation": "Human review required for all final hiring decisions. This tool provides decision support only."
-    }
+    audit = AuditAccumulator()
+    audit.add(
+        [s["score"] for s in scored_list],
+        qualified=[s.get("is_qualified", True) for s in scored_list],
+        levels=[(s.get("gate_results") or {}).get("level_name", "") for s in scored_list],
+        skills=[(s.get("features") or {}).get("skills", []) for s in scored_list],
+    )
+    return audit.report()
 
 
 # =============================================================================
@@ -640,55 +1521,96 @@ def check_contrast_ratio(fg_color: str, bg_color: str, context: str = "") -> flo
 # PDF GENERATION
 # =============================================================================
 
-def generate_decision_pdf(candidate: Dict, job_summary: str = "", display_name: str = None) -> bytes:
-    """
-    Generate a PDF decision summary for a candidate.
-    Uses reportlab for PDF generation.
+DECISION_PDF_DISCLAIMER = (
+    "<b>Disclaimer:</b> This evaluation was generated by an AI-assisted tool for demonstration purposes. "
+    "All candidate data has been anonymized. Final hiring decisions must be made by qualified human reviewers "
+    "in compliance with applicable employment laws and organizational policies."
+)
 
-    Args:
-        candidate: Candidate dict with score, features, etc.
-        job_summary: Optional job description text
-        display_name: Optional display name like "Candidate A"
 
-    Returns PDF as bytes.
+@lru_cache(maxsize=None)
+def pdf_styles() -> Optional[Dict[str, Any]]:
+    """
+    reportlab paragraph and table styles for decision PDFs, built once per
+    process (None without reportlab).
     """
     try:
-        from reportlab.lib.pagesizes import letter
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.platypus import TableStyle
         from reportlab.lib import colors
     except ImportError:
-        logger.error("reportlab not installed. Returning empty PDF.")
-        return b""
+        return None
 
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
     styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=12,
+            textColor=colors.HexColor("#E31937")
+        ),
+        "normal": styles['Normal'],
+        "italic": styles['Italic'],
+        "table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#E31937")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F3F6F9")),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+    }
 
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=12,
-        textColor=colors.HexColor("#E31937")
-    )
 
+def decision_flowables(styles: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Candidate-independent flowables of a decision summary (subtitle, spacers,
+    disclaimer, timestamp). One set can be shared by every page of a report.
+    """
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = styles or pdf_styles()
+    return {
+        "subtitle": Paragraph("<i>DEMO ONLY - Not for real hiring decisions</i>", styles["italic"]),
+        "space_lg": Spacer(1, 0.25*inch),
+        "space": Spacer(1, 0.2*inch),
+        "space_sm": Spacer(1, 0.1*inch),
+        "disclaimer": Paragraph(DECISION_PDF_DISCLAIMER, styles["normal"]),
+        "generated": Paragraph(f"<i>Generated: {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}</i>",
+                               styles["italic"]),
+    }
+
+
+def decision_story(candidate: Dict, display_name: str = None, styles: Dict[str, Any] = None,
+                   shared: Dict[str, Any] = None) -> List[Any]:
+    """
+    reportlab flowables for one candidate's decision summary (title through
+    disclaimer), using the shared pdf_styles() and, when given, a
+    decision_flowables() set. Requires reportlab.
+    """
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Table
+
+    styles = styles or pdf_styles()
+    shared = shared or decision_flowables(styles)
     story = []
 
     # Title
-    story.append(Paragraph("Candidate Evaluation Summary", title_style))
-    story.append(Paragraph("<i>DEMO ONLY - Not for real hiring decisions</i>", styles['Italic']))
-    story.append(Spacer(1, 0.25*inch))
+    story.append(Paragraph("Candidate Evaluation Summary", styles["title"]))
+    story.append(shared["subtitle"])
+    story.append(shared["space_lg"])
 
     # Candidate info
     display = display_name if display_name else candidate.get('anon_id', 'N/A')
-    story.append(Paragraph(f"<b>Candidate:</b> {display}", styles['Normal']))
-    story.append(Paragraph(f"<b>Technical ID:</b> {candidate.get('anon_id', 'N/A')}", styles['Normal']))
-    story.append(Paragraph(f"<b>Rank:</b> #{candidate.get('rank', 'N/A')}", styles['Normal']))
-    story.append(Paragraph(f"<b>Overall Score:</b> {candidate.get('score', 0)}", styles['Normal']))
-    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(f"<b>Candidate:</b> {display}", styles["normal"]))
+    story.append(Paragraph(f"<b>Technical ID:</b> {candidate.get('anon_id', 'N/A')}", styles["normal"]))
+    story.append(Paragraph(f"<b>Rank:</b> #{candidate.get('rank', 'N/A')}", styles["normal"]))
+    story.append(Paragraph(f"<b>Overall Score:</b> {candidate.get('score', 0)}", styles["normal"]))
+    story.append(shared["space"])
 
     # Score breakdown table
     breakdown = candidate.get("breakdown", {})
@@ -697,42 +1619,303 @@ def generate_decision_pdf(candidate: Dict, job_summary: str = "", display_name:
         table_data.append([cat.title(), str(score)])
 
     table = Table(table_data, colWidths=[2.5*inch, 1.5*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#E31937")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F3F6F9")),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    table.setStyle(styles["table"])
     story.append(table)
-    story.append(Spacer(1, 0.2*inch))
+    story.append(shared["space"])
 
     # Skills detected
-    features = candidate.get("features", {})
+    features = candidate.get("features") or {}
     skills = features.get("skills", [])
     if skills:
-        story.append(Paragraph("<b>Skills Detected:</b>", styles['Normal']))
-        story.append(Paragraph(", ".join(skills), styles['Normal']))
-        story.append(Spacer(1, 0.1*inch))
+        story.append(Paragraph("<b>Skills Detected:</b>", styles["normal"]))
+        story.append(Paragraph(", ".join(skills), styles["normal"]))
+        story.append(shared["space_sm"])
 
     # Education
-    story.append(Paragraph(f"<b>Education:</b> {features.get('education', 'Not detected')}", styles['Normal']))
-    story.append(Paragraph(f"<b>Experience:</b> {features.get('years_experience', 0)} years", styles['Normal']))
-    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph(f"<b>Education:</b> {features.get('education', 'Not detected')}", styles["normal"]))
+    story.append(Paragraph(f"<b>Experience:</b> {features.get('years_experience', 0)} years", styles["normal"]))
+    story.append(shared["space"])
 
     # Disclaimer
-    story.append(Paragraph(
-        "<b>Disclaimer:</b> This evaluation was generated by an AI-assisted tool for demonstration purposes. "
-        "All candidate data has been anonymized. Final hiring decisions must be made by qualified human reviewers "
-        "in compliance with applicable employment laws and organizational policies.",
-        styles['Normal']
-    ))
-    story.append(Spacer(1, 0.1*inch))
-    story.append(Paragraph(f"<i>Generated: {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}</i>", styles['Italic']))
+    story.append(shared["disclaimer"])
+    story.append(shared["space_sm"])
+    story.append(shared["generated"])
+    return story
+
+
+def generate_decision_pdf(candidate: Dict, job_summary: str = "", display_name: str = None) -> bytes:
+    """
+    Generate a PDF decision summary for a candidate.
+    Uses reportlab for PDF generation.
+
+    Args:
+        candidate: Candidate dict with score, features, etc.
+        job_summary: Optional job description text
+        display_name: Optional display name like "Candidate A"
+
+    Returns PDF as bytes.
+    """
+    styles = pdf_styles()
+    if styles is None:
+        logger.error("reportlab not installed. Returning empty PDF.")
+        return b""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch)
+    doc.build(decision_story(candidate, display_name, styles))
+    return buffer.getvalue()
+
+
+# Decision PDFs are built only when a reviewer asks for one and memoized on
+# everything the document shows, so reruns (e.g. weight slider moves) that
+# leave a candidate's summary unchanged never touch reportlab again.
+DECISION_PDF_CACHE_SIZE = 32
+
+
+def decision_pdf_key(candidate: Dict, job_text: str = "", display_name: str = None) -> Tuple:
+    """Memo key for a decision PDF: candidate, rank, score, breakdown and job."""
+    job_hash = hashlib.sha256(job_text.encode("utf-8")).hexdigest()[:16]
+    return (
+        candidate.get("anon_id"),
+        candidate.get("rank"),
+        candidate.get("score"),
+        tuple(candidate.get("breakdown", {}).items()),
+        job_hash,
+        display_name,
+    )
+
+
+def get_decision_pdf(cache: Dict, candidate: Dict, job_text: str = "",
+                     display_name: str = None) -> bytes:
+    """
+    Return the decision PDF for a candidate, generating it on a cache miss.
+
+    Args:
+        cache: Dict owned by the caller (e.g. in st.session_state); the oldest
+            entries are evicted beyond DECISION_PDF_CACHE_SIZE
+        candidate, job_text, display_name: As for generate_decision_pdf
 
+    Returns PDF as bytes.
+    """
+    key = decision_pdf_key(candidate, job_text, display_name)
+    pdf_bytes = cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = generate_decision_pdf(candidate, job_text, display_name)
+        if not pdf_bytes:
+            return pdf_bytes
+        cache[key] = pdf_bytes
+        while len(cache) > DECISION_PDF_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    return pdf_bytes
+
+
+# -----------------------------------------------------------------------------
+# Batch export: every decision summary in one streamed ZIP
+# -----------------------------------------------------------------------------
+
+# Below this many PDFs, worker start-up costs more than it saves
+PDF_PARALLEL_MIN = 64
+
+
+def decision_pdf_filename(candidate: Dict, display_name: str = None) -> str:
+    """Archive member name, e.g. "0003_Candidate_C.pdf" (rank, then display name or anon_id)."""
+    label = re.sub(r"[^A-Za-z0-9_-]+", "_", display_name or str(candidate.get("anon_id", "candidate"))).strip("_")
+    rank = candidate.get("rank")
+    return f"{rank:04d}_{label}.pdf" if isinstance(rank, int) else f"{label}.pdf"
+
+
+def decision_summary(candidate: Dict) -> Dict[str, Any]:
+    """The fields a decision summary shows, without the rest of the candidate dict."""
+    features = candidate.get("features") or {}
+    return {
+        "anon_id": candidate.get("anon_id"),
+        "rank": candidate.get("rank"),
+        "score": candidate.get("score", 0),
+        "breakdown": candidate.get("breakdown", {}),
+        "features": {k: features[k] for k in ("skills", "education", "years_experience") if k in features},
+    }
+
+
+def _decision_pdf_item(item: Tuple[Dict, str, Optional[str]]) -> bytes:
+    """Worker task: one decision PDF (styles come from the worker's pdf_styles() cache)."""
+    candidate, job_summary, display_name = item
+    return generate_decision_pdf(candidate, job_summary, display_name)
+
+
+def iter_decision_pdfs(candidates: Iterable[Dict], job_summary: str = "",
+                       display_names: Dict[str, str] = None,
+                       workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (filename, pdf_bytes) for each candidate, in input order.
+
+    With PDF_PARALLEL_MIN or more candidates, PDFs are rendered in a spawn
+    process pool (as in extract_texts); each worker builds its styles once.
+    Only the fields the summary shows are sent to the workers.
+    """
+    names = display_names or {}
+    items = [(decision_summary(c), job_summary, names.get(c.get("anon_id"))) for c in candidates]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(items))) if len(items) >= PDF_PARALLEL_MIN else 1
+
+    done = 0
+    if workers > 1:
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            chunksize = max(1, len(items) // (workers * 8))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=pdf_styles) as pool:
+                for item, pdf in zip(items, pool.map(_decision_pdf_item, items, chunksize=chunksize)):
+                    yield decision_pdf_filename(item[0], item[2]), pdf
+                    done += 1
+            return
+        except Exception as e:
+            if done:
+                raise
+            logger.warning(f"Parallel PDF rendering unavailable ({e}); falling back to serial.")
+    for item in items:
+        yield decision_pdf_filename(item[0], item[2]), _decision_pdf_item(item)
+
+
+def write_decision_pdfs_zip(candidates: Iterable[Dict], out: Any, job_summary: str = "",
+                            display_names: Dict[str, str] = None, workers: Optional[int] = None) -> int:
+    """
+    Stream every candidate's decision summary into a ZIP archive at out (a
+    path or binary stream). Each PDF is written as soon as it is rendered;
+    PDFs are stored uncompressed since their content streams already are.
+
+    Returns:
+        Number of PDFs written
+    """
+    count = 0
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, pdf in iter_decision_pdfs(candidates, job_summary, display_names, workers):
+            if pdf:
+                archive.writestr(name, pdf)
+                count += 1
+    return count
+
+
+# -----------------------------------------------------------------------------
+# Panel report: the whole ranked pool in one PDF
+# -----------------------------------------------------------------------------
+
+# Ranked summary rows per table; short tables keep reportlab's page splitting linear
+PANEL_TABLE_ROWS = 40
+
+
+def _refill_story(story: List[Any], chunks: Iterator[List[Any]]) -> Callable[[List[Any]], None]:
+    """
+    A filterFlowables hook for the SimpleDocTemplate building story: reportlab
+    calls it before handling each flowable, and once story is down to its
+    last flowable it appends the next chunk. Only the current chunk's
+    flowables exist at any time. Other lists the template handles (e.g. its
+    page-begin actions) are left alone.
+    """
+    def refill(flowables: List[Any]) -> None:
+        if flowables is not story:
+            return
+        # Keep one flowable of lookahead for keep-with-next handling
+        while len(story) < 2:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            story.extend(chunk)
+    return refill
+
+
+def _panel_story(summaries: List[Dict], job_summary: str, names: Dict[str, str],
+                 styles: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Yield the panel report's story a chunk at a time: overview, summary tables, candidate pages."""
+    from xml.sax.saxutils import escape
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Table
+
+    shared = decision_flowables(styles)
+    page_break = PageBreak()
+
+    # Overview and level distribution
+    overview = [Paragraph("Hiring Panel Report", styles["title"]), shared["subtitle"], shared["space_lg"]]
+    position = next((line.strip() for line in job_summary.splitlines() if line.strip()), "")
+    if position:
+        overview.append(Paragraph(f"<b>Position:</b> {escape(position[:120])}", styles["normal"]))
+    qualified = sum(1 for s in summaries if s["is_qualified"])
+    overview.append(Paragraph(f"<b>Candidates:</b> {len(summaries)} ({qualified} qualified)", styles["normal"]))
+    overview.append(shared["space"])
+
+    levels: Dict[str, List[float]] = {}
+    for s in summaries:
+        levels.setdefault(s["level_name"] or "No level", []).append(s["score"])
+    level_rows = [["Level", "Candidates", "Mean Score"]]
+    level_rows += [[name, str(len(scores)), f"{sum(scores) / len(scores):.2f}"]
+                   for name, scores in sorted(levels.items())]
+    level_table = Table(level_rows, colWidths=[2.0*inch, 1.25*inch, 1.25*inch])
+    level_table.setStyle(styles["table"])
+    overview += [Paragraph("<b>Level Distribution</b>", styles["normal"]), shared["space_sm"], level_table,
+                 shared["space"], Paragraph("<b>Ranked Summary</b>", styles["normal"]), shared["space_sm"]]
+    yield overview
+
+    # Ranked summary, in short tables
+    header = ["Rank", "Candidate", "Score", "Level", "Qualified"]
+    for start in range(0, len(summaries), PANEL_TABLE_ROWS):
+        rows = [header] + [
+            [str(s["rank"] or ""), names.get(s["anon_id"]) or str(s["anon_id"]), f"{s['score']}",
+             s["level_name"] or "-", "Yes" if s["is_qualified"] else "No"]
+            for s in summaries[start:start + PANEL_TABLE_ROWS]
+        ]
+        table = Table(rows, colWidths=[0.6*inch, 2.2*inch, 0.9*inch, 1.2*inch, 0.9*inch])
+        table.setStyle(styles["table"])
+        yield [table, shared["space_sm"]]
+
+    yield [shared["disclaimer"], shared["space_sm"], shared["generated"]]
+
+    # One page per candidate
+    for s in summaries:
+        yield [page_break] + decision_story(s, names.get(s["anon_id"]), styles, shared)
+
+
+def generate_panel_report(candidates: Iterable[Dict], job_summary: str = "",
+                          display_names: Dict[str, str] = None, out: Any = None) -> bytes:
+    """
+    Generate one PDF for a hiring panel: overview with level distribution,
+    ranked summary table, then a decision summary page per candidate.
+
+    Candidates are read once and kept only as decision_summary() fields; the
+    story is built and laid out a candidate at a time, reusing one set of
+    styles and shared flowables.
+
+    Args:
+        candidates: Scored candidates in rank order (any iterable)
+        job_summary: Optional job description text (its first line is shown)
+        display_names: Optional anon_id -> display name mapping
+        out: Optional path or binary stream to write to instead of returning bytes
+
+    Returns PDF as bytes (b"" when written to out).
+    """
+    styles = pdf_styles()
+    if styles is None:
+        logger.error("reportlab not installed. Returning empty PDF.")
+        return b""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
+    summaries = []
+    for c in candidates:
+        summary = decision_summary(c)
+        summary.update(is_qualified=bool(c.get("is_qualified", True)),
+                       level_name=(c.get("gate_results") or {}).get("level_name", ""))
+        summaries.append(summary)
+
+    buffer = io.BytesIO()
+    target = buffer if out is None else str(out) if isinstance(out, (str, Path)) else out
+    doc = SimpleDocTemplate(target, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch,
+                            title="Hiring Panel Report")
+    chunks = _panel_story(summaries, job_summary, display_names or {}, styles)
+    story = list(next(chunks))
+    doc.filterFlowables = _refill_story(story, chunks)
     doc.build(story)
-    buffer.seek(0)
     return buffer.getvalue()